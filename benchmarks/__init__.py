@@ -0,0 +1 @@
+"""Offline benchmarks for orchestration scheduling."""
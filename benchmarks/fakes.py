@@ -0,0 +1,163 @@
+"""Simulated command ports with realistic latency distributions.
+
+Latencies are expressed in simulated seconds and slept for
+`latency * time_scale` real seconds, so a 200-service run finishes in a
+few seconds while keeping realistic proportions between steps.
+"""
+
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+from src.core.contracts.ports import LineHandler
+from src.core.domain.orchestration import BuildRequest, DeployRequest
+from src.core.runtime.services import ExecutionServices
+
+ANSIBLE_FORKS = 5
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Log-normal latency distribution described by its median and spread."""
+
+    median_s: float
+    sigma: float
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in simulated seconds."""
+        return rng.lognormvariate(math.log(self.median_s), self.sigma)
+
+
+BUILD_LATENCY = LatencyProfile(median_s=90.0, sigma=0.6)
+PUSH_LATENCY = LatencyProfile(median_s=20.0, sigma=0.8)
+PULL_LATENCY = LatencyProfile(median_s=12.0, sigma=0.7)
+COMPOSE_UP_LATENCY = LatencyProfile(median_s=6.0, sigma=0.4)
+READY_LATENCY = LatencyProfile(median_s=15.0, sigma=0.6)
+
+
+@dataclass(frozen=True)
+class ScenarioLatencies:
+    """Pre-drawn latencies so results do not depend on call order."""
+
+    build_s: dict[str, float]
+    push_s: dict[str, float]
+    pull_s: dict[tuple[int, str], float]
+    compose_up_s: dict[int, float]
+    ready_s: dict[str, float]
+    hosts: int
+    _deploy_cache: dict[tuple[str, ...], float] = field(default_factory=dict)
+
+    def deploy_s(self, services: tuple[str, ...]) -> float:
+        """Simulated Ansible deploy time for a set of images.
+
+        Ansible runs `ANSIBLE_FORKS` hosts at a time; each host pulls its
+        images one by one and then brings the compose project up. The result
+        is cached so zero-latency runs measure the executor, not this sum.
+        """
+        cached = self._deploy_cache.get(services)
+        if cached is not None:
+            return cached
+
+        host_latencies = [
+            sum(self.pull_s[(host, service)] for service in services)
+            + self.compose_up_s[host]
+            for host in range(self.hosts)
+        ]
+        latency = sum(
+            max(host_latencies[start : start + ANSIBLE_FORKS])
+            for start in range(0, self.hosts, ANSIBLE_FORKS)
+        )
+        self._deploy_cache[services] = latency
+        return latency
+
+
+def draw_latencies(services: list[str], hosts: int, seed: int) -> ScenarioLatencies:
+    """Draw a deterministic set of step latencies for a scenario."""
+    rng = random.Random(seed)
+    return ScenarioLatencies(
+        build_s={service: BUILD_LATENCY.sample(rng) for service in services},
+        push_s={service: PUSH_LATENCY.sample(rng) for service in services},
+        pull_s={
+            (host, service): PULL_LATENCY.sample(rng)
+            for host in range(hosts)
+            for service in services
+        },
+        compose_up_s={host: COMPOSE_UP_LATENCY.sample(rng) for host in range(hosts)},
+        ready_s={service: READY_LATENCY.sample(rng) for service in services},
+        hosts=hosts,
+    )
+
+
+@dataclass
+class PortRecorder:
+    """Accumulates simulated busy time and call counts per port."""
+
+    busy_s: dict[str, float] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, port: str, latency_s: float) -> None:
+        with self.lock:
+            self.busy_s[port] = self.busy_s.get(port, 0.0) + latency_s
+            self.calls[port] = self.calls.get(port, 0) + 1
+
+
+def simulate(latency_s: float, time_scale: float) -> None:
+    """Sleep for a scaled simulated latency."""
+    if time_scale > 0:
+        time.sleep(latency_s * time_scale)
+
+
+def build_fake_services(
+    latencies: ScenarioLatencies,
+    time_scale: float,
+    recorder: PortRecorder,
+) -> ExecutionServices:
+    """Wire fake build/deploy/run ports that only sleep and record."""
+
+    def fake_build(request: BuildRequest) -> None:
+        latency = latencies.build_s[request.service_name]
+        recorder.record("build_service", latency)
+        simulate(latency, time_scale)
+
+    def fake_push(request: BuildRequest) -> None:
+        latency = latencies.push_s[request.service_name]
+        recorder.record("push_service", latency)
+        simulate(latency, time_scale)
+
+    def fake_discard(request: BuildRequest) -> None:
+        recorder.record("discard_image", 0.0)
+
+    def fake_deploy(request: DeployRequest) -> None:
+        latency = latencies.deploy_s(request.services)
+        recorder.record("deploy_images", latency)
+        simulate(latency, time_scale)
+
+    def fake_ready(request: DeployRequest, started: float) -> None:
+        # Services are probed concurrently, so the slowest one sets the wait.
+        latency = max((latencies.ready_s[service] for service in request.services), default=0.0)
+        recorder.record("await_readiness", latency)
+        simulate(latency, time_scale)
+
+    def fake_run(cmd: list[str], desc: str) -> None:
+        recorder.record("run_command", 0.0)
+
+    def fake_stream(cmd: list[str], desc: str, on_line: LineHandler) -> None:
+        recorder.record("stream_command", 0.0)
+
+    def fake_capture(cmd: list[str]) -> str | None:
+        recorder.record("capture_command", 0.0)
+        return None
+
+    return ExecutionServices(
+        build_service=fake_build,
+        push_service=fake_push,
+        discard_image=fake_discard,
+        deploy_images=fake_deploy,
+        await_readiness=fake_ready,
+        run_command=fake_run,
+        stream_command=fake_stream,
+        capture_command=fake_capture,
+    )
@@ -0,0 +1,223 @@
+"""Orchestration benchmark suite built on simulated command ports.
+
+Usage:
+    uv run -m benchmarks.orchestration [--scenario NAME] [--update-baselines]
+
+Runs fully offline: no Docker, no Ansible, no `.env`. Exits non-zero when a
+scenario regresses against `benchmarks/baselines.json`.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from benchmarks.fakes import (
+    PortRecorder,
+    ScenarioLatencies,
+    build_fake_services,
+    draw_latencies,
+)
+from src.cli.executor import execute_build, execute_deploy
+from src.core.runtime.shell import console, get_console, print_header
+
+BASELINES_FILE = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_TIME_SCALE = 1e-4
+OVERHEAD_REPEATS = 5
+
+# Allowed slack before a metric counts as a regression: (relative, absolute)
+MAKESPAN_TOLERANCE = (0.10, 0.0)
+# Real seconds of sleep jitter tolerated on top of the relative makespan slack
+MAKESPAN_JITTER_S = 0.01
+OVERHEAD_TOLERANCE = (0.50, 5.0)
+PEAK_MEMORY_TOLERANCE = (0.25, 64.0)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A benchmark shape: how many services, hosts, and which arch."""
+
+    name: str
+    services: int
+    hosts: int
+    arch: str = "amd"
+    seed: int = 7
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario(name="registry-7x1", services=7, hosts=1),
+    Scenario(name="fleet-50x10", services=50, hosts=10),
+    Scenario(name="fleet-200x50", services=200, hosts=50),
+    Scenario(name="fleet-250x50-arm", services=250, hosts=50, arch="arm"),
+)
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """Measured metrics for one scenario."""
+
+    makespan_s: float
+    busy_s: float
+    overhead_ms: float
+    peak_kib: float
+
+
+def service_names(count: int) -> list[str]:
+    """Generate stable synthetic service names."""
+    return [f"svc-{index:03d}" for index in range(count)]
+
+
+def run_both(
+    scenario: Scenario,
+    services: list[str],
+    latencies: ScenarioLatencies,
+    time_scale: float,
+) -> tuple[float, PortRecorder]:
+    """Run build then deploy through the real executor and fake ports."""
+    recorder = PortRecorder()
+    fake_services = build_fake_services(latencies, time_scale, recorder)
+
+    # The executor's own reports (stage utilization) are emitted but not rendered
+    get_console().quiet = True
+    try:
+        started = time.perf_counter()
+        execute_build(scenario.arch, services, fake_services)
+        execute_deploy(scenario.arch, services, fake_services)
+        return time.perf_counter() - started, recorder
+    finally:
+        get_console().quiet = False
+
+
+def measure(scenario: Scenario, time_scale: float) -> ScenarioResult:
+    """Measure makespan, orchestration overhead, and peak memory."""
+    services = service_names(scenario.services)
+    latencies = draw_latencies(services, scenario.hosts, scenario.seed)
+    latencies.deploy_s(tuple(services))
+
+    wall_s, recorder = run_both(scenario, services, latencies, time_scale)
+
+    # Zero-latency runs isolate the executor and planner cost itself.
+    overhead_s = min(
+        run_both(scenario, services, latencies, 0.0)[0] for _ in range(OVERHEAD_REPEATS)
+    )
+
+    tracemalloc.start()
+    run_both(scenario, services, latencies, 0.0)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ScenarioResult(
+        makespan_s=round(wall_s / time_scale, 1),
+        busy_s=round(sum(recorder.busy_s.values()), 1),
+        overhead_ms=round(overhead_s * 1000, 3),
+        peak_kib=round(peak_bytes / 1024, 1),
+    )
+
+
+def exceeds(current: float, baseline: float, tolerance: tuple[float, float]) -> bool:
+    """Return whether a metric is worse than its baseline plus slack."""
+    relative, absolute = tolerance
+    return current > baseline * (1 + relative) + absolute
+
+
+def find_regressions(
+    result: ScenarioResult,
+    baseline: dict[str, float],
+    time_scale: float,
+) -> list[str]:
+    """Compare a result with its stored baseline."""
+    makespan_tolerance = (
+        MAKESPAN_TOLERANCE[0],
+        MAKESPAN_TOLERANCE[1] + MAKESPAN_JITTER_S / time_scale,
+    )
+    checks = (
+        ("makespan_s", result.makespan_s, makespan_tolerance),
+        ("overhead_ms", result.overhead_ms, OVERHEAD_TOLERANCE),
+        ("peak_kib", result.peak_kib, PEAK_MEMORY_TOLERANCE),
+    )
+    return [
+        f"{metric} {current} > baseline {baseline[metric]}"
+        for metric, current, tolerance in checks
+        if metric in baseline and exceeds(current, baseline[metric], tolerance)
+    ]
+
+
+def load_baselines() -> dict[str, dict[str, float]]:
+    """Read stored baselines, or an empty mapping when none exist yet."""
+    if not BASELINES_FILE.exists():
+        return {}
+    return json.loads(BASELINES_FILE.read_text())
+
+
+def main() -> int:
+    """Run the selected scenarios and report regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", help="run only the named scenario(s)")
+    parser.add_argument("--time-scale", type=float, default=DEFAULT_TIME_SCALE)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    baselines = load_baselines()
+
+    from rich.table import Table
+
+    print_header("Orchestration Benchmarks")
+    table = Table(
+        "Scenario",
+        "Services",
+        "Hosts",
+        "Arch",
+        "Makespan (sim s)",
+        "Port busy (sim s)",
+        "Overhead (ms)",
+        "Peak (KiB)",
+        "Result",
+    )
+
+    results: dict[str, ScenarioResult] = {}
+    failures = 0
+    for scenario in selected:
+        result = measure(scenario, args.time_scale)
+        results[scenario.name] = result
+
+        regressions = [] if args.update_baselines else find_regressions(
+            result, baselines.get(scenario.name, {}), args.time_scale
+        )
+        failures += bool(regressions)
+        status = "[red]" + "; ".join(regressions) + "[/red]" if regressions else "[green]ok[/green]"
+        if scenario.name not in baselines and not args.update_baselines:
+            status = "[yellow]no baseline[/yellow]"
+
+        table.add_row(
+            scenario.name,
+            str(scenario.services),
+            str(scenario.hosts),
+            scenario.arch,
+            f"{result.makespan_s:.0f}",
+            f"{result.busy_s:.0f}",
+            f"{result.overhead_ms:.2f}",
+            f"{result.peak_kib:.0f}",
+            status,
+        )
+
+    console.print(table)
+
+    if args.update_baselines:
+        baselines.update({name: asdict(result) for name, result in results.items()})
+        BASELINES_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        console.print(f"[bold green]✅ Baselines written to {BASELINES_FILE}[/bold green]")
+        return 0
+
+    if failures:
+        console.print(f"[bold red]❌ {failures} scenario(s) regressed.[/bold red]")
+        return 1
+
+    console.print("[bold green]✅ No regressions.[/bold green]")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Collect deploy-relevant Docker state on a remote host as one JSON document.
+
+Shipped to each host by `ansible -m script`, so it must stay standalone
+(stdlib only) and run on the host's system Python 3.
+
+Usage: collect-remote-state.py <deploy_dir> [image_ref ...]
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+
+SNAPSHOT_VERSION = 1
+SIZE_UNITS = {"B": 1, "KB": 10**3, "MB": 10**6, "GB": 10**9, "TB": 10**12}
+SIZE_PATTERN = re.compile(r"^([\d.]+)\s*([kKMGT]?B)")
+
+
+def docker(args, cwd=None):
+    """Run a docker command and return stdout, or "" when it fails."""
+    try:
+        result = subprocess.run(
+            ["docker", *args], cwd=cwd, capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return ""
+    return result.stdout
+
+
+def parse_size(text):
+    """Convert docker's human sizes ("1.2GB (40%)") to bytes."""
+    match = SIZE_PATTERN.match(text.strip())
+    if not match:
+        return 0
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def collect_images(refs):
+    images = {}
+    for ref in refs:
+        output = docker(["image", "inspect", "--format", "{{json .}}", ref])
+        try:
+            image = json.loads(output)
+        except ValueError:
+            continue
+        images[ref] = {"id": image.get("Id", ""), "digests": image.get("RepoDigests") or []}
+    return images
+
+
+def collect_containers(deploy_dir):
+    ids = docker(["compose", "ps", "--all", "--quiet"], cwd=deploy_dir).split()
+    if not ids:
+        return []
+    try:
+        inspected = json.loads(docker(["inspect", *ids]) or "[]")
+    except ValueError:
+        return []
+
+    containers = []
+    for item in inspected:
+        labels = (item.get("Config") or {}).get("Labels") or {}
+        state = item.get("State") or {}
+        containers.append(
+            {
+                "service": labels.get("com.docker.compose.service", ""),
+                "name": item.get("Name", "").lstrip("/"),
+                "image_id": item.get("Image", ""),
+                "config_hash": labels.get("com.docker.compose.config-hash", ""),
+                "state": state.get("Status", ""),
+                "health": (state.get("Health") or {}).get("Status", ""),
+            }
+        )
+    return containers
+
+
+def collect_desired_hashes(deploy_dir):
+    hashes = {}
+    for line in docker(["compose", "config", "--hash", "*"], cwd=deploy_dir).splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            hashes[parts[0]] = parts[1]
+    return hashes
+
+
+def collect_disk():
+    disk = {"images_bytes": 0, "reclaimable_bytes": 0, "free_bytes": 0}
+    for line in docker(["system", "df", "--format", "{{json .}}"]).splitlines():
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        if row.get("Type") == "Images":
+            disk["images_bytes"] = parse_size(row.get("Size", ""))
+        disk["reclaimable_bytes"] += parse_size(row.get("Reclaimable", ""))
+
+    root_dir = docker(["info", "--format", "{{.DockerRootDir}}"]).strip() or "/"
+    try:
+        disk["free_bytes"] = shutil.disk_usage(root_dir).free
+    except OSError:
+        pass
+    return disk
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1], file=sys.stderr)
+        return 2
+
+    deploy_dir, refs = sys.argv[1], sys.argv[2:]
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "images": collect_images(refs),
+        "containers": collect_containers(deploy_dir),
+        "desired_hashes": collect_desired_hashes(deploy_dir),
+        "disk": collect_disk(),
+    }
+    print(json.dumps(snapshot, separators=(",", ":")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
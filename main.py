@@ -2,14 +2,14 @@
 """Main entry point for Bazarrify Deployment Tool."""
 
 import subprocess
-from rich.prompt import Prompt
+import sys
+from collections.abc import Callable
 
-from src.core.runtime.shell import print_header, console, load_env, exit_with_message
 from src.cli.parser import parse_cli_args
-from src.cli.menu import PRESETS, handle_manual_flow, handle_preset_flow
-from src.cli.executor import execute_operation
+from src.core.config import get_service_catalog, load_runtime_env
+from src.core.runtime.shell import exit_with_message
 
-from src.core.config import PROJECT_ROOT
+PROFILE_STARTUP_FLAG = "--profile-startup"
 
 
 def run_interactive_mode() -> tuple[str, str, list[str]]:
@@ -18,6 +18,11 @@ def run_interactive_mode() -> tuple[str, str, list[str]]:
     Returns:
         Tuple of (mode, arch, services)
     """
+    from rich.prompt import Prompt
+
+    from src.cli.menu import PRESETS, handle_manual_flow, handle_preset_flow
+    from src.core.runtime.shell import console, print_header
+
     print_header("Bazarrify Deployment Tool")
 
     # Display preset options
@@ -34,9 +39,27 @@ def run_interactive_mode() -> tuple[str, str, list[str]]:
         return handle_preset_flow(PRESETS, choice)
 
 
+def load_operation_path() -> Callable[[str, str, list[str]], None]:
+    """Import everything the non-interactive path needs before it runs a command.
+
+    `--profile-startup` measures exactly this function, so keep heavy imports
+    out of it unless every CLI run needs them.
+    """
+    from src.cli.executor import execute_operation
+
+    return execute_operation
+
+
 def main() -> None:
     """Main application entry point."""
-    load_env(PROJECT_ROOT / ".env")
+    if sys.argv[1:2] == [PROFILE_STARTUP_FLAG]:
+        from src.cli.startup import profile_startup
+
+        raise SystemExit(profile_startup())
+
+    load_runtime_env()
+    # Surface registry schema errors before any prompt or command runs
+    get_service_catalog()
 
     # Try CLI args first
     cli_result = parse_cli_args()
@@ -49,6 +72,7 @@ def main() -> None:
         mode, arch, services = run_interactive_mode()
 
     # Execute the operation
+    execute_operation = load_operation_path()
     execute_operation(mode, arch, services)
 
 
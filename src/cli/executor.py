@@ -1,10 +1,14 @@
 """Operation execution orchestrator."""
 
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Callable
+
+from src.core.config import validate_operation_config
 from src.core.domain.orchestration import plan_build_requests, plan_deploy_request
-from src.core.runtime.shell import fail
+from src.core.runtime.events import track_run
 from src.core.runtime.services import DEFAULT_EXECUTION_SERVICES, ExecutionServices
+from src.core.runtime.shell import fail
 
 
 def execute_build(
@@ -12,9 +16,17 @@ def execute_build(
     services: list[str],
     execution_services: ExecutionServices = DEFAULT_EXECUTION_SERVICES,
 ) -> None:
-    """Execute build operation for given services."""
-    for request in plan_build_requests(arch, services):
-        execution_services.build_service(request)
+    """Build services, pushing each one on a separate upload queue as it finishes."""
+    from src.core.runtime.pipeline import report_stage_utilization, run_build_pipeline
+
+    started = time.monotonic()
+    stages = run_build_pipeline(
+        plan_build_requests(arch, services),
+        execution_services.build_service,
+        execution_services.push_service,
+        execution_services.discard_image,
+    )
+    report_stage_utilization(stages, time.monotonic() - started)
 
 
 def execute_deploy(
@@ -22,8 +34,100 @@ def execute_deploy(
     services: list[str],
     execution_services: ExecutionServices = DEFAULT_EXECUTION_SERVICES,
 ) -> None:
-    """Execute deploy operation for given services."""
-    execution_services.deploy_images(plan_deploy_request(arch, services))
+    """Execute deploy operation, then wait for the deployed services to be ready."""
+    request = plan_deploy_request(arch, services)
+    started = time.monotonic()
+    execution_services.deploy_images(request)
+    execution_services.await_readiness(request, started)
+
+
+def execute_watch(arch: str, services: list[str]) -> None:
+    """Rebuild and redeploy services whenever their build context changes."""
+    from src.cli.watch import watch_services
+
+    watch_services(
+        arch,
+        services,
+        build=execute_build,
+        deploy=lambda arch, services: execute_deploy(arch, services),
+    )
+
+
+def execute_analyze(services: list[str]) -> None:
+    """Report each service's effective build context and suggest ignore rules."""
+    from src.core.config import resolve_context_path
+    from src.docker.context_report import analyze_context, print_context_analysis
+
+    for service in services:
+        print_context_analysis(service, analyze_context(resolve_context_path(service)))
+
+
+def execute_cache_report(
+    services: list[str],
+    execution_services: ExecutionServices = DEFAULT_EXECUTION_SERVICES,
+) -> None:
+    """Show the size of every cache mount the services declare."""
+    from src.core.config import get_service_definition
+    from src.docker.cache_mounts import (
+        measure_caches,
+        print_cache_table,
+        read_cache_mounts,
+    )
+
+    records_by_id = read_cache_mounts(execution_services.capture_command)
+    print_cache_table(
+        {
+            service: (
+                measure_caches(records_by_id, get_service_definition(service).caches)
+                if records_by_id is not None
+                else None
+            )
+            for service in services
+        }
+    )
+
+
+def execute_cache_clear(
+    services: list[str],
+    execution_services: ExecutionServices = DEFAULT_EXECUTION_SERVICES,
+) -> None:
+    """Clear only the cache mounts the services declare, leaving other build cache alone."""
+    from src.core.config import get_service_definition
+    from src.docker.cache_mounts import (
+        clear_service_caches,
+        measure_caches,
+        read_cache_mounts,
+    )
+
+    records_by_id = read_cache_mounts(execution_services.capture_command)
+    if records_by_id is None:
+        fail("Could not read BuildKit disk usage (`docker buildx du --verbose`)")
+    for service in services:
+        clear_service_caches(
+            execution_services.run_command,
+            service,
+            measure_caches(records_by_id, get_service_definition(service).caches),
+        )
+
+
+def execute_mirror_warm(
+    arch: str,
+    services: list[str],
+    execution_services: ExecutionServices = DEFAULT_EXECUTION_SERVICES,
+) -> None:
+    """Copy the services' current Docker Hub tags into the registry mirror."""
+    from src.core.config import get_registry_mirror
+    from src.deploy.mirror import warm_mirror
+
+    mirror = get_registry_mirror()
+    if not mirror:
+        fail("REGISTRY_MIRROR is not set in .env")
+    warm_mirror(
+        list(plan_deploy_request(arch, services).images),
+        mirror,
+        execution_services.run_command,
+        execution_services.capture_command,
+    )
 
 
 OperationHandler = Callable[[str, list[str]], None]
@@ -35,16 +139,21 @@ class OperationSpec:
 
     name: str
     handlers: tuple[OperationHandler, ...]
+    builds: bool = False
+    deploys: bool = False
+    tracks_runs: bool = True
 
 
 OPERATIONS: tuple[OperationSpec, ...] = (
     OperationSpec(
         name="build",
         handlers=(lambda arch, services: execute_build(arch, services),),
+        builds=True,
     ),
     OperationSpec(
         name="deploy",
         handlers=(lambda arch, services: execute_deploy(arch, services),),
+        deploys=True,
     ),
     OperationSpec(
         name="both",
@@ -52,6 +161,32 @@ OPERATIONS: tuple[OperationSpec, ...] = (
             lambda arch, services: execute_build(arch, services),
             lambda arch, services: execute_deploy(arch, services),
         ),
+        builds=True,
+        deploys=True,
+    ),
+    OperationSpec(
+        name="watch",
+        handlers=(lambda arch, services: execute_watch(arch, services),),
+        builds=True,
+        deploys=True,
+        tracks_runs=False,
+    ),
+    OperationSpec(
+        name="analyze",
+        handlers=(lambda arch, services: execute_analyze(services),),
+        builds=True,
+    ),
+    OperationSpec(
+        name="cache",
+        handlers=(lambda arch, services: execute_cache_report(services),),
+    ),
+    OperationSpec(
+        name="mirror-warm",
+        handlers=(lambda arch, services: execute_mirror_warm(arch, services),),
+    ),
+    OperationSpec(
+        name="cache-clear",
+        handlers=(lambda arch, services: execute_cache_clear(services),),
     ),
 )
 
@@ -67,5 +202,23 @@ def execute_operation(mode: str, arch: str, services: list[str]) -> None:
     if operation is None:
         fail(f"Invalid operation: {mode}")
 
-    for handler in operation.handlers:
-        handler(arch, services)
+    validate_operation_config(
+        services,
+        builds=operation.builds,
+        deploys=operation.deploys,
+    )
+
+    from src.core.runtime.metrics import install_metrics_export, metrics_enabled
+
+    if metrics_enabled():
+        install_metrics_export()
+
+    if not operation.tracks_runs:
+        # Watch mode reports every rebuild cycle as a run of its own
+        for handler in operation.handlers:
+            handler(arch, services)
+        return
+
+    with track_run(mode, arch, services):
+        for handler in operation.handlers:
+            handler(arch, services)
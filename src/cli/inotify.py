@@ -0,0 +1,104 @@
+"""Linux inotify through ctypes, used by watch mode to skip idle rescans.
+
+Only "something changed under this directory" is needed, so events are
+reduced to the key each watched directory was registered under. Callers
+still rescan to decide whether the change matters (e.g. an ignored file).
+"""
+
+import os
+import struct
+from collections.abc import Iterable
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+
+class InotifyWatcher:
+    """Map inotify events on watched directories back to caller-chosen keys."""
+
+    def __init__(self) -> None:
+        import ctypes
+
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._keys: dict[int, str] = {}
+
+    def watch(self, key: str, directories: Iterable[str]) -> None:
+        """Watch directories for `key`; re-adding a watched directory is a no-op.
+
+        Raises:
+            OSError: when the kernel refuses a watch, e.g. `max_user_watches`
+        """
+        import ctypes
+
+        for directory in directories:
+            descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), WATCH_MASK
+            )
+            if descriptor < 0:
+                errno = ctypes.get_errno()
+                if errno == 2:  # ENOENT: removed since it was listed
+                    continue
+                raise OSError(errno, f"inotify watch on {directory}: {os.strerror(errno)}")
+            self._keys[descriptor] = key
+
+    def drain(self) -> set[str] | None:
+        """Return the keys that had events since the last call.
+
+        Returns:
+            The changed keys, or None when the kernel queue overflowed and
+            every key has to be rescanned
+        """
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, READ_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                descriptor, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + name_length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                key = self._keys.get(descriptor)
+                if key is not None:
+                    changed.add(key)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_inotify() -> InotifyWatcher | None:
+    """Return an inotify watcher, or None where inotify is unavailable."""
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError):
+        return None
@@ -3,15 +3,14 @@
 from dataclasses import dataclass
 from typing import Callable, Tuple, List
 from rich.prompt import Prompt
-from src.core.config import get_services_config
+from src.core.config import get_service_names
 from src.core.domain.choices import OPERATION_CHOICES, PLATFORM_CHOICES, build_menu_options
 from src.core.runtime.shell import print_header, console, fail
 from src.cli.ui import select_from_menu
 
 def get_services() -> list[str]:
     """Load services list from config."""
-    config = get_services_config()
-    return list(config.get("services", {}).keys())
+    return get_service_names()
 
 
 def select_services() -> list[str]:
@@ -21,10 +21,15 @@ CommandParser = Callable[[list[str]], ParsedCommand]
 
 @dataclass(frozen=True)
 class CliCommand:
-    """Declarative CLI command definition."""
+    """Declarative CLI command definition.
+
+    A command with a `keyword` only handles arguments starting with that word;
+    the others are tried in order for everything else.
+    """
 
     name: str
     parse: CommandParser
+    keyword: str | None = None
 
 
 def parse_mode_arch_services(args: list[str]) -> ParsedCommand:
@@ -44,8 +49,38 @@ def parse_mode_arch_services(args: list[str]) -> ParsedCommand:
     return ParsedCommand(mode=mode, arch=arch, services=args[2:])
 
 
+def parse_analyze_services(args: list[str]) -> ParsedCommand:
+    """Parse `analyze <service>...`, which needs no architecture."""
+    if len(args) < 2:
+        fail("Usage: main.py analyze <service>...")
+
+    return ParsedCommand(mode="analyze", arch="", services=args[1:])
+
+
+def parse_cache_services(args: list[str]) -> ParsedCommand:
+    """Parse `cache <service>...` and `cache-clear <service>...`."""
+    if len(args) < 2:
+        fail(f"Usage: main.py {args[0].lower()} <service>...")
+
+    return ParsedCommand(mode=args[0].lower(), arch="", services=args[1:])
+
+
+def parse_mirror_warm(args: list[str]) -> ParsedCommand:
+    """Parse `mirror-warm <arch> <service>...`."""
+    if len(args) < 3:
+        fail("Usage: main.py mirror-warm <arch> <service>...")
+    if args[1] not in get_choice_values(PLATFORM_CHOICES):
+        fail(f"Invalid platform: {args[1]}")
+
+    return ParsedCommand(mode="mirror-warm", arch=args[1], services=args[2:])
+
+
 CLI_COMMANDS: tuple[CliCommand, ...] = (
     CliCommand(name="mode-arch-services", parse=parse_mode_arch_services),
+    CliCommand(name="analyze-services", parse=parse_analyze_services, keyword="analyze"),
+    CliCommand(name="cache-services", parse=parse_cache_services, keyword="cache"),
+    CliCommand(name="cache-clear-services", parse=parse_cache_services, keyword="cache-clear"),
+    CliCommand(name="mirror-warm", parse=parse_mirror_warm, keyword="mirror-warm"),
 )
 
 
@@ -61,7 +96,11 @@ def parse_cli_args() -> ParsedCommand | None:
     raw_args = sys.argv[1:]
     last_error: str | None = None
 
-    for command in CLI_COMMANDS:
+    keyword = raw_args[0].lower()
+    commands = [command for command in CLI_COMMANDS if command.keyword == keyword] or [
+        command for command in CLI_COMMANDS if command.keyword is None
+    ]
+    for command in commands:
         try:
             return command.parse(raw_args)
         except SystemExit as exc:
@@ -0,0 +1,132 @@
+"""Startup import profiling for the non-interactive CLI path."""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from src.core.config import PROJECT_ROOT
+from src.core.runtime.shell import console, fail, print_header
+
+STARTUP_PROBE = "import main; main.get_service_catalog(); main.load_operation_path()"
+DEFAULT_STARTUP_BUDGET_MS = 250.0
+STARTUP_SAMPLES = 5
+TOP_PACKAGES = 12
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """One line of `python -X importtime` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+@dataclass(frozen=True)
+class StartupSample:
+    """Wall-clock time and import breakdown for one cold interpreter start."""
+
+    wall_ms: float
+    imports: tuple[ImportTiming, ...]
+
+
+def get_startup_budget_ms() -> float:
+    """Resolve the cold-start budget, overridable through `STARTUP_BUDGET_MS`."""
+    raw_value = os.getenv("STARTUP_BUDGET_MS", "")
+    try:
+        return float(raw_value) if raw_value else DEFAULT_STARTUP_BUDGET_MS
+    except ValueError:
+        fail(f"Invalid STARTUP_BUDGET_MS: '{raw_value}'")
+
+
+def parse_importtime(output: str) -> tuple[ImportTiming, ...]:
+    """Parse `-X importtime` stderr into timing records."""
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        timings.append(
+            ImportTiming(
+                module=fields[2].strip(),
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+            )
+        )
+    return tuple(timings)
+
+
+def measure_startup() -> StartupSample:
+    """Start a fresh interpreter and import the non-interactive CLI path."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_PROBE],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if result.returncode != 0:
+        fail("Startup probe failed.", result.stderr)
+
+    return StartupSample(wall_ms=wall_ms, imports=parse_importtime(result.stderr))
+
+
+def summarize_by_package(imports: tuple[ImportTiming, ...]) -> list[tuple[str, float, int]]:
+    """Group self import time by top-level package, slowest first."""
+    totals: dict[str, int] = defaultdict(int)
+    counts: dict[str, int] = defaultdict(int)
+    for timing in imports:
+        package = timing.module.split(".")[0]
+        totals[package] += timing.self_us
+        counts[package] += 1
+
+    return sorted(
+        ((package, totals[package] / 1000, counts[package]) for package in totals),
+        key=lambda row: row[1],
+        reverse=True,
+    )
+
+
+def profile_startup() -> int:
+    """Report the import-time breakdown and check it against the budget.
+
+    Returns:
+        Process exit code: 0 within budget, 1 when the budget is exceeded
+    """
+    budget_ms = get_startup_budget_ms()
+    samples = [measure_startup() for _ in range(STARTUP_SAMPLES)]
+    best = min(samples, key=lambda sample: sample.wall_ms)
+    median_ms = statistics.median(sample.wall_ms for sample in samples)
+    import_ms = sum(timing.self_us for timing in best.imports) / 1000
+
+    from rich.table import Table
+
+    print_header("Startup Profile")
+    table = Table("Package", "Self (ms)", "Modules", "Share")
+    for package, self_ms, count in summarize_by_package(best.imports)[:TOP_PACKAGES]:
+        share = self_ms / import_ms * 100 if import_ms else 0.0
+        table.add_row(package, f"{self_ms:.1f}", str(count), f"{share:.0f}%")
+    console.print(table)
+
+    console.print(f"Probe:        [cyan]{STARTUP_PROBE}[/cyan]")
+    console.print(f"Imports:      {import_ms:.1f} ms across {len(best.imports)} modules")
+    console.print(f"Cold start:   best {best.wall_ms:.1f} ms, median {median_ms:.1f} ms")
+    console.print(f"Budget:       {budget_ms:.0f} ms")
+
+    if best.wall_ms > budget_ms:
+        console.print(
+            f"[bold red]❌ Cold start exceeds budget by {best.wall_ms - budget_ms:.1f} ms[/bold red]"
+        )
+        return 1
+
+    console.print("[bold green]✅ Cold start within budget.[/bold green]")
+    return 0
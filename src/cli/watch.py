@@ -0,0 +1,228 @@
+"""Watch mode: rebuild and redeploy services when their build context changes."""
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.cli.inotify import InotifyWatcher, open_inotify
+from src.core.config import resolve_context_path
+from src.core.runtime.events import track_run
+from src.core.runtime.run_logs import begin_run
+from src.core.runtime.services import ExecutionServices, build_execution_services
+from src.core.runtime.shell import (
+    CommandCancelled,
+    console,
+    print_header,
+    run_cancellable_command,
+    stream_command,
+)
+from src.docker.context import iter_context_files
+
+DEFAULT_POLL_SECONDS = 1.0
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+# How long Ctrl+C waits for a cycle to stop the command it started
+CANCEL_JOIN_SECONDS = 10.0
+
+ContextSnapshot = dict[str, tuple[int, int]]
+BuildHandler = Callable[[str, list[str], ExecutionServices], None]
+DeployHandler = Callable[[str, list[str]], None]
+
+
+def get_watch_interval(key: str, default: float) -> float:
+    """Read a positive interval override from the environment."""
+    raw_value = os.getenv(key, "")
+    try:
+        value = float(raw_value) if raw_value else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def snapshot_context(
+    context_path: Path,
+    directories: list[str] | None = None,
+) -> ContextSnapshot:
+    """Capture size and mtime for every file BuildKit would receive.
+
+    Args:
+        directories: Collects every directory that was scanned, for inotify
+    """
+    return {
+        entry.rel_path: (entry.size, entry.mtime_ns)
+        for entry in iter_context_files(
+            context_path,
+            on_directory=directories.append if directories is not None else None,
+        )
+    }
+
+
+def start_inotify(contexts: dict[str, Path]) -> InotifyWatcher | None:
+    """Watch every scanned context directory, or return None to keep polling."""
+    watcher = open_inotify()
+    if watcher is None:
+        return None
+    try:
+        for service, path in contexts.items():
+            directories: list[str] = []
+            snapshot_context(path, directories)
+            watcher.watch(service, directories)
+    except OSError as error:
+        watcher.close()
+        console.print(f"[dim]inotify unavailable ({error}); rescanning contexts every poll[/dim]")
+        return None
+    return watcher
+
+
+@dataclass
+class WatchCycle:
+    """A background build-then-deploy run for a batch of changed services."""
+
+    services: tuple[str, ...]
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    deploy_started: threading.Event = field(default_factory=threading.Event)
+    thread: threading.Thread | None = None
+
+    def is_running(self) -> bool:
+        """Return whether the worker thread is still active."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def cancel(self, timeout_s: float | None = None) -> None:
+        """Stop the build phase and wait for the worker to exit."""
+        self.cancel_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout_s)
+
+
+def _run_cycle(
+    arch: str,
+    cycle: WatchCycle,
+    build: BuildHandler,
+    deploy: DeployHandler,
+) -> None:
+    """Build the batch with a cancellable runner, then deploy it."""
+    services = list(cycle.services)
+    # Each cycle gets its own run directory so long watch sessions stay searchable
+    begin_run()
+    build_services = build_execution_services(
+        lambda cmd, desc: run_cancellable_command(cmd, desc, cycle.cancel_event),
+        lambda cmd, desc, on_line: stream_command(cmd, desc, on_line, cycle.cancel_event),
+    )
+    try:
+        with track_run("watch", arch, services):
+            build(arch, services, build_services)
+            cycle.deploy_started.set()
+            deploy(arch, services)
+    except CommandCancelled:
+        console.print(
+            f"[yellow]↻ Superseded by newer changes: {', '.join(services)}[/yellow]"
+        )
+        return
+    except SystemExit:
+        console.print("[yellow]⏸  Waiting for the next change before retrying.[/yellow]")
+        return
+
+    console.print(f"[bold green]👀 Redeployed: {', '.join(services)}[/bold green]")
+
+
+def _start_cycle(
+    arch: str,
+    services: tuple[str, ...],
+    build: BuildHandler,
+    deploy: DeployHandler,
+) -> WatchCycle:
+    cycle = WatchCycle(services=services)
+    cycle.thread = threading.Thread(
+        target=_run_cycle,
+        args=(arch, cycle, build, deploy),
+        name="watch-cycle",
+        daemon=True,
+    )
+    cycle.thread.start()
+    return cycle
+
+
+def watch_services(
+    arch: str,
+    services: list[str],
+    build: BuildHandler,
+    deploy: DeployHandler,
+) -> None:
+    """Poll build contexts and redeploy only the services that changed.
+
+    With inotify, a context is only rescanned after an event in one of its
+    directories; elsewhere every poll rescans it. Edits are debounced so a
+    burst of saves triggers one cycle. New changes cancel a cycle that is
+    still building; a cycle that already started its deploy is allowed to
+    finish first.
+    """
+    poll_seconds = get_watch_interval("WATCH_POLL_SECONDS", DEFAULT_POLL_SECONDS)
+    debounce_seconds = get_watch_interval("WATCH_DEBOUNCE_SECONDS", DEFAULT_DEBOUNCE_SECONDS)
+
+    contexts = {service: resolve_context_path(service) for service in services}
+    snapshots = {service: snapshot_context(path) for service, path in contexts.items()}
+    watcher = start_inotify(contexts)
+
+    print_header("Watch Mode")
+    for service, path in contexts.items():
+        console.print(
+            f"[green]•[/green] {service}: [cyan]{path}[/cyan] ({len(snapshots[service])} files)"
+        )
+    console.print("\n[dim]Waiting for changes. Press Ctrl+C to stop.[/dim]")
+
+    pending: set[str] = set()
+    last_change = 0.0
+    cycle: WatchCycle | None = None
+
+    try:
+        while True:
+            time.sleep(poll_seconds)
+
+            dirty = watcher.drain() if watcher is not None else None
+            for service, path in contexts.items():
+                if dirty is not None and service not in dirty:
+                    continue
+                directories: list[str] = []
+                current = snapshot_context(path, directories)
+                if watcher is not None:
+                    # New subdirectories need their own watches
+                    try:
+                        watcher.watch(service, directories)
+                    except OSError:
+                        watcher.close()
+                        watcher = None
+                if current != snapshots[service]:
+                    snapshots[service] = current
+                    pending.add(service)
+                    last_change = time.monotonic()
+
+            if cycle is not None and not cycle.is_running():
+                cycle = None
+
+            if not pending or time.monotonic() - last_change < debounce_seconds:
+                continue
+
+            if cycle is not None:
+                if cycle.deploy_started.is_set():
+                    continue
+                cycle.cancel()
+                pending.update(cycle.services)
+                cycle = None
+
+            batch = tuple(service for service in services if service in pending)
+            pending.clear()
+            console.print(f"\n[bold magenta]🔁 Changes detected: {', '.join(batch)}[/bold magenta]")
+            cycle = _start_cycle(arch, batch, build, deploy)
+    finally:
+        if watcher is not None:
+            watcher.close()
+        if cycle is not None and cycle.is_running():
+            console.print("[dim]Stopping the running cycle...[/dim]")
+            cycle.cancel(CANCEL_JOIN_SECONDS)
+            if cycle.is_running():
+                console.print(
+                    f"[yellow]⚠️  The cycle for {', '.join(cycle.services)} did not stop within"
+                    f" {CANCEL_JOIN_SECONDS:g}s; its deploy may still be running[/yellow]"
+                )
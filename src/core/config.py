@@ -1,21 +1,88 @@
 """Configuration loading utilities."""
 
+import hashlib
+import json
+import os
+import re
+import shlex
 from pathlib import Path
 from typing import Optional, Any
-import yaml
-from src.core.runtime.shell import fail
+from src.core.domain.catalog import (
+    BUDGET_ACTIONS,
+    CACHE_SHARING_MODES,
+    CacheMountSpec,
+    ImageBudget,
+    ROLLOUT_STRATEGIES,
+    MigrationSpec,
+    ReadinessSpec,
+    RolloutSpec,
+    ServiceCatalog,
+    ServiceDefinition,
+)
+from src.core.runtime.shell import fail, load_env
 
 
 # Discovery of Project Root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
 SERVICES_YAML = CONFIG_DIR / "services.yaml"
+ENV_FILE = PROJECT_ROOT / ".env"
+INVENTORY_FILE = CONFIG_DIR / "inventory.ini"
+PLAYBOOK_FILE = CONFIG_DIR / "pull-up-prune.yaml"
 
-_cached_config: Optional[dict[str, Any]] = None
+# Compiled config shared by every process started from this checkout
+CACHE_DIR = PROJECT_ROOT / ".cache"
+SERVICES_CACHE = CACHE_DIR / "services.json"
+# The compiled form is defined by the validator here and the catalog types,
+# so the cache is keyed on their source rather than a hand-bumped version
+SERVICES_SCHEMA_SOURCES: tuple[Path, ...] = (
+    Path(__file__).resolve(),
+    Path(__file__).resolve().parent / "domain" / "catalog.py",
+)
+
+REQUIRED_DEPLOY_ENV: tuple[str, ...] = (
+    "REMOTE_HOST",
+    "SSH_PRIVATE_KEY_FILE",
+    "DEPLOYMENT_DIRECTORY",
+)
+
+REGISTRY_MIRROR_PATTERN = re.compile(r"^[A-Za-z0-9.-]+(?::\d+)?(?:/[a-z0-9._-]+)*$")
+ENV_VAR_PATTERN = re.compile(r"^[A-Z][A-Z0-9_]*$")
+SERVICE_NAME_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_.-]*$")
+SERVICE_FIELDS: frozenset[str] = frozenset(
+    {
+        "context",
+        "compose_service",
+        "stateful",
+        "budget",
+        "readiness",
+        "rollout",
+        "migrations",
+        "caches",
+    }
+)
+BUDGET_LIMIT_FIELDS: tuple[str, ...] = ("max_image_mb", "max_push_delta_mb", "max_context_mb")
+READINESS_FIELDS: frozenset[str] = frozenset(
+    {"compose_service", "container", "http", "tcp", "timeout_s"}
+)
+DEFAULT_READINESS_TIMEOUT_S = 60
+ROLLOUT_FIELDS: frozenset[str] = frozenset({"strategy", "drain_s", "health_timeout_s"})
+MIGRATION_FIELDS: frozenset[str] = frozenset({"command", "paths"})
+MIGRATION_PATH_PATTERN = re.compile(r"^[\w./-]+$")
+CACHE_FIELDS: frozenset[str] = frozenset({"target", "id", "sharing", "max_mb"})
+CACHE_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_-]*$")
+CACHE_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+HTTP_TARGET_PATTERN = re.compile(r"^https?://\S+$")
+TCP_TARGET_PATTERN = re.compile(r"^\S+:\d+$")
+
+_cached_catalog: Optional[ServiceCatalog] = None
+_env_loaded = False
 
 
 def load_config(config_path: Path) -> dict:
     """Load configuration from a YAML file."""
+    import yaml
+
     if not config_path.exists():
         fail(f"Configuration file not found at {config_path}")
 
@@ -26,9 +93,464 @@ def load_config(config_path: Path) -> dict:
             fail(f"Failed to parse YAML: {e}")
 
 
-def get_services_config() -> dict[str, Any]:
-    """Load and cache the services configuration."""
-    global _cached_config
-    if _cached_config is None:
-        _cached_config = load_config(SERVICES_YAML)
-    return _cached_config
+def load_runtime_env() -> None:
+    """Load `.env` into the process environment once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        load_env(ENV_FILE)
+        _env_loaded = True
+
+
+def normalize_service_entry(name: str, entry: Any, errors: list[str]) -> dict[str, Any]:
+    """Validate one service entry and return its normalized mapping.
+
+    Entries may be a bare context env var name or a mapping with a `context` key.
+    """
+    if isinstance(entry, str):
+        entry = {"context": entry}
+
+    if not isinstance(entry, dict):
+        errors.append(f"services.{name}: expected an env var name or a mapping")
+        return {}
+
+    for key in sorted(set(entry) - SERVICE_FIELDS):
+        errors.append(f"services.{name}.{key}: unknown field")
+
+    context = entry.get("context")
+    if not isinstance(context, str) or not ENV_VAR_PATTERN.match(context):
+        errors.append(f"services.{name}.context: expected an UPPER_CASE env var name")
+
+    compose_service = entry.get("compose_service", name)
+    if not isinstance(compose_service, str) or not SERVICE_NAME_PATTERN.match(compose_service):
+        errors.append(f"services.{name}.compose_service: expected a compose service name")
+
+    stateful = entry.get("stateful", False)
+    if not isinstance(stateful, bool):
+        errors.append(f"services.{name}.stateful: expected true or false")
+
+    budget = entry.get("budget")
+    if budget is not None:
+        budget = normalize_budget(name, budget, errors)
+
+    readiness = entry.get("readiness")
+    if readiness is not None:
+        readiness = normalize_readiness(name, readiness, compose_service, errors)
+
+    rollout = normalize_rollout(name, entry.get("rollout", {}), errors)
+    if stateful is True and rollout.get("strategy") == "start-first":
+        errors.append(
+            f"services.{name}.rollout.strategy: stateful services must use stop-first"
+        )
+
+    migrations = entry.get("migrations")
+    if migrations is not None:
+        migrations = normalize_migrations(name, migrations, errors)
+
+    caches = normalize_caches(name, entry.get("caches", {}), errors)
+
+    return {
+        "context": context,
+        "compose_service": compose_service,
+        "stateful": stateful,
+        "budget": budget,
+        "readiness": readiness,
+        "rollout": rollout,
+        "migrations": migrations,
+        "caches": caches,
+    }
+
+
+def normalize_budget(name: str, budget: Any, errors: list[str]) -> dict[str, Any] | None:
+    """Validate a service's image and build context size budget."""
+    prefix = f"services.{name}.budget"
+    if not isinstance(budget, dict):
+        errors.append(f"{prefix}: expected a mapping")
+        return None
+
+    for key in sorted(set(budget) - {*BUDGET_LIMIT_FIELDS, "on_exceed"}):
+        errors.append(f"{prefix}.{key}: unknown field")
+
+    normalized: dict[str, Any] = {}
+    for key in BUDGET_LIMIT_FIELDS:
+        value = budget.get(key)
+        if value is None:
+            continue
+        if not positive_number(value):
+            errors.append(f"{prefix}.{key}: expected a positive number of megabytes")
+            continue
+        normalized[key] = value
+
+    on_exceed = budget.get("on_exceed", "warn")
+    if on_exceed not in BUDGET_ACTIONS:
+        errors.append(f"{prefix}.on_exceed: expected one of {', '.join(BUDGET_ACTIONS)}")
+    normalized["on_exceed"] = on_exceed
+    return normalized
+
+
+def positive_number(value: Any) -> bool:
+    """Return whether a config value is a positive int or float (not a bool)."""
+    return not isinstance(value, bool) and isinstance(value, (int, float)) and value > 0
+
+
+def normalize_rollout(name: str, rollout: Any, errors: list[str]) -> dict[str, Any]:
+    """Validate a service's rollout strategy."""
+    prefix = f"services.{name}.rollout"
+    if not isinstance(rollout, dict):
+        errors.append(f"{prefix}: expected a mapping")
+        return {}
+
+    for key in sorted(set(rollout) - ROLLOUT_FIELDS):
+        errors.append(f"{prefix}.{key}: unknown field")
+
+    defaults = RolloutSpec()
+    strategy = rollout.get("strategy", defaults.strategy)
+    if strategy not in ROLLOUT_STRATEGIES:
+        errors.append(f"{prefix}.strategy: expected one of {', '.join(ROLLOUT_STRATEGIES)}")
+
+    normalized: dict[str, Any] = {"strategy": strategy}
+    for key in ("drain_s", "health_timeout_s"):
+        value = rollout.get(key, getattr(defaults, key))
+        if not positive_number(value):
+            errors.append(f"{prefix}.{key}: expected a positive number of seconds")
+        normalized[key] = value
+    return normalized
+
+
+def normalize_migrations(name: str, migrations: Any, errors: list[str]) -> dict[str, Any] | None:
+    """Validate a service's pre-deploy migration step."""
+    prefix = f"services.{name}.migrations"
+    if not isinstance(migrations, dict):
+        errors.append(f"{prefix}: expected a mapping")
+        return None
+
+    for key in sorted(set(migrations) - MIGRATION_FIELDS):
+        errors.append(f"{prefix}.{key}: unknown field")
+
+    command = migrations.get("command")
+    if not isinstance(command, str) or not command.strip():
+        errors.append(f"{prefix}.command: expected a command string")
+    else:
+        try:
+            shlex.split(command)
+        except ValueError as error:
+            errors.append(f"{prefix}.command: cannot be split into arguments ({error})")
+
+    paths = migrations.get("paths")
+    if (
+        not isinstance(paths, list)
+        or not paths
+        or not all(isinstance(path, str) and MIGRATION_PATH_PATTERN.match(path) for path in paths)
+    ):
+        errors.append(f"{prefix}.paths: expected a non-empty list of paths inside the image")
+        paths = []
+
+    return {"command": command, "paths": paths}
+
+
+def normalize_caches(name: str, caches: Any, errors: list[str]) -> list[dict[str, Any]]:
+    """Validate a service's named BuildKit cache mounts."""
+    prefix = f"services.{name}.caches"
+    if not isinstance(caches, dict):
+        errors.append(f"{prefix}: expected a mapping of cache names")
+        return []
+
+    normalized: list[dict[str, Any]] = []
+    for cache_name, cache in caches.items():
+        cache_prefix = f"{prefix}.{cache_name}"
+        if not isinstance(cache_name, str) or not CACHE_NAME_PATTERN.match(cache_name):
+            errors.append(f"{cache_prefix}: invalid cache name")
+            continue
+        if not isinstance(cache, dict):
+            errors.append(f"{cache_prefix}: expected a mapping")
+            continue
+
+        for key in sorted(set(cache) - CACHE_FIELDS):
+            errors.append(f"{cache_prefix}.{key}: unknown field")
+
+        target = cache.get("target")
+        if not isinstance(target, str) or not target.startswith("/"):
+            errors.append(f"{cache_prefix}.target: expected an absolute path inside the build")
+
+        cache_id = cache.get("id", f"{name}-{cache_name}")
+        if not isinstance(cache_id, str) or not CACHE_ID_PATTERN.match(cache_id):
+            errors.append(f"{cache_prefix}.id: expected letters, digits, '.', '_' or '-'")
+
+        sharing = cache.get("sharing", "shared")
+        if sharing not in CACHE_SHARING_MODES:
+            errors.append(
+                f"{cache_prefix}.sharing: expected one of {', '.join(CACHE_SHARING_MODES)}"
+            )
+
+        max_mb = cache.get("max_mb")
+        if max_mb is not None and not positive_number(max_mb):
+            errors.append(f"{cache_prefix}.max_mb: expected a positive number of megabytes")
+
+        normalized.append(
+            {
+                "name": cache_name,
+                "target": target,
+                "id": cache_id,
+                "sharing": sharing,
+                "max_mb": max_mb,
+            }
+        )
+    return normalized
+
+
+def normalize_readiness(
+    name: str,
+    readiness: Any,
+    compose_service: Any,
+    errors: list[str],
+) -> dict[str, Any] | None:
+    """Validate a service's post-deploy readiness checks."""
+    prefix = f"services.{name}.readiness"
+    if readiness is True:
+        readiness = {}
+    if not isinstance(readiness, dict):
+        errors.append(f"{prefix}: expected a mapping or true")
+        return None
+
+    for key in sorted(set(readiness) - READINESS_FIELDS):
+        errors.append(f"{prefix}.{key}: unknown field")
+
+    compose_service = readiness.get("compose_service", compose_service)
+    if not isinstance(compose_service, str) or not SERVICE_NAME_PATTERN.match(compose_service):
+        errors.append(f"{prefix}.compose_service: expected a compose service name")
+
+    container = readiness.get("container", True)
+    if not isinstance(container, bool):
+        errors.append(f"{prefix}.container: expected true or false")
+
+    targets = (
+        ("http", HTTP_TARGET_PATTERN, "an http(s) URL"),
+        ("tcp", TCP_TARGET_PATTERN, "host:port"),
+    )
+    for key, pattern, expected in targets:
+        value = readiness.get(key)
+        if value is not None and (not isinstance(value, str) or not pattern.match(value)):
+            errors.append(f"{prefix}.{key}: expected {expected}")
+
+    if not container and readiness.get("http") is None and readiness.get("tcp") is None:
+        errors.append(f"{prefix}: nothing to check; enable container or add an http/tcp probe")
+
+    timeout_s = readiness.get("timeout_s", DEFAULT_READINESS_TIMEOUT_S)
+    if not positive_number(timeout_s):
+        errors.append(f"{prefix}.timeout_s: expected a positive number of seconds")
+
+    return {
+        "compose_service": compose_service,
+        "container": container,
+        "http": readiness.get("http"),
+        "tcp": readiness.get("tcp"),
+        "timeout_s": timeout_s,
+    }
+
+
+def normalize_services_config(raw: Any) -> tuple[dict[str, Any], list[str]]:
+    """Validate raw `services.yaml` content against the registry schema.
+
+    Returns:
+        Tuple of (normalized JSON-safe config, validation errors)
+    """
+    errors: list[str] = []
+    if not isinstance(raw, dict):
+        return {}, ["top level: expected a mapping with a 'services' key"]
+
+    for key in sorted(set(raw) - {"services"}):
+        errors.append(f"{key}: unknown top-level key")
+
+    services = raw.get("services")
+    if not isinstance(services, dict) or not services:
+        errors.append("services: expected a non-empty mapping")
+        return {}, errors
+
+    normalized: dict[str, Any] = {}
+    for name, entry in services.items():
+        if not isinstance(name, str) or not SERVICE_NAME_PATTERN.match(name):
+            errors.append(f"services.{name}: invalid service name")
+            continue
+        normalized[name] = normalize_service_entry(name, entry, errors)
+
+    return {"services": normalized}, errors
+
+
+def build_catalog(normalized: dict[str, Any]) -> ServiceCatalog:
+    """Build immutable service definitions from a normalized config."""
+    return ServiceCatalog(
+        services=tuple(
+            ServiceDefinition(
+                name=name,
+                context_env=entry["context"],
+                compose_service=entry["compose_service"],
+                stateful=entry["stateful"],
+                rollout=RolloutSpec(**entry["rollout"]),
+                migrations=(
+                    MigrationSpec(
+                        command=entry["migrations"]["command"],
+                        paths=tuple(entry["migrations"]["paths"]),
+                    )
+                    if entry.get("migrations")
+                    else None
+                ),
+                budget=ImageBudget(**entry["budget"]) if entry.get("budget") else None,
+                readiness=ReadinessSpec(**entry["readiness"]) if entry.get("readiness") else None,
+                caches=tuple(CacheMountSpec(**cache) for cache in entry.get("caches", [])),
+            )
+            for name, entry in normalized["services"].items()
+        )
+    )
+
+
+def get_services_schema_hash() -> str | None:
+    """Hash the source that defines the compiled registry; None when it is unreadable."""
+    digest = hashlib.sha256()
+    try:
+        for path in SERVICES_SCHEMA_SOURCES:
+            digest.update(path.read_bytes())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _read_services_cache(schema: str | None) -> dict[str, Any] | None:
+    if schema is None:
+        return None
+    try:
+        cached = json.loads(SERVICES_CACHE.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("schema") != schema:
+        return None
+    return cached
+
+
+def _write_services_cache(payload: dict[str, Any]) -> None:
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path = SERVICES_CACHE.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload))
+        os.replace(tmp_path, SERVICES_CACHE)
+    except OSError:
+        # The cache is an optimization; a read-only checkout still works.
+        pass
+
+
+def load_service_catalog(config_path: Path = SERVICES_YAML) -> ServiceCatalog:
+    """Load the service registry through the on-disk compiled cache.
+
+    The cache is reused while the source mtime and size are unchanged. When
+    they differ, the source hash decides whether a re-parse is needed. Any
+    edit to the validator or catalog source invalidates it.
+    """
+    if not config_path.exists():
+        fail(f"Configuration file not found at {config_path}")
+
+    stat = config_path.stat()
+    source = {"path": str(config_path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    schema = get_services_schema_hash()
+    cached = _read_services_cache(schema)
+    cached_source = cached.get("source", {}) if cached else {}
+
+    if cached and all(cached_source.get(key) == value for key, value in source.items()):
+        return build_catalog(cached["config"])
+
+    content = config_path.read_bytes()
+    source["sha256"] = hashlib.sha256(content).hexdigest()
+
+    if cached and cached_source.get("path") == source["path"] and cached_source.get("sha256") == source["sha256"]:
+        _write_services_cache({**cached, "source": source})
+        return build_catalog(cached["config"])
+
+    normalized, errors = normalize_services_config(load_config(config_path))
+    if errors:
+        fail(
+            f"Invalid service configuration in {config_path}",
+            "\n".join(f"  - {error}" for error in errors),
+        )
+
+    if schema is not None:
+        _write_services_cache({"schema": schema, "source": source, "config": normalized})
+    return build_catalog(normalized)
+
+
+def get_registry_mirror() -> str:
+    """Return the registry mirror as `host`, `host:port`, or `host:port/path`; "" when unset."""
+    return os.getenv("REGISTRY_MIRROR", "").strip().rstrip("/")
+
+
+def get_service_catalog() -> ServiceCatalog:
+    """Load and cache the validated service catalog for this process."""
+    global _cached_catalog
+    if _cached_catalog is None:
+        _cached_catalog = load_service_catalog()
+    return _cached_catalog
+
+
+def get_service_names() -> list[str]:
+    """Return registered service names in registry order."""
+    return list(get_service_catalog().names())
+
+
+def get_service_definition(service_name: str) -> ServiceDefinition:
+    """Look up a registered service or fail fast."""
+    service = get_service_catalog().get(service_name)
+    if service is None:
+        fail(f"Error: Unknown service '{service_name}'")
+    return service
+
+
+def resolve_context_path(service_name: str) -> Path:
+    """Resolve and verify the build context directory for a service."""
+    env_var = get_service_definition(service_name).context_env
+    context_path_str = os.getenv(env_var, "")
+
+    if not context_path_str:
+        fail(
+            f"Error: Build context path not set for {service_name}",
+            f"[yellow]Please check if {env_var} is defined in .env[/yellow]",
+        )
+
+    context_path = Path(context_path_str)
+    if not context_path.exists():
+        fail(f"Error: Build context path does not exist: {context_path_str}")
+
+    return context_path
+
+
+def validate_operation_config(services: list[str], builds: bool, deploys: bool) -> None:
+    """Check every config input an operation needs before any step runs."""
+    catalog = get_service_catalog()
+    errors = [f"unknown service '{name}'" for name in catalog.unknown(services)]
+
+    if builds:
+        for name in services:
+            service = catalog.get(name)
+            if service is None:
+                continue
+            context_path_str = os.getenv(service.context_env, "")
+            if not context_path_str:
+                errors.append(f"{service.context_env} is not set in .env (build context for {name})")
+            elif not Path(context_path_str).exists():
+                errors.append(f"build context for {name} does not exist: {context_path_str}")
+
+    mirror = get_registry_mirror()
+    if mirror and not REGISTRY_MIRROR_PATTERN.match(mirror):
+        errors.append(
+            f"REGISTRY_MIRROR must be a registry host, optional port and path"
+            f" (e.g. mirror.internal:5000), got '{mirror}'"
+        )
+
+    if deploys:
+        for env_var in REQUIRED_DEPLOY_ENV:
+            if not os.getenv(env_var):
+                errors.append(f"{env_var} is not set in .env (required for deploy)")
+        for required_file in (INVENTORY_FILE, PLAYBOOK_FILE):
+            if not required_file.exists():
+                errors.append(f"missing deploy file: {required_file}")
+
+    if errors:
+        fail(
+            "Configuration check failed",
+            "\n".join(f"  - {error}" for error in errors),
+        )
@@ -4,5 +4,15 @@ from typing import Callable
 from src.core.domain.orchestration import BuildRequest, DeployRequest
 
 BuildServicePort = Callable[[BuildRequest], None]
+PushServicePort = Callable[[BuildRequest], None]
+# Removes a built image that will not be pushed
+DiscardImagePort = Callable[[BuildRequest], None]
 DeployImagesPort = Callable[[DeployRequest], None]
 RunCommandPort = Callable[[list[str], str], None]
+# Returns True when the line was consumed as structured progress, which keeps
+# it out of the tail printed when the command fails
+LineHandler = Callable[[str], bool | None]
+StreamCommandPort = Callable[[list[str], str, LineHandler], None]
+CaptureCommandPort = Callable[[list[str]], str | None]
+# Receives the finished deploy and the monotonic time it started
+ReadinessPort = Callable[[DeployRequest, float], None]
@@ -0,0 +1,123 @@
+"""Typed, immutable service definitions from the service registry."""
+
+from dataclasses import dataclass
+
+BUDGET_ACTIONS: tuple[str, ...] = ("warn", "fail")
+ROLLOUT_STRATEGIES: tuple[str, ...] = ("stop-first", "start-first")
+CACHE_SHARING_MODES: tuple[str, ...] = ("shared", "private", "locked")
+
+
+@dataclass(frozen=True)
+class ImageBudget:
+    """Size limits for a service image and its build context, in megabytes (10^6 bytes)."""
+
+    max_image_mb: float | None = None
+    max_push_delta_mb: float | None = None
+    max_context_mb: float | None = None
+    on_exceed: str = "warn"
+
+
+@dataclass(frozen=True)
+class ReadinessSpec:
+    """How to decide that a deployed service is ready to serve.
+
+    `http` and `tcp` targets may contain `{host}`, replaced by each deploy
+    host's address.
+    """
+
+    compose_service: str
+    container: bool = True
+    http: str | None = None
+    tcp: str | None = None
+    timeout_s: float = 60.0
+
+
+@dataclass(frozen=True)
+class RolloutSpec:
+    """How the remote compose service is replaced on deploy.
+
+    `stop-first` is plain `docker compose up -d`. `start-first` starts the new
+    container next to the old one, waits for it to be healthy, then stops
+    the old one with `drain_s` seconds of grace before removing it.
+    """
+
+    strategy: str = "stop-first"
+    drain_s: float = 10.0
+    health_timeout_s: float = 120.0
+
+
+@dataclass(frozen=True)
+class MigrationSpec:
+    """Pre-deploy migration run in a one-off container from the new image.
+
+    `paths` are fingerprinted inside the image; the command only runs when
+    their content differs from the last successful run on the host.
+    """
+
+    command: str
+    paths: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CacheMountSpec:
+    """A persistent BuildKit cache mount for a dependency manager.
+
+    The Dockerfile mounts it with `RUN --mount=type=cache`, taking `id` and
+    `sharing` from the `<NAME>_CACHE_ID` and `<NAME>_CACHE_SHARING` build args.
+    BuildKit cannot cap a cache mount, so `max_mb` is enforced by pruning the
+    cache after a build that left it larger.
+    """
+
+    name: str
+    target: str
+    id: str
+    sharing: str = "shared"
+    max_mb: float | None = None
+
+    @property
+    def build_arg_prefix(self) -> str:
+        """Return the `<NAME>_CACHE` prefix of this cache's build args."""
+        return f"{self.name.upper().replace('-', '_')}_CACHE"
+
+
+@dataclass(frozen=True)
+class ServiceDefinition:
+    """A deployable service and the env var naming its build context."""
+
+    name: str
+    context_env: str
+    compose_service: str = ""
+    stateful: bool = False
+    budget: ImageBudget | None = None
+    readiness: ReadinessSpec | None = None
+    rollout: RolloutSpec = RolloutSpec()
+    migrations: MigrationSpec | None = None
+    caches: tuple[CacheMountSpec, ...] = ()
+
+    @property
+    def starts_first(self) -> bool:
+        """Return whether deploys use the start-first rollout."""
+        return self.rollout.strategy == "start-first"
+
+
+@dataclass(frozen=True)
+class ServiceCatalog:
+    """Ordered, validated view of `config/services.yaml`."""
+
+    services: tuple[ServiceDefinition, ...]
+
+    def names(self) -> tuple[str, ...]:
+        """Return service names in registry order."""
+        return tuple(service.name for service in self.services)
+
+    def get(self, name: str) -> ServiceDefinition | None:
+        """Look up a service definition by name."""
+        for service in self.services:
+            if service.name == name:
+                return service
+        return None
+
+    def unknown(self, names: list[str]) -> list[str]:
+        """Return the requested names that are not registered services."""
+        known = set(self.names())
+        return [name for name in names if name not in known]
@@ -15,6 +15,7 @@ OPERATION_CHOICES: tuple[ChoiceSpec, ...] = (
     ChoiceSpec(value="build", label="Build"),
     ChoiceSpec(value="deploy", label="Deploy"),
     ChoiceSpec(value="both", label="Both"),
+    ChoiceSpec(value="watch", label="Watch (rebuild + redeploy on change)"),
 )
 
 PLATFORM_CHOICES: tuple[ChoiceSpec, ...] = (
@@ -17,6 +17,8 @@ class DeployRequest:
     """Request to deploy a set of precomputed image tags."""
 
     images: tuple[str, ...]
+    arch: str = ""
+    services: tuple[str, ...] = ()
 
 
 def plan_build_requests(arch: str, services: list[str]) -> tuple[BuildRequest, ...]:
@@ -27,5 +29,7 @@ def plan_build_requests(arch: str, services: list[str]) -> tuple[BuildRequest, .
 def plan_deploy_request(arch: str, services: list[str]) -> DeployRequest:
     """Plan the deploy request for the selected services."""
     return DeployRequest(
-        images=tuple(build_image_tag(service_name=service, arch=arch) for service in services)
+        images=tuple(build_image_tag(service_name=service, arch=arch) for service in services),
+        arch=arch,
+        services=tuple(services),
     )
@@ -11,6 +11,16 @@ def get_platform_for_arch(arch: str) -> str | None:
     return ARCHITECTURE_PLATFORMS.get(arch)
 
 
+def should_push(arch: str) -> bool:
+    """Return whether images built for an architecture are pushed to the registry."""
+    return arch == "amd"
+
+
 def build_image_tag(service_name: str, arch: str) -> str:
     """Build the canonical image tag for a service and architecture."""
     return f"techbizz/{service_name}:latest-{arch}"
+
+
+def mirror_image_tag(image: str, mirror: str) -> str:
+    """Return where a canonical image tag lives in a registry mirror."""
+    return f"{mirror}/{image}"
@@ -0,0 +1,148 @@
+"""Remote host state snapshots and the deploy decisions derived from them."""
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class ImageState:
+    """A locally present image on a host."""
+
+    id: str
+    digests: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ContainerState:
+    """One container of the compose project on a host."""
+
+    service: str
+    name: str
+    image_id: str
+    config_hash: str
+    state: str
+    health: str = ""
+
+
+@dataclass(frozen=True)
+class DiskUsage:
+    """Docker disk usage on a host, in bytes."""
+
+    images_bytes: int = 0
+    reclaimable_bytes: int = 0
+    free_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class HostState:
+    """Everything the deploy decisions need to know about one host."""
+
+    images: dict[str, ImageState] = field(default_factory=dict)
+    containers: tuple[ContainerState, ...] = ()
+    desired_hashes: dict[str, str] = field(default_factory=dict)
+    disk: DiskUsage = DiskUsage()
+
+
+@dataclass(frozen=True)
+class RemoteSnapshot:
+    """State of every deploy host plus the registry digests it was compared with.
+
+    Hosts whose state could not be collected or parsed are listed in
+    `unavailable_hosts` instead of `hosts`.
+    """
+
+    hosts: dict[str, HostState]
+    registry_digests: dict[str, str] = field(default_factory=dict)
+    collected_at: float = 0.0
+    unavailable_hosts: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class RemotePlan:
+    """Per-host decisions for one deploy.
+
+    Hosts missing from `pull_by_host` pull every image. `prune_hosts` is None
+    when every host is pruned. `outdated_services` only covers the hosts in
+    the snapshot, so it is not authoritative while `unavailable_hosts` is set.
+    """
+
+    pull_by_host: dict[str, list[str]]
+    outdated_services: frozenset[str]
+    prune_hosts: tuple[str, ...] | None
+    unavailable_hosts: tuple[str, ...] = ()
+
+
+def image_is_current(host: HostState, image: str, registry_digest: str | None) -> bool:
+    """Return whether a host already has the registry's current image for a tag.
+
+    Any repository digest counts, so an image pulled from a registry mirror
+    (and recorded as `<mirror>/<repository>@<digest>`) is current too.
+    """
+    state = host.images.get(image)
+    if state is None or registry_digest is None:
+        return False
+    return any(digest.endswith(f"@{registry_digest}") for digest in state.digests)
+
+
+def service_is_current(host: HostState, compose_service: str, image: str, pulled: bool) -> bool:
+    """Return whether every container of a service runs the current image and config."""
+    if pulled:
+        return False
+    image_state = host.images.get(image)
+    desired_hash = host.desired_hashes.get(compose_service)
+    containers = [c for c in host.containers if c.service == compose_service]
+    if image_state is None or desired_hash is None or not containers:
+        return False
+    return all(
+        container.image_id == image_state.id
+        and container.config_hash == desired_hash
+        and container.state == "running"
+        for container in containers
+    )
+
+
+def should_prune(disk: DiskUsage, min_reclaimable_bytes: int, min_free_bytes: int) -> bool:
+    """Return whether pruning is worth its time on a host."""
+    return disk.reclaimable_bytes >= min_reclaimable_bytes or disk.free_bytes < min_free_bytes
+
+
+def plan_remote_actions(
+    snapshot: RemoteSnapshot,
+    images: tuple[str, ...],
+    compose_images: dict[str, str],
+    prune_thresholds: tuple[int, int] | None = None,
+) -> RemotePlan:
+    """Decide what to pull, which services are outdated, and where to prune.
+
+    Args:
+        snapshot: Collected state of every deploy host
+        images: Image tags in the deploy
+        compose_images: Compose service name to image tag, for services whose
+            replacement is decided here
+        prune_thresholds: `(min_reclaimable_bytes, min_free_bytes)`; a host is
+            pruned when at least that much is reclaimable or free space drops
+            below the second value. None prunes every host.
+    """
+    pull_by_host: dict[str, list[str]] = {}
+    outdated: set[str] = set()
+    # Hosts without state cannot be measured, so they are always pruned
+    prune_hosts: list[str] = list(snapshot.unavailable_hosts)
+
+    for host_name, host in sorted(snapshot.hosts.items()):
+        pulls = [
+            image
+            for image in images
+            if not image_is_current(host, image, snapshot.registry_digests.get(image))
+        ]
+        pull_by_host[host_name] = pulls
+        for compose_service, image in compose_images.items():
+            if not service_is_current(host, compose_service, image, pulled=image in pulls):
+                outdated.add(compose_service)
+        if prune_thresholds is not None and should_prune(host.disk, *prune_thresholds):
+            prune_hosts.append(host_name)
+
+    return RemotePlan(
+        pull_by_host=pull_by_host,
+        outdated_services=frozenset(outdated),
+        prune_hosts=tuple(sorted(prune_hosts)) if prune_thresholds is not None else None,
+        unavailable_hosts=snapshot.unavailable_hosts,
+    )
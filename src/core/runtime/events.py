@@ -0,0 +1,184 @@
+"""Structured step events on a JSON-lines side channel."""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.core.config import CACHE_DIR
+from src.core.runtime.shell import CommandCancelled, attribute_output
+
+EVENTS_PATH_ENV = "DEPLOY_EVENTS_PATH"
+STEP_HISTORY_FILE = CACHE_DIR / "step-history.json"
+HISTORY_WEIGHT = 0.3
+
+EventSink = Callable[[dict[str, Any]], None]
+
+_sinks: list[EventSink] = []
+_lock = threading.Lock()
+
+
+class _EventFile:
+    """Side-channel file kept open for the current run."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.handle = path.open("a", encoding="utf-8")
+
+
+_stream: _EventFile | None = None
+# Durations recorded during the run, folded into each history file at run_finish
+_pending_history: dict[Path, list[tuple[str, float]]] = {}
+
+
+def register_event_sink(sink: EventSink) -> None:
+    """Receive every emitted event in-process."""
+    _sinks.append(sink)
+
+
+def emit_event(event: str, **fields: Any) -> None:
+    """Emit one event to the side channel and registered sinks.
+
+    The side channel is the file named by `DEPLOY_EVENTS_PATH`; nothing is
+    written when it is unset. The file stays open until `run_finish`, which
+    also writes the step durations recorded during the run.
+    """
+    global _stream
+    payload = {"event": event, "ts": time.time(), **fields}
+    events_path = os.getenv(EVENTS_PATH_ENV)
+
+    with _lock:
+        if events_path:
+            if _stream is None or str(_stream.path) != events_path:
+                _close_stream()
+                _stream = _EventFile(Path(events_path))
+            _stream.handle.write(json.dumps(payload, separators=(",", ":")) + "\n")
+            # Readers tail the file while the run is in progress
+            _stream.handle.flush()
+        for sink in _sinks:
+            sink(payload)
+        if event == "run_finish":
+            _close_stream()
+            _flush_step_history()
+
+
+def _close_stream() -> None:
+    global _stream
+    if _stream is not None:
+        _stream.handle.close()
+        _stream = None
+
+
+def step_key(service: str, stage: str, arch: str) -> str:
+    """Key used for per-step duration history."""
+    return f"{service}/{stage}/{arch}"
+
+
+def load_step_history(path: Path = STEP_HISTORY_FILE) -> dict[str, float]:
+    """Return smoothed step durations in seconds from previous runs."""
+    try:
+        history = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return {key: float(value) for key, value in history.items() if isinstance(value, (int, float))}
+
+
+def record_step_duration(key: str, duration_s: float, path: Path = STEP_HISTORY_FILE) -> None:
+    """Queue a successful step duration; it is folded into the moving average at `run_finish`."""
+    with _lock:
+        _pending_history.setdefault(path, []).append((key, duration_s))
+
+
+def _flush_step_history() -> None:
+    for path, durations in _pending_history.items():
+        history = load_step_history(path)
+        for key, duration_s in durations:
+            previous = history.get(key)
+            history[key] = (
+                duration_s
+                if previous is None
+                else previous + HISTORY_WEIGHT * (duration_s - previous)
+            )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(history, indent=2, sort_keys=True))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    _pending_history.clear()
+
+
+def _flush_at_exit() -> None:
+    with _lock:
+        _close_stream()
+        _flush_step_history()
+
+
+# Direct adapter entry points never emit run_finish
+atexit.register(_flush_at_exit)
+
+
+@contextmanager
+def track_step(
+    stage: str, *services: str, arch: str = ""
+) -> Generator[dict[str, Any]]:
+    """Emit start/finish events around a step for one or more services.
+
+    The yielded dict collects extra finish fields such as `bytes`. Output
+    printed during a single-service step is attributed to that service.
+    """
+    details: dict[str, Any] = {}
+    for service in services:
+        emit_event("step_start", service=service, stage=stage, arch=arch)
+
+    started = time.monotonic()
+    status = "failed"
+    try:
+        if len(services) == 1:
+            with attribute_output(services[0]):
+                yield details
+        else:
+            yield details
+        status = "ok"
+    except CommandCancelled:
+        status = "cancelled"
+        raise
+    finally:
+        duration_s = round(time.monotonic() - started, 3)
+        for service in services:
+            emit_event(
+                "step_finish",
+                service=service,
+                stage=stage,
+                arch=arch,
+                status=status,
+                duration_s=duration_s,
+                **details,
+            )
+            if status == "ok":
+                record_step_duration(step_key(service, stage, arch), duration_s)
+
+
+@contextmanager
+def track_run(mode: str, arch: str, services: list[str]) -> Generator[None]:
+    """Emit `run_start` and `run_finish` around one run.
+
+    `run_finish` carries the outcome, exports metrics when they are enabled,
+    and writes the step durations queued during the run.
+    """
+    emit_event("run_start", mode=mode, arch=arch, services=services)
+    status = "failed"
+    try:
+        yield
+        status = "ok"
+    except CommandCancelled:
+        status = "cancelled"
+        raise
+    finally:
+        emit_event("run_finish", mode=mode, arch=arch, services=services, status=status)
@@ -0,0 +1,254 @@
+"""OpenMetrics export of one run's build and deploy events.
+
+`MetricsCollector` is an event sink: it folds step, pipeline, and remote-plan
+events into gauges and, on `run_finish`, writes them to `METRICS_TEXTFILE`
+(for node_exporter's textfile collector) and/or PUTs them to
+`METRICS_PUSH_URL` (a Pushgateway grouping URL such as
+`http://gateway:9091/metrics/job/bazarrify`). Every value describes the run
+that just finished, so all families are gauges. Watch mode reports every
+rebuild cycle as its own run.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.core.domain.policies import build_image_tag
+from src.core.runtime.events import register_event_sink
+from src.core.runtime.shell import console
+
+METRIC_PREFIX = "bazarrify_deploy"
+PUSH_TIMEOUT_S = 10.0
+# The body carries `# UNIT` and `# EOF`, so it is sent as OpenMetrics
+PUSH_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+_installed: MetricsCollector | None = None
+
+
+@dataclass(frozen=True)
+class MetricFamily:
+    """Metadata for one gauge family."""
+
+    name: str
+    help: str
+    unit: str = ""
+
+
+FAMILIES: tuple[MetricFamily, ...] = (
+    MetricFamily("run_duration_seconds", "Wall time of the run.", "seconds"),
+    MetricFamily("run_success", "1 when the run finished without errors."),
+    MetricFamily("run_timestamp_seconds", "Unix time the run finished.", "seconds"),
+    MetricFamily("step_duration_seconds", "Duration of each step by stage and service.", "seconds"),
+    MetricFamily("step_failures", "Failed steps in the run by stage."),
+    MetricFamily("build_steps", "Dockerfile steps in the last build of a service."),
+    MetricFamily("build_cached_steps", "Dockerfile steps served from the build cache."),
+    MetricFamily(
+        "build_context_bytes", "Build context size after .dockerignore is applied.", "bytes"
+    ),
+    MetricFamily(
+        "cache_mount_bytes", "Size of each BuildKit cache mount after a build.", "bytes"
+    ),
+    MetricFamily("push_bytes", "New layer bytes pushed to the registry.", "bytes"),
+    MetricFamily("pull_images", "Images pulled on each host."),
+    MetricFamily(
+        "pull_bytes",
+        "Estimated bytes pulled on each host, from the layers this run pushed.",
+        "bytes",
+    ),
+    MetricFamily("mirror_pulls", "Image pulls on each host by source (mirror or upstream)."),
+    MetricFamily("mirror_hit_ratio", "Share of host image pulls served by the registry mirror."),
+    MetricFamily("mirror_warmed_images", "Tags copied to the registry mirror before the deploy."),
+    MetricFamily("pulls_skipped", "Image pulls skipped because the host was current."),
+    MetricFamily("prune_skipped", "1 when pruning was skipped on a host."),
+    MetricFamily("rollouts_skipped", "Start-first rollouts skipped as already current."),
+    MetricFamily("time_to_healthy_seconds", "Deploy start to service readiness.", "seconds"),
+    MetricFamily("stage_utilization_ratio", "Busy over worker capacity per pipeline stage."),
+)
+
+
+def format_labels(labels: Labels) -> str:
+    """Render `{key="value",...}` with OpenMetrics escaping."""
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def format_value(value: float) -> str:
+    """Render integers without a trailing `.0`."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+@dataclass
+class MetricsCollector:
+    """Aggregate one run's events into gauges."""
+
+    samples: dict[str, dict[Labels, float]] = field(default_factory=dict)
+    push_bytes_by_image: dict[str, int] = field(default_factory=dict)
+    run_started: float | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def set(self, family: str, value: float, **labels: str) -> None:
+        self.samples.setdefault(family, {})[tuple(labels.items())] = value
+
+    def add(self, family: str, value: float, **labels: str) -> None:
+        series = self.samples.setdefault(family, {})
+        key = tuple(labels.items())
+        series[key] = series.get(key, 0) + value
+
+    def handle(self, event: dict[str, Any]) -> None:
+        """Event sink entry point."""
+        with self.lock:
+            handler = getattr(self, f"_on_{event.get('event', '')}", None)
+            if handler is not None:
+                handler(event)
+
+    def _on_run_start(self, event: dict[str, Any]) -> None:
+        self.samples.clear()
+        self.push_bytes_by_image.clear()
+        self.run_started = event["ts"]
+
+    def _on_step_finish(self, event: dict[str, Any]) -> None:
+        stage, service, arch = event["stage"], event["service"], event.get("arch", "")
+        status = event.get("status", "")
+        self.set(
+            "step_duration_seconds",
+            event.get("duration_s", 0.0),
+            stage=stage,
+            service=service,
+            arch=arch,
+            status=status,
+        )
+        self.add("step_failures", 1 if status == "failed" else 0, stage=stage, arch=arch)
+        if "total_steps" in event:
+            self.set("build_steps", event["total_steps"], service=service, arch=arch)
+            self.set("build_cached_steps", event["cached_steps"], service=service, arch=arch)
+        if "context_bytes" in event:
+            self.set("build_context_bytes", event["context_bytes"], service=service, arch=arch)
+        for cache, size in event.get("cache_mounts", {}).items():
+            self.set("cache_mount_bytes", size, service=service, cache=cache)
+        if stage == "push" and "bytes" in event:
+            self.set("push_bytes", event["bytes"], service=service, arch=arch)
+            self.push_bytes_by_image[build_image_tag(service, arch)] = event["bytes"]
+        if "time_to_healthy_s" in event:
+            self.set(
+                "time_to_healthy_seconds", event["time_to_healthy_s"], service=service, arch=arch
+            )
+
+    def _on_stage_utilization(self, event: dict[str, Any]) -> None:
+        self.set("stage_utilization_ratio", event["utilization"], stage=event["stage"])
+
+    def _on_remote_plan(self, event: dict[str, Any]) -> None:
+        images = event.get("images", [])
+        prune_hosts = set(event.get("prune_hosts", []))
+        for host, pulls in event.get("pull_by_host", {}).items():
+            self.set("pull_images", len(pulls), host=host)
+            self.set("pulls_skipped", len(images) - len(pulls), host=host)
+            self.set("prune_skipped", 0 if host in prune_hosts else 1, host=host)
+            known = [
+                self.push_bytes_by_image[image]
+                for image in pulls
+                if image in self.push_bytes_by_image
+            ]
+            if known:
+                self.set("pull_bytes", sum(known), host=host)
+        self.set("rollouts_skipped", len(event.get("skipped_rollouts", [])))
+
+    def _on_mirror_report(self, event: dict[str, Any]) -> None:
+        for host, pulls in event.get("pulls", {}).items():
+            for source in ("mirror", "upstream"):
+                count = sum(1 for pulled_from in pulls.values() if pulled_from == source)
+                self.set("mirror_pulls", count, host=host, source=source)
+        if event.get("hit_rate") is not None:
+            self.set("mirror_hit_ratio", event["hit_rate"])
+        self.set("mirror_warmed_images", len(event.get("warmed", [])))
+
+    def _on_run_finish(self, event: dict[str, Any]) -> None:
+        labels = {"mode": event.get("mode", ""), "arch": event.get("arch", "")}
+        started = self.run_started if self.run_started is not None else event["ts"]
+        self.set("run_duration_seconds", round(event["ts"] - started, 3), **labels)
+        self.set("run_success", 1 if event.get("status") == "ok" else 0, **labels)
+        self.set("run_timestamp_seconds", round(event["ts"], 3), **labels)
+        export_metrics(self.render())
+
+    def render(self) -> str:
+        """Render the collected gauges in the OpenMetrics text format."""
+        lines: list[str] = []
+        for family in FAMILIES:
+            series = self.samples.get(family.name)
+            if not series:
+                continue
+            name = f"{METRIC_PREFIX}_{family.name}"
+            lines.append(f"# TYPE {name} gauge")
+            if family.unit:
+                lines.append(f"# UNIT {name} {family.unit}")
+            lines.append(f"# HELP {name} {family.help}")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, body: str) -> None:
+    """Atomically replace a textfile-collector file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(body, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def push_metrics(url: str, body: str) -> None:
+    """Replace the run's metrics group on a Pushgateway-compatible endpoint."""
+    import urllib.request
+
+    request = urllib.request.Request(
+        url,
+        data=body.encode("utf-8"),
+        method="PUT",
+        headers={"Content-Type": PUSH_CONTENT_TYPE},
+    )
+    with urllib.request.urlopen(request, timeout=PUSH_TIMEOUT_S):
+        pass
+
+
+def export_metrics(body: str) -> None:
+    """Send the rendered metrics to every configured destination.
+
+    Export problems are reported but never fail the run.
+    """
+    textfile = os.getenv("METRICS_TEXTFILE", "")
+    if textfile:
+        try:
+            write_textfile(Path(textfile), body)
+        except OSError as error:
+            console.print(f"[yellow]⚠️  Could not write metrics to {textfile}: {error}[/yellow]")
+
+    push_url = os.getenv("METRICS_PUSH_URL", "")
+    if push_url:
+        try:
+            push_metrics(push_url, body)
+        except (OSError, ValueError) as error:
+            console.print(f"[yellow]⚠️  Could not push metrics to {push_url}: {error}[/yellow]")
+
+
+def metrics_enabled() -> bool:
+    """Return whether any metrics destination is configured."""
+    return bool(os.getenv("METRICS_TEXTFILE") or os.getenv("METRICS_PUSH_URL"))
+
+
+def install_metrics_export() -> MetricsCollector:
+    """Register a collector that exports at the end of each run, once per process."""
+    global _installed
+    if _installed is None:
+        _installed = MetricsCollector()
+        register_event_sink(_installed.handle)
+    return _installed
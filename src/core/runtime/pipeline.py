@@ -0,0 +1,278 @@
+"""Build → push pipeline with separate stage concurrency and push admission.
+
+Builds are CPU-bound and pushes are network-bound, so each stage has its own
+worker pool: the next service builds while the previous one uploads. With
+`PUSH_BANDWIDTH_MBPS` set, a push only starts while the upload rates expected
+from earlier pushes of the in-flight services fit under the cap; `docker push`
+itself cannot be throttled, so this is admission control rather than shaping.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from src.core.config import CACHE_DIR
+from src.core.domain.orchestration import BuildRequest
+from src.core.domain.policies import should_push
+from src.core.runtime.events import (
+    emit_event,
+    load_step_history,
+    record_step_duration,
+    step_key,
+)
+from src.core.runtime.shell import console
+
+PUSH_RATE_FILE = CACHE_DIR / "push-rates.json"
+DEFAULT_BUILD_WORKERS = 1
+DEFAULT_PUSH_WORKERS = 2
+BITS_PER_BYTE = 8
+
+StageHandler = Callable[[BuildRequest], None]
+
+
+def get_stage_workers(key: str, default: int) -> int:
+    """Read a positive worker count override from the environment."""
+    raw_value = os.getenv(key, "")
+    return int(raw_value) if raw_value.isdigit() and int(raw_value) > 0 else default
+
+
+def get_push_bandwidth_bps() -> float | None:
+    """Return the push bandwidth cap in bytes per second, or None when uncapped."""
+    try:
+        megabits = float(os.getenv("PUSH_BANDWIDTH_MBPS", ""))
+    except ValueError:
+        return None
+    return megabits * 1_000_000 / BITS_PER_BYTE if megabits > 0 else None
+
+
+def record_push_rate(service: str, arch: str, pushed_bytes: int, push_s: float) -> None:
+    """Fold one push's upload rate (bytes/s) into the smoothed history."""
+    if pushed_bytes > 0 and push_s > 0:
+        record_step_duration(step_key(service, "push", arch), pushed_bytes / push_s, PUSH_RATE_FILE)
+
+
+class BandwidthGate:
+    """Admit pushes while the sum of their expected upload rates fits a cap."""
+
+    def __init__(self, capacity_bps: float | None) -> None:
+        self.capacity_bps = capacity_bps
+        self._reserved_bps = 0.0
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def reserve(self, expected_bps: float | None) -> float:
+        """Block until a push may start and return the rate it reserved.
+
+        A push without history reserves the whole cap. A single push is
+        always admitted when nothing else is in flight.
+        """
+        if self.capacity_bps is None:
+            return 0.0
+        rate = min(expected_bps or self.capacity_bps, self.capacity_bps)
+        with self._condition:
+            while self._in_flight and self._reserved_bps + rate > self.capacity_bps:
+                self._condition.wait()
+            self._reserved_bps += rate
+            self._in_flight += 1
+        return rate
+
+    def release(self, rate: float) -> None:
+        """Return a finished push's reservation."""
+        if self.capacity_bps is None:
+            return
+        with self._condition:
+            self._reserved_bps -= rate
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+
+@dataclass
+class StageStats:
+    """Busy time of one pipeline stage."""
+
+    name: str
+    workers: int
+    busy_s: float = 0.0
+    runs: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, seconds: float) -> None:
+        with self.lock:
+            self.busy_s += seconds
+            self.runs += 1
+
+    def utilization(self, wall_s: float) -> float:
+        """Return busy time as a fraction of the stage's worker capacity."""
+        capacity_s = self.workers * wall_s
+        return self.busy_s / capacity_s if capacity_s > 0 else 0.0
+
+
+def run_build_pipeline(
+    requests: Iterable[BuildRequest],
+    build: StageHandler,
+    push: StageHandler,
+    discard: StageHandler | None = None,
+) -> list[StageStats]:
+    """Build every request and push the pushable ones on a separate queue.
+
+    A failed build stops further builds, but images that already built are
+    still pushed, as they were when builds and pushes alternated. A failed
+    push stops both stages; built images still queued behind it are not
+    pushed and are passed to `discard`, so they do not pile up locally.
+    In-flight steps finish and the first failure is then re-raised.
+
+    Returns:
+        Per-stage busy time for the utilization report
+    """
+    build_stats = StageStats("build", get_stage_workers("BUILD_CONCURRENCY", DEFAULT_BUILD_WORKERS))
+    push_stats = StageStats("push", get_stage_workers("PUSH_CONCURRENCY", DEFAULT_PUSH_WORKERS))
+    rates = load_step_history(PUSH_RATE_FILE)
+    gate = BandwidthGate(get_push_bandwidth_bps())
+    requests = list(requests)
+    pending = iter(requests)
+    pending_lock = threading.Lock()
+    push_queue: queue.SimpleQueue[BuildRequest | None] = queue.SimpleQueue()
+    builds_stopped = threading.Event()
+    pushes_stopped = threading.Event()
+    errors: list[BaseException] = []
+    skipped: list[BuildRequest] = []
+
+    def timed(
+        stats: StageStats,
+        handler: StageHandler,
+        request: BuildRequest,
+        stops: tuple[threading.Event, ...],
+    ) -> bool:
+        started = time.monotonic()
+        try:
+            handler(request)
+            return True
+        except BaseException as error:
+            with pending_lock:
+                errors.append(error)
+            for event in stops:
+                event.set()
+            # fail() and Ctrl-C end this worker once the stages are stopped;
+            # the main thread re-raises the first error either way
+            if not isinstance(error, Exception):
+                raise
+            return False
+        finally:
+            stats.add(time.monotonic() - started)
+
+    def build_worker() -> None:
+        while not builds_stopped.is_set():
+            with pending_lock:
+                request = next(pending, None)
+            if request is None:
+                return
+            built = timed(build_stats, build, request, (builds_stopped,))
+            if built and should_push(request.arch):
+                push_queue.put(request)
+
+    def push_worker() -> None:
+        while (request := push_queue.get()) is not None:
+            if pushes_stopped.is_set():
+                with pending_lock:
+                    skipped.append(request)
+                continue
+            expected = rates.get(step_key(request.service_name, "push", request.arch))
+            reserved = gate.reserve(expected)
+            try:
+                timed(push_stats, push, request, (builds_stopped, pushes_stopped))
+            finally:
+                gate.release(reserved)
+
+    def start(target: Callable[[], None], name: str, count: int) -> list[threading.Thread]:
+        threads = [
+            threading.Thread(target=target, name=f"{name}-{index}", daemon=True)
+            for index in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    # Builds that are never pushed (arm) do not pay for idle push workers
+    pushes = any(should_push(request.arch) for request in requests)
+    push_threads = start(push_worker, "push", push_stats.workers if pushes else 0)
+    for thread in start(build_worker, "build", build_stats.workers):
+        thread.join()
+    for _ in push_threads:
+        push_queue.put(None)
+    for thread in push_threads:
+        thread.join()
+    # A push worker that exited on an error leaves its share of the queue behind
+    while not push_queue.empty():
+        if (request := push_queue.get_nowait()) is not None:
+            skipped.append(request)
+
+    if skipped:
+        discard_skipped(skipped, discard)
+    if errors:
+        raise errors[0]
+    return [build_stats, push_stats]
+
+
+def discard_skipped(skipped: list[BuildRequest], discard: StageHandler | None) -> None:
+    """Report built images a failed push left unpushed, and remove them when possible."""
+    names = ", ".join(request.service_name for request in skipped)
+    if discard is None:
+        console.print(
+            f"[yellow]⚠️  Not pushed after an earlier push failed; left in the local"
+            f" image store: {names}[/yellow]"
+        )
+        return
+    console.print(
+        f"[yellow]⚠️  Not pushed after an earlier push failed; removing local images: {names}"
+        "[/yellow]"
+    )
+    for request in skipped:
+        try:
+            discard(request)
+        except (SystemExit, OSError):
+            # The push failure is the error worth reporting; cleanup stays best effort.
+            console.print(
+                f"[yellow]⚠️  Could not remove the {request.service_name} image[/yellow]"
+            )
+
+
+def report_stage_utilization(stages: list[StageStats], wall_s: float) -> None:
+    """Emit how busy each stage's workers were over the pipeline, and print it.
+
+    The table is only rendered when the console shows it.
+    """
+    used = [stage for stage in stages if stage.runs]
+    for stage in used:
+        utilization = stage.utilization(wall_s)
+        emit_event(
+            "stage_utilization",
+            stage=stage.name,
+            workers=stage.workers,
+            steps=stage.runs,
+            busy_s=round(stage.busy_s, 3),
+            wall_s=round(wall_s, 3),
+            utilization=round(utilization, 3),
+        )
+    if console.quiet:
+        return
+
+    from rich.table import Table
+
+    table = Table(title="Stage utilization", title_justify="left")
+    table.add_column("Stage")
+    table.add_column("Workers", justify="right")
+    table.add_column("Steps", justify="right")
+    table.add_column("Busy", justify="right")
+    table.add_column("Utilization", justify="right")
+    for stage in used:
+        table.add_row(
+            stage.name,
+            str(stage.workers),
+            str(stage.runs),
+            f"{stage.busy_s:.1f}s",
+            f"{stage.utilization(wall_s):.0%}",
+        )
+    console.print(table)
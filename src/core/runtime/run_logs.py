@@ -0,0 +1,243 @@
+"""Per-run command log archive with bounded in-memory tails.
+
+Each run gets a directory under `.cache/runs/` holding one compressed log per
+command (zstd when the interpreter ships `compression.zstd`, gzip otherwise).
+Only the last `RUN_LOG_TAIL_LINES` lines of a command stay in memory; they are
+what gets printed when the command fails. Every finished command appends one
+line to `.cache/runs/index.jsonl`, so runs can be filtered by status, command,
+or description without decompressing anything.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from src.core.config import CACHE_DIR
+
+RUN_LOG_DIR_ENV = "RUN_LOG_DIR"
+DEFAULT_TAIL_LINES = 60
+DEFAULT_KEEP_DAYS = 14
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+MAX_SLUG_LENGTH = 48
+INDEX_NAME = "index.jsonl"
+INDEX_LOCK_NAME = "index.lock"
+
+_lock = threading.Lock()
+_current_run: RunArchive | None = None
+_runs_started = 0
+
+
+def get_runs_dir() -> Path:
+    """Return the directory that holds every run's logs."""
+    override = os.getenv(RUN_LOG_DIR_ENV, "")
+    return Path(override) if override else CACHE_DIR / "runs"
+
+
+def get_tail_lines() -> int:
+    """Read how many trailing lines of each command to keep in memory."""
+    raw_value = os.getenv("RUN_LOG_TAIL_LINES", "")
+    return int(raw_value) if raw_value.isdigit() and int(raw_value) > 0 else DEFAULT_TAIL_LINES
+
+
+def get_keep_days() -> int:
+    """Read how many days of runs to keep on disk."""
+    raw_value = os.getenv("RUN_LOG_KEEP_DAYS", "")
+    return int(raw_value) if raw_value.isdigit() else DEFAULT_KEEP_DAYS
+
+
+def echo_enabled() -> bool:
+    """Return whether command output is also passed through to the terminal."""
+    return os.getenv("RUN_LOG_ECHO", "1") != "0"
+
+
+def open_compressed(path_stem: Path) -> tuple[Path, IO[str]]:
+    """Open `<stem>.log.zst`, or `<stem>.log.gz` without zstd support, for writing."""
+    try:
+        from compression import zstd
+    except ImportError:
+        path = path_stem.with_name(f"{path_stem.name}.log.gz")
+        return path, gzip.open(path, "wt", compresslevel=GZIP_LEVEL, encoding="utf-8")
+    path = path_stem.with_name(f"{path_stem.name}.log.zst")
+    return path, zstd.open(path, "wt", level=ZSTD_LEVEL, encoding="utf-8")
+
+
+def slugify(text: str) -> str:
+    """Turn a command description into a short file-name-safe slug."""
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:MAX_SLUG_LENGTH].rstrip("-") or "command"
+
+
+@contextmanager
+def index_lock(runs_dir: Path) -> Generator[None]:
+    """Hold an exclusive lock on the run index across processes.
+
+    A separate lock file is used because pruning replaces `index.jsonl`; a
+    lock on the replaced file would not stop an append to the old one.
+    """
+    with (runs_dir / INDEX_LOCK_NAME).open("a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def prune_runs(runs_dir: Path, keep_days: int) -> None:
+    """Delete run directories older than `keep_days` and drop their index lines."""
+    if keep_days <= 0 or not runs_dir.is_dir():
+        return
+    cutoff = time.time() - keep_days * 86400
+    removed: set[str] = set()
+    for run_dir in runs_dir.iterdir():
+        try:
+            if run_dir.is_dir() and run_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(run_dir)
+                removed.add(run_dir.name)
+        except OSError:
+            continue
+    if not removed:
+        return
+
+    index_path = runs_dir / INDEX_NAME
+    try:
+        with index_lock(runs_dir):
+            kept = [
+                line
+                for line in index_path.read_text().splitlines()
+                if json.loads(line).get("run") not in removed
+            ]
+            tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text("".join(f"{line}\n" for line in kept))
+            os.replace(tmp_path, index_path)
+    except (OSError, ValueError):
+        pass
+
+
+class CommandLog:
+    """Archive of one command's output plus its in-memory tail."""
+
+    def __init__(self, run: RunArchive, seq: int, cmd: list[str], desc: str) -> None:
+        self.run = run
+        self.seq = seq
+        self.cmd = cmd
+        self.desc = desc
+        self.tail: deque[str] = deque(maxlen=get_tail_lines())
+        self.lines = 0
+        self.started = time.monotonic()
+        self.path: Path | None = None
+        self._handle: IO[str] | None = None
+        try:
+            self.path, self._handle = open_compressed(run.path / f"{seq:03d}-{slugify(desc)}")
+        except OSError:
+            self.path = None
+
+    def write(self, line: str, tail: bool = True) -> None:
+        """Archive one output line (without its trailing newline)."""
+        self.lines += 1
+        if tail:
+            self.tail.append(line)
+        if self._handle is not None:
+            try:
+                self._handle.write(line + "\n")
+            except OSError:
+                self._handle = None
+
+    def tail_text(self) -> str:
+        """Return the retained tail, escaped for rich, and where the full log lives."""
+        from rich.markup import escape
+
+        header = f"Last {len(self.tail)} of {self.lines} line(s)"
+        if self.path is not None:
+            header += f" (full log: {self.path})"
+        return "\n".join([f"[dim]{escape(header)}[/dim]", *map(escape, self.tail)])
+
+    def close(self, status: str, returncode: int | None) -> None:
+        """Finish the archive and append this command to the run index."""
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+        entry: dict[str, Any] = {
+            "run": self.run.run_id,
+            "seq": self.seq,
+            "desc": self.desc,
+            "cmd": self.cmd,
+            "status": status,
+            "returncode": returncode,
+            "duration_s": round(time.monotonic() - self.started, 3),
+            "lines": self.lines,
+            "log": str(self.path.relative_to(self.run.path.parent)) if self.path else None,
+        }
+        if status == "failed":
+            entry["tail"] = list(self.tail)
+        self.run.append_index(entry)
+
+
+class RunArchive:
+    """Directory collecting the command logs of one run."""
+
+    def __init__(self, runs_dir: Path, run_id: str) -> None:
+        self.run_id = run_id
+        self.path = runs_dir / self.run_id
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def open_command(self, cmd: list[str], desc: str) -> CommandLog:
+        """Start the log of the next command in this run."""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            try:
+                self.path.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass
+        return CommandLog(self, seq, cmd, desc)
+
+    def append_index(self, entry: dict[str, Any]) -> None:
+        """Append one finished command to the shared index."""
+        with self._lock:
+            try:
+                with (
+                    index_lock(self.path.parent),
+                    open(self.path.parent / INDEX_NAME, "a", encoding="utf-8") as handle,
+                ):
+                    handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            except OSError:
+                pass
+
+
+def _start_run() -> RunArchive:
+    global _current_run, _runs_started
+    runs_dir = get_runs_dir()
+    prune_runs(runs_dir, get_keep_days())
+    _runs_started += 1
+    # Watch mode starts a run per cycle, possibly within the same second
+    run_id = f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}"
+    if _runs_started > 1:
+        run_id += f"-{_runs_started}"
+    _current_run = RunArchive(runs_dir, run_id)
+    return _current_run
+
+
+def begin_run() -> RunArchive:
+    """Start a new run directory; later commands are logged into it."""
+    with _lock:
+        return _start_run()
+
+
+def current_run() -> RunArchive:
+    """Return the active run, starting one on first use."""
+    with _lock:
+        return _current_run if _current_run is not None else _start_run()
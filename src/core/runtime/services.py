@@ -1,10 +1,19 @@
 """Concrete service wiring for orchestration ports."""
 
 from dataclasses import dataclass
-from src.core.contracts.ports import BuildServicePort, DeployImagesPort, RunCommandPort
-from src.core.runtime.shell import run_command
-from src.deploy.ansible import deploy_images
-from src.docker.builder import build_service
+
+from src.core.contracts.ports import (
+    BuildServicePort,
+    CaptureCommandPort,
+    DeployImagesPort,
+    DiscardImagePort,
+    PushServicePort,
+    ReadinessPort,
+    RunCommandPort,
+    StreamCommandPort,
+)
+from src.core.domain.orchestration import BuildRequest, DeployRequest
+from src.core.runtime.shell import capture_command, run_command, stream_command
 
 
 @dataclass(frozen=True)
@@ -12,12 +21,66 @@ class ExecutionServices:
     """Concrete orchestration dependencies."""
 
     build_service: BuildServicePort
+    push_service: PushServicePort
+    discard_image: DiscardImagePort
     deploy_images: DeployImagesPort
+    await_readiness: ReadinessPort
     run_command: RunCommandPort
+    stream_command: StreamCommandPort
+    capture_command: CaptureCommandPort
 
 
-DEFAULT_EXECUTION_SERVICES = ExecutionServices(
-    build_service=lambda request: build_service(request, run_command=run_command),
-    deploy_images=lambda request: deploy_images(request, run_command=run_command),
-    run_command=run_command,
-)
+def build_execution_services(
+    runner: RunCommandPort,
+    streamer: StreamCommandPort,
+    capturer: CaptureCommandPort = capture_command,
+) -> ExecutionServices:
+    """Wire the build and deploy adapters around shared command runners.
+
+    Adapters are imported on first call, so the CLI only loads the Docker
+    and Ansible modules the chosen operation actually uses.
+    """
+
+    def build(request: BuildRequest) -> None:
+        from src.docker.builder import build_service
+
+        build_service(
+            request,
+            run_command=runner,
+            stream_command=streamer,
+            capture_command=capturer,
+        )
+
+    def push(request: BuildRequest) -> None:
+        from src.docker.builder import push_service
+
+        push_service(request, run_command=runner, capture_command=capturer)
+
+    def discard(request: BuildRequest) -> None:
+        from src.docker.builder import discard_image
+
+        discard_image(request, run_command=runner)
+
+    def deploy(request: DeployRequest) -> None:
+        from src.deploy.ansible import deploy_images
+
+        deploy_images(request, run_command=runner, capture_command=capturer)
+
+    def readiness(request: DeployRequest, started: float) -> None:
+        from src.deploy.readiness import await_readiness
+
+        await_readiness(request, started, capture_command=capturer)
+
+    return ExecutionServices(
+        build_service=build,
+        push_service=push,
+        discard_image=discard,
+        deploy_images=deploy,
+        await_readiness=readiness,
+        run_command=runner,
+        stream_command=streamer,
+        capture_command=capturer,
+    )
+
+
+DEFAULT_EXECUTION_SERVICES = build_execution_services(run_command, stream_command)
@@ -1,14 +1,99 @@
 """Shell command execution utilities."""
 
+from __future__ import annotations
+
+import contextvars
 import os
-import sys
 import subprocess
+import sys
+import threading
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import NoReturn
-from rich.console import Console
-from rich.panel import Panel
+from typing import TYPE_CHECKING, Any, NoReturn, TextIO, cast
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Set by the GUI so each output line can be attributed to the service that
+# produced it: "\x1e<service>\x1f<line>". Untagged lines belong to no service.
+OUTPUT_TAGS_ENV = "DEPLOY_OUTPUT_TAGS"
+SERVICE_TAG_START = "\x1e"
+SERVICE_TAG_END = "\x1f"
+
+_output_service: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "output_service", default=""
+)
+_console: Console | None = None
+
+
+def output_tags_enabled() -> bool:
+    """Return whether output lines should carry their service tag."""
+    return os.getenv(OUTPUT_TAGS_ENV, "") == "1"
+
+
+@contextmanager
+def attribute_output(service: str) -> Generator[None]:
+    """Attribute output printed in this context, including command output, to `service`."""
+    token = _output_service.set(service)
+    try:
+        yield
+    finally:
+        _output_service.reset(token)
+
+
+def tag_output(text: str) -> str:
+    """Prefix each line of `text` with the current service when tagging is enabled."""
+    service = _output_service.get()
+    if not service or not output_tags_enabled():
+        return text
+    tag = f"{SERVICE_TAG_START}{service}{SERVICE_TAG_END}"
+    return "".join(tag + line for line in text.splitlines(keepends=True))
+
+
+def split_service_tag(line: str) -> tuple[str, str]:
+    """Return `(service, text)` for an output line; service is "" when untagged."""
+    if line.startswith(SERVICE_TAG_START):
+        service, separator, text = line[1:].partition(SERVICE_TAG_END)
+        if separator:
+            return service, text
+    return "", line
+
+
+class _TaggedStream:
+    """Console file that tags each written line with the current service."""
 
-console = Console()
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+
+    def write(self, text: str) -> int:
+        return self._stream.write(tag_output(text))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def get_console() -> Console:
+    """Create the shared rich console on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        if output_tags_enabled():
+            _console = Console(file=cast(TextIO, _TaggedStream(sys.stdout)))
+        else:
+            _console = Console()
+    return _console
+
+
+class _LazyConsole:
+    """Proxy that defers importing rich until something is printed."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_console(), name)
+
+
+console = cast("Console", _LazyConsole())
 
 
 def fail(message: str, detail: str | None = None, exit_code: int = 1) -> NoReturn:
@@ -45,13 +130,211 @@ def load_env(env_path: Path) -> None:
 
 
 def run_command(cmd: list[str], desc: str) -> None:
-    """Run a shell command with clear feedback."""
+    """Run a shell command with clear feedback and an archived log."""
+    _run_logged(cmd, desc)
+
+
+def capture_command(cmd: list[str]) -> str | None:
+    """Run a read-only query command and return its stdout, or None on failure."""
+    try:
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, errors="replace", check=False
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+INTERRUPT_JOIN_SECONDS = 5.0
+
+
+class CommandCancelled(Exception):
+    """Raised when a cancellable command is stopped before it completes."""
+
+
+def run_cancellable_command(
+    cmd: list[str],
+    desc: str,
+    cancel_event: threading.Event,
+    poll_interval: float = 0.2,
+) -> None:
+    """Run a shell command that is terminated once `cancel_event` is set."""
+    _run_logged(cmd, desc, cancel_event=cancel_event, poll_interval=poll_interval)
+
+
+def _wait_for_process(
+    process: subprocess.Popen,
+    desc: str,
+    cancel_event: threading.Event | None,
+    poll_interval: float,
+) -> int:
+    """Wait for a process, terminating it if `cancel_event` gets set."""
+    while True:
+        try:
+            return process.wait(timeout=poll_interval)
+        except subprocess.TimeoutExpired:
+            if cancel_event is None or not cancel_event.is_set():
+                continue
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            console.print(f"[bold yellow]⏹  {desc} cancelled.[/bold yellow]")
+            raise CommandCancelled(desc)
+
+
+def stream_command(
+    cmd: list[str],
+    desc: str,
+    on_line: Callable[[str], bool | None],
+    cancel_event: threading.Event | None = None,
+    poll_interval: float = 0.2,
+) -> None:
+    """Run a command and hand each merged stdout/stderr line to `on_line`."""
+    _run_logged(cmd, desc, on_line, cancel_event, poll_interval)
+
+
+_terminal_owner = threading.Lock()
+ArchiveLine = Callable[..., None]
+
+
+def _start_piped(
+    cmd: list[str],
+    archive: ArchiveLine,
+    on_line: Callable[[str], bool | None] | None,
+    echo: bool,
+) -> tuple[subprocess.Popen, Callable[[], None]]:
+    """Start a command with merged output on a pipe, read line by line."""
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+
+    def pump() -> None:
+        assert process.stdout is not None
+        for line in process.stdout:
+            text = line.rstrip("\n")
+            if on_line is not None:
+                archive(text, tail=not on_line(text))
+                continue
+            archive(text)
+            if echo:
+                sys.stdout.write(tag_output(line))
+                sys.stdout.flush()
+
+    return process, pump
+
+
+def _start_on_terminal(
+    cmd: list[str], archive: ArchiveLine
+) -> tuple[subprocess.Popen, Callable[[], None]]:
+    """Start a command on a pseudo-terminal sized like ours and copy it through raw.
+
+    stdin stays the real terminal, so prompts still reach the operator.
+    """
+    import pty
+    import termios
+
+    primary, secondary = pty.openpty()
+    try:
+        termios.tcsetwinsize(secondary, termios.tcgetwinsize(sys.stdout.fileno()))
+        process = subprocess.Popen(cmd, stdout=secondary, stderr=secondary)
+    except BaseException:
+        os.close(primary)
+        raise
+    finally:
+        os.close(secondary)
+
+    def pump() -> None:
+        pending = b""
+        try:
+            while True:
+                try:
+                    chunk = os.read(primary, 65536)
+                except OSError:
+                    # EIO once every writer has closed the terminal
+                    break
+                if not chunk:
+                    break
+                sys.stdout.flush()
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    archive(line.decode(errors="replace").rstrip("\r"))
+            if pending:
+                archive(pending.decode(errors="replace").rstrip("\r"))
+        finally:
+            os.close(primary)
+
+    return process, pump
+
+
+def _run_logged(
+    cmd: list[str],
+    desc: str,
+    on_line: Callable[[str], bool | None] | None = None,
+    cancel_event: threading.Event | None = None,
+    poll_interval: float = 0.2,
+) -> None:
+    """Run a command, archiving its merged output and keeping a tail for failures.
+
+    Lines `on_line` reports as consumed progress are archived but left out of
+    the failure tail. Without `on_line`, output is passed through to the terminal unless
+    `RUN_LOG_ECHO=0`; the full log is always in the run archive. When stdout is
+    a terminal, the command runs on a pseudo-terminal so it keeps its TTY output.
+    """
+    from src.core.runtime.run_logs import current_run, echo_enabled
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise CommandCancelled(desc)
+
     console.print(f"\n[bold cyan]▶️  {desc}[/bold cyan]")
+    log = current_run().open_command(cmd, desc)
+    echo = on_line is None and echo_enabled()
+    # One echoed command at a time gets a pseudo-terminal, so docker and
+    # ansible keep their progress display and prompts; concurrent ones are
+    # piped line by line, which keeps their output readable.
+    terminal = echo and sys.stdout.isatty() and _terminal_owner.acquire(blocking=False)
+    try:
+        if terminal:
+            process, pump = _start_on_terminal(cmd, log.write)
+        else:
+            process, pump = _start_piped(cmd, log.write, on_line, echo)
+    except BaseException:
+        if terminal:
+            _terminal_owner.release()
+        raise
+
+    # The reader runs in the caller's context so its output keeps the service attribution
+    reader = threading.Thread(
+        target=contextvars.copy_context().run, args=(pump,), name="command-reader", daemon=True
+    )
+    reader.start()
+    status = "interrupted"
     try:
-        subprocess.run(cmd, check=True)
-        console.print(f"[bold green]✅ {desc} completed.[/bold green]")
-    except subprocess.CalledProcessError:
-        fail(f"{desc} failed.")
+        returncode = _wait_for_process(process, desc, cancel_event, poll_interval)
+        status = "ok" if returncode == 0 else "failed"
+    except CommandCancelled:
+        status = "cancelled"
+        raise
+    finally:
+        # An interrupted child may outlive us briefly; don't hang on its pipe
+        reader.join(timeout=None if status != "interrupted" else INTERRUPT_JOIN_SECONDS)
+        log.close(status, process.returncode)
+        if terminal:
+            _terminal_owner.release()
+
+    if status == "failed":
+        fail(f"{desc} failed.", log.tail_text())
+    console.print(f"[bold green]✅ {desc} completed.[/bold green]")
 
 
 def run(cmd: list[str], desc: str) -> None:
@@ -61,6 +344,8 @@ def run(cmd: list[str], desc: str) -> None:
 
 def print_header(title: str) -> None:
     """Print a styled header."""
+    from rich.panel import Panel
+
     console.print(
         Panel(f"[bold white]{title}[/bold white]", border_style="blue", expand=False)
     )
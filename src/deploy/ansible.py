@@ -1,51 +1,218 @@
 """Ansible deployment operations."""
 
 import json
-import subprocess
+import shlex
 import sys
-from src.core.config import PROJECT_ROOT
+from typing import Any
+from src.core.config import (
+    INVENTORY_FILE,
+    PLAYBOOK_FILE,
+    get_registry_mirror,
+    get_service_catalog,
+    load_runtime_env,
+)
 from src.core.domain.orchestration import DeployRequest
-from src.core.contracts.ports import RunCommandPort
-from src.core.runtime.shell import console, exit_with_message, fail, load_env
+from src.core.domain.remote_state import RemoteSnapshot, plan_remote_actions
+from src.core.contracts.ports import CaptureCommandPort, RunCommandPort
+from src.core.runtime.events import emit_event, track_step
+from src.core.runtime.shell import console, fail
+from src.deploy.mirror import (
+    MirrorWarmReport,
+    report_mirror_pulls,
+    reset_pull_reports,
+    warm_enabled,
+    warm_mirror,
+)
+from src.deploy.remote_state import get_prune_thresholds, get_remote_state, invalidate_remote_state
+
+
+def plan_start_first_rollouts(request: DeployRequest) -> list[dict[str, Any]]:
+    """Return playbook vars for the requested services that roll out start-first."""
+    catalog = get_service_catalog()
+    rollouts = []
+    for name, image in zip(request.services, request.images):
+        service = catalog.get(name)
+        if service is None or not service.starts_first:
+            continue
+        rollouts.append(
+            {
+                "name": service.compose_service,
+                "image": image,
+                "drain_s": service.rollout.drain_s,
+                "health_timeout_s": service.rollout.health_timeout_s,
+            }
+        )
+    return rollouts
+
+
+def plan_migrations(services: tuple[str, ...]) -> list[dict[str, Any]]:
+    """Return playbook vars for the requested services that run pre-deploy migrations."""
+    catalog = get_service_catalog()
+    migrations = []
+    for name in services:
+        service = catalog.get(name)
+        if service is None or service.migrations is None:
+            continue
+        migrations.append(
+            {
+                "name": service.compose_service,
+                # Split here so the playbook passes it as argv, never through a shell
+                "argv": shlex.split(service.migrations.command),
+                "paths": list(service.migrations.paths),
+            }
+        )
+    return migrations
+
+
+def apply_remote_state(
+    extra_vars: dict[str, Any],
+    request: DeployRequest,
+    capture_command: CaptureCommandPort,
+) -> RemoteSnapshot | None:
+    """Narrow pulls, start-first rollouts, and pruning using one remote snapshot.
+
+    Without a snapshot the playbook falls back to pulling every image, checking
+    each start-first service on the host, and pruning everywhere. Hosts the
+    snapshot has no state for fall back the same way, one host at a time.
+    Every host is pruned unless prune thresholds are configured.
+    """
+    snapshot = get_remote_state(capture_command, request.images)
+    if snapshot is None:
+        console.print(
+            "[yellow]⚠️  Remote state unavailable; pulling every image and checking "
+            "rollouts on the hosts.[/yellow]"
+        )
+        return None
+
+    rollouts = extra_vars["start_first_services"]
+    plan = plan_remote_actions(
+        snapshot,
+        request.images,
+        {rollout["name"]: rollout["image"] for rollout in rollouts},
+        get_prune_thresholds(),
+    )
+    # Hosts missing from pull_by_host pull every image in the playbook
+    extra_vars["pull_by_host"] = plan.pull_by_host
+    if not plan.unavailable_hosts:
+        extra_vars["start_first_services"] = [
+            {**rollout, "checked": True}
+            for rollout in rollouts
+            if rollout["name"] in plan.outdated_services
+        ]
+    # Otherwise each host checks its own rollouts, as without a snapshot
+    if plan.prune_hosts is not None:
+        extra_vars["prune_hosts"] = list(plan.prune_hosts)
+
+    for host, pulls in plan.pull_by_host.items():
+        pruned = plan.prune_hosts is None or host in plan.prune_hosts
+        console.print(
+            f"[dim]{host}: pull {len(pulls)}/{len(request.images)} image(s)"
+            f"{', prune' if pruned else ''}[/dim]"
+        )
+    skipped = (
+        sorted(
+            rollout["name"]
+            for rollout in rollouts
+            if rollout["name"] not in plan.outdated_services
+        )
+        if not plan.unavailable_hosts
+        else []
+    )
+    emit_event(
+        "remote_plan",
+        images=list(request.images),
+        pull_by_host=plan.pull_by_host,
+        prune_hosts=(
+            list(plan.prune_hosts)
+            if plan.prune_hosts is not None
+            else sorted([*plan.pull_by_host, *plan.unavailable_hosts])
+        ),
+        unavailable_hosts=list(plan.unavailable_hosts),
+        skipped_rollouts=skipped,
+    )
+    if skipped:
+        console.print(f"[dim]Already current, not rolled out: {', '.join(skipped)}[/dim]")
+    return snapshot
+
+
+def apply_registry_mirror(
+    extra_vars: dict[str, Any],
+    request: DeployRequest,
+    snapshot: RemoteSnapshot | None,
+    mirror: str,
+    run_command: RunCommandPort,
+    capture_command: CaptureCommandPort,
+) -> MirrorWarmReport | None:
+    """Point the playbook's pulls at the mirror, warming only the tags hosts will pull."""
+    extra_vars["registry_mirror"] = mirror
+    extra_vars["mirror_report_dir"] = reset_pull_reports()
+    if not warm_enabled():
+        return None
+
+    pull_by_host = extra_vars.get("pull_by_host")
+    images = [
+        image
+        for image in request.images
+        if pull_by_host is None or any(image in pulls for pulls in pull_by_host.values())
+    ]
+    return warm_mirror(
+        images,
+        mirror,
+        run_command,
+        capture_command,
+        upstream_digests=snapshot.registry_digests if snapshot is not None else None,
+    )
 
 
 def deploy_images(
     request: DeployRequest,
     run_command: RunCommandPort,
+    capture_command: CaptureCommandPort,
 ) -> None:
     """Deploy Docker images using Ansible.
 
     Args:
         request: Deploy request containing image tags to deploy
     """
-    # Project structure
-    env_file = PROJECT_ROOT / ".env"
-    config_dir = PROJECT_ROOT / "config"
-    inventory_file = config_dir / "inventory.ini"
-    playbook_file = config_dir / "pull-up-prune.yaml"
-
-    if not inventory_file.exists():
-        fail(f"Error: Inventory file not found: {inventory_file}")
-
-    if not playbook_file.exists():
-        fail(f"Error: Playbook file not found: {playbook_file}")
-
-    # Load env vars
-    load_env(env_file)
-
-    extra_vars = {"docker_images": list(request.images)}
+    if not INVENTORY_FILE.exists():
+        fail(f"Error: Inventory file not found: {INVENTORY_FILE}")
+
+    if not PLAYBOOK_FILE.exists():
+        fail(f"Error: Playbook file not found: {PLAYBOOK_FILE}")
+
+    # Ansible group_vars read connection details from the process environment
+    load_runtime_env()
+
+    extra_vars = {
+        "docker_images": list(request.images),
+        "migrations": plan_migrations(request.services),
+        "start_first_services": plan_start_first_rollouts(request),
+    }
+    snapshot = apply_remote_state(extra_vars, request, capture_command)
+    mirror = get_registry_mirror()
+    warm = (
+        apply_registry_mirror(extra_vars, request, snapshot, mirror, run_command, capture_command)
+        if mirror
+        else None
+    )
 
     # Prepare ansible-playbook command
     cmd = [
         "ansible-playbook",
         "-i",
-        str(inventory_file),
-        str(playbook_file),
+        str(INVENTORY_FILE),
+        str(PLAYBOOK_FILE),
         "--extra-vars",
         json.dumps(extra_vars),
     ]
 
-    run_command(cmd, "Deploying Docker images with Ansible")
+    try:
+        with track_step("deploy", *(request.services or request.images), arch=request.arch):
+            run_command(cmd, "Deploying Docker images with Ansible")
+    finally:
+        invalidate_remote_state()
+        if mirror:
+            report_mirror_pulls(mirror, warm)
 
 
 def main() -> None:
@@ -55,9 +222,13 @@ def main() -> None:
         fail("Usage: python -m src.deploy.ansible <image1[:tag]> [image2[:tag] ...]")
 
     docker_images = sys.argv[1:]
-    from src.core.runtime.shell import run_command
+    from src.core.runtime.shell import capture_command, run_command
 
-    deploy_images(DeployRequest(images=tuple(docker_images)), run_command=run_command)
+    deploy_images(
+        DeployRequest(images=tuple(docker_images)),
+        run_command=run_command,
+        capture_command=capture_command,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+"""Registry mirror warming and per-deploy mirror hit rate.
+
+`REGISTRY_MIRROR` names an on-network registry (e.g. a `registry:2`
+container) that holds copies of the `techbizz/*` tags. Before a deploy,
+every tag some host is about to pull is copied from Docker Hub to the mirror
+unless the mirror already serves the same digest. The playbook then pulls
+from the mirror, retags to the canonical name, falls back to Docker Hub when
+the mirror cannot serve a tag, and records which source each pull used.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+
+from src.core.config import CACHE_DIR
+from src.core.contracts.ports import CaptureCommandPort, RunCommandPort
+from src.core.domain.policies import mirror_image_tag
+from src.core.runtime.events import emit_event
+from src.core.runtime.shell import console
+from src.deploy.remote_state import fetch_registry_digests
+
+PULL_REPORT_DIR = CACHE_DIR / "mirror-pulls"
+PULL_SOURCE_PREFIX = "pull-source="
+
+
+@dataclass(frozen=True)
+class MirrorWarmReport:
+    """What warming the mirror did for one deploy."""
+
+    copied: tuple[str, ...] = ()
+    current: tuple[str, ...] = ()
+    failed: tuple[str, ...] = ()
+    unknown: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class MirrorPullReport:
+    """Where each host pulled its images from during one deploy."""
+
+    by_host: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    def count(self, source: str, host: str | None = None) -> int:
+        hosts = [host] if host is not None else list(self.by_host)
+        return sum(
+            1
+            for name in hosts
+            for pulled_from in self.by_host.get(name, {}).values()
+            if pulled_from == source
+        )
+
+    @property
+    def pulls(self) -> int:
+        return sum(len(images) for images in self.by_host.values())
+
+    @property
+    def hit_rate(self) -> float | None:
+        return self.count("mirror") / self.pulls if self.pulls else None
+
+
+def warm_enabled() -> bool:
+    """Return whether deploys copy missing tags to the mirror first."""
+    return os.getenv("REGISTRY_MIRROR_WARM", "1") != "0"
+
+
+def warm_mirror(
+    images: list[str],
+    mirror: str,
+    run_command: RunCommandPort,
+    capture_command: CaptureCommandPort,
+    upstream_digests: dict[str, str] | None = None,
+) -> MirrorWarmReport:
+    """Copy tags whose mirror digest differs from Docker Hub's, registry to registry.
+
+    Args:
+        images: Canonical tags that hosts are about to pull
+        upstream_digests: Docker Hub digests already looked up this run
+    """
+    if not images:
+        return MirrorWarmReport()
+    if upstream_digests is None:
+        upstream_digests = fetch_registry_digests(capture_command, tuple(images))
+    mirror_tags = {image: mirror_image_tag(image, mirror) for image in images}
+    mirror_digests = fetch_registry_digests(capture_command, tuple(mirror_tags.values()))
+
+    copied: list[str] = []
+    current: list[str] = []
+    failed: list[str] = []
+    unknown: list[str] = []
+    for image in images:
+        digest = upstream_digests.get(image)
+        if digest is None:
+            unknown.append(image)
+            continue
+        if mirror_digests.get(mirror_tags[image]) == digest:
+            current.append(image)
+            continue
+        # Pin the source to the digest the deploy decisions were made against
+        source = f"{image.rsplit(':', 1)[0]}@{digest}"
+        try:
+            run_command(
+                ["docker", "buildx", "imagetools", "create", "--tag", mirror_tags[image], source],
+                f"Warming {mirror_tags[image]}",
+            )
+            copied.append(image)
+        except SystemExit:
+            failed.append(image)
+
+    report = MirrorWarmReport(
+        copied=tuple(copied), current=tuple(current), failed=tuple(failed), unknown=tuple(unknown)
+    )
+    print_warm_report(mirror, report)
+    return report
+
+
+def print_warm_report(mirror: str, report: MirrorWarmReport) -> None:
+    """Print one summary line, plus the tags the mirror could not take."""
+    console.print(
+        f"🪞 Mirror {mirror}: {len(report.current)} current, {len(report.copied)} warmed"
+        + (f", {len(report.failed)} failed" if report.failed else "")
+    )
+    if report.failed:
+        console.print(
+            "[yellow]⚠️  Hosts will pull these from Docker Hub: "
+            f"{', '.join(report.failed)}[/yellow]"
+        )
+    if report.unknown:
+        console.print(
+            f"[dim]Not on Docker Hub, left to the hosts: {', '.join(report.unknown)}[/dim]"
+        )
+
+
+def reset_pull_reports() -> str:
+    """Empty the directory the playbook writes per-host pull sources to."""
+    shutil.rmtree(PULL_REPORT_DIR, ignore_errors=True)
+    PULL_REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    return str(PULL_REPORT_DIR)
+
+
+def read_pull_reports() -> MirrorPullReport:
+    """Read the `<host>.json` files the playbook wrote, skipping unreadable ones."""
+    by_host: dict[str, dict[str, str]] = {}
+    for path in sorted(PULL_REPORT_DIR.glob("*.json")):
+        try:
+            pulls = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if isinstance(pulls, dict):
+            by_host[path.stem] = {
+                image: str(line).removeprefix(PULL_SOURCE_PREFIX) for image, line in pulls.items()
+            }
+    return MirrorPullReport(by_host=by_host)
+
+
+def report_mirror_pulls(mirror: str, warm: MirrorWarmReport | None) -> MirrorPullReport:
+    """Print and emit the share of host pulls the mirror served in this deploy."""
+    report = read_pull_reports()
+    if report.pulls:
+        for host in sorted(report.by_host):
+            hits = report.count("mirror", host)
+            total = len(report.by_host[host])
+            console.print(f"[dim]{host}: {hits}/{total} pull(s) from mirror[/dim]")
+        console.print(
+            f"🪞 Mirror hit rate: {report.hit_rate:.0%}"
+            f" ({report.count('mirror')}/{report.pulls} host pulls)"
+        )
+    emit_event(
+        "mirror_report",
+        mirror=mirror,
+        pulls=report.by_host,
+        hit_rate=report.hit_rate,
+        warmed=list(warm.copied) if warm else [],
+        warm_current=list(warm.current) if warm else [],
+        warm_failed=list(warm.failed) if warm else [],
+    )
+    return report
@@ -0,0 +1,230 @@
+"""Post-deploy readiness checks and time-to-healthy reporting."""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from src.core.config import get_service_catalog
+from src.core.contracts.ports import CaptureCommandPort
+from src.core.domain.catalog import ReadinessSpec
+from src.core.domain.orchestration import DeployRequest
+from src.core.runtime.events import track_step
+from src.core.runtime.shell import console, fail
+from src.deploy.remote import query_compose_containers, query_host_addresses
+
+DEFAULT_POLL_SECONDS = 2.0
+PROBE_TIMEOUT_S = 3.0
+MAX_PROBE_WORKERS = 32
+
+
+class ReadinessTimeout(Exception):
+    """Raised when a service does not become ready before its timeout."""
+
+
+@dataclass(frozen=True)
+class ReadinessResult:
+    """Outcome of waiting for one service."""
+
+    service: str
+    ready: bool
+    seconds: float
+    detail: str = ""
+
+
+def get_poll_seconds() -> float:
+    """Read the readiness poll interval from the environment."""
+    try:
+        value = float(os.getenv("READINESS_POLL_SECONDS", ""))
+    except ValueError:
+        return DEFAULT_POLL_SECONDS
+    return value if value > 0 else DEFAULT_POLL_SECONDS
+
+
+def http_probe(url: str, timeout_s: float = PROBE_TIMEOUT_S) -> str | None:
+    """Return None when `url` answers with a non-error status, else the reason."""
+    import urllib.error
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(url, timeout=timeout_s) as response:
+            status = response.status
+    except urllib.error.HTTPError as error:
+        return f"{url} returned {error.code}"
+    except (urllib.error.URLError, OSError) as error:
+        reason = getattr(error, "reason", error)
+        return f"{url} unreachable ({reason})"
+    return None if status < 400 else f"{url} returned {status}"
+
+
+def tcp_probe(target: str, timeout_s: float = PROBE_TIMEOUT_S) -> str | None:
+    """Return None when `host:port` accepts a connection, else the reason."""
+    host, _, port = target.rpartition(":")
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout_s):
+            return None
+    except OSError as error:
+        return f"{target} refused ({error})"
+
+
+def container_problem(
+    compose_service: str,
+    containers_by_host: dict[str, list[dict[str, Any]] | None] | None,
+) -> str | None:
+    """Return None when the service's containers run (and are healthy) on every host."""
+    if containers_by_host is None:
+        return "container state query failed"
+
+    for host, containers in containers_by_host.items():
+        if containers is None:
+            return f"{host}: container state query failed"
+        matching = [c for c in containers if c.get("Service") == compose_service]
+        if not matching:
+            return f"{host}: no {compose_service} container"
+        for container in matching:
+            state = container.get("State", "")
+            health = container.get("Health", "")
+            if state != "running":
+                return f"{host}: {container.get('Name', compose_service)} is {state or 'unknown'}"
+            if health and health != "healthy":
+                return f"{host}: {container.get('Name', compose_service)} is {health}"
+    return None
+
+
+class ContainerStatePoller:
+    """Share one remote container query per poll interval across service waiters."""
+
+    def __init__(self, capture_command: CaptureCommandPort, interval_s: float) -> None:
+        self.capture_command = capture_command
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._fetched_at: float | None = None
+        self._state: dict[str, list[dict[str, Any]] | None] | None = None
+
+    def get(self) -> dict[str, list[dict[str, Any]] | None] | None:
+        """Return container state no older than one poll interval."""
+        with self._lock:
+            now = time.monotonic()
+            if self._fetched_at is None or now - self._fetched_at >= self.interval_s:
+                self._state = query_compose_containers(self.capture_command)
+                self._fetched_at = time.monotonic()
+            return self._state
+
+
+def resolve_probe_hosts(capture_command: CaptureCommandPort) -> list[str]:
+    """Return the addresses substituted for `{host}` in probe targets.
+
+    `READINESS_HOSTS` (comma-separated) overrides inventory discovery, which
+    is also how probes are pointed at a local stand-in endpoint.
+    """
+    override = os.getenv("READINESS_HOSTS", "")
+    if override:
+        return [host.strip() for host in override.split(",") if host.strip()]
+
+    addresses = query_host_addresses(capture_command)
+    if not addresses:
+        fail("Readiness check failed: could not resolve deploy host addresses")
+    return sorted(set(addresses.values()))
+
+
+def wait_for_service(
+    spec: ReadinessSpec,
+    hosts: list[str],
+    poller: ContainerStatePoller,
+    probe_pool: ThreadPoolExecutor,
+    poll_s: float,
+) -> None:
+    """Poll one service until all of its checks pass or its timeout expires."""
+    deadline = time.monotonic() + spec.timeout_s
+    while True:
+        problem = None
+        if spec.container:
+            problem = container_problem(spec.compose_service, poller.get())
+        if problem is None:
+            probes = [
+                probe_pool.submit(partial(probe, target.format(host=host)))
+                for probe, target in ((http_probe, spec.http), (tcp_probe, spec.tcp))
+                if target
+                for host in hosts
+            ]
+            problem = next((p for p in (f.result() for f in probes) if p), None)
+        if problem is None:
+            return
+        if time.monotonic() >= deadline:
+            raise ReadinessTimeout(problem)
+        time.sleep(min(poll_s, max(deadline - time.monotonic(), 0)))
+
+
+def await_readiness(
+    request: DeployRequest,
+    deploy_started: float,
+    capture_command: CaptureCommandPort,
+) -> None:
+    """Wait for deployed services with readiness checks and report time-to-healthy.
+
+    Args:
+        request: The deploy that just finished
+        deploy_started: `time.monotonic()` when the deploy began; time-to-healthy
+            is measured from this point, not from when compose returned
+    """
+    catalog = get_service_catalog()
+    specs = {
+        name: service.readiness
+        for name in request.services
+        if (service := catalog.get(name)) is not None and service.readiness is not None
+    }
+    if not specs or os.getenv("READINESS_CHECK", "1") == "0":
+        return
+
+    needs_hosts = any(spec.http or spec.tcp for spec in specs.values())
+    hosts = resolve_probe_hosts(capture_command) if needs_hosts else []
+    poll_s = get_poll_seconds()
+    poller = ContainerStatePoller(capture_command, poll_s)
+    console.print(
+        f"\n[bold cyan]⏳ Waiting for {len(specs)} service(s) to become ready[/bold cyan]"
+    )
+
+    def wait(name: str, spec: ReadinessSpec) -> ReadinessResult:
+        try:
+            with track_step("ready", name, arch=request.arch) as details:
+                wait_for_service(spec, hosts, poller, probe_pool, poll_s)
+                seconds = time.monotonic() - deploy_started
+                details.update(time_to_healthy_s=round(seconds, 3))
+        except ReadinessTimeout as error:
+            return ReadinessResult(name, False, time.monotonic() - deploy_started, str(error))
+        return ReadinessResult(name, True, seconds)
+
+    probe_workers = min(MAX_PROBE_WORKERS, max(len(specs) * max(len(hosts), 1) * 2, 1))
+    with (
+        ThreadPoolExecutor(max_workers=probe_workers, thread_name_prefix="probe") as probe_pool,
+        ThreadPoolExecutor(max_workers=len(specs), thread_name_prefix="ready") as service_pool,
+    ):
+        futures = [service_pool.submit(wait, name, spec) for name, spec in specs.items()]
+        results = [future.result() for future in futures]
+
+    print_readiness_report(results)
+    not_ready = [result for result in results if not result.ready]
+    if not_ready:
+        fail(
+            "Readiness check failed",
+            "\n".join(f"  - {result.service}: {result.detail}" for result in not_ready),
+        )
+
+
+def print_readiness_report(results: list[ReadinessResult]) -> None:
+    """Print time-to-healthy per service, measured from deploy start."""
+    from rich.table import Table
+
+    table = Table(title="Time to healthy", title_justify="left")
+    table.add_column("Service")
+    table.add_column("Status")
+    table.add_column("Since deploy start", justify="right")
+    table.add_column("Detail")
+    for result in sorted(results, key=lambda r: r.seconds):
+        status = "[green]ready[/green]" if result.ready else "[red]timed out[/red]"
+        table.add_row(result.service, status, f"{result.seconds:.1f}s", result.detail)
+    console.print(table)
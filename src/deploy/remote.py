@@ -0,0 +1,121 @@
+"""Read-only queries against the deploy hosts through Ansible ad-hoc commands."""
+
+import json
+import os
+from typing import Any
+
+from src.core.config import INVENTORY_FILE
+from src.core.contracts.ports import CaptureCommandPort
+
+INVENTORY_GROUP = "remote"
+
+# The json stdout callback prints one document with per-host results.
+ANSIBLE_JSON_ENV: tuple[str, ...] = (
+    "ANSIBLE_STDOUT_CALLBACK=json",
+    "ANSIBLE_LOAD_CALLBACK_PLUGINS=1",
+)
+
+
+def build_adhoc_command(module: str, args: str) -> list[str]:
+    """Build an ad-hoc Ansible command whose output is machine-readable JSON."""
+    return [
+        "env",
+        *ANSIBLE_JSON_ENV,
+        "ansible",
+        INVENTORY_GROUP,
+        "-i",
+        str(INVENTORY_FILE),
+        # Same privileges as the deploy playbook, which runs with `become`
+        "--become",
+        "-m",
+        module,
+        "-a",
+        args,
+    ]
+
+
+def parse_adhoc_results(output: str | None) -> dict[str, dict[str, Any]] | None:
+    """Extract per-host results from json-callback output.
+
+    Returns:
+        Mapping of inventory hostname to module result, or None when the
+        output is missing or malformed
+    """
+    if not output:
+        return None
+    try:
+        document = json.loads(output)
+        hosts = document["plays"][0]["tasks"][0]["hosts"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+    return hosts if isinstance(hosts, dict) else None
+
+
+def run_adhoc(
+    capture_command: CaptureCommandPort,
+    module: str,
+    args: str,
+) -> dict[str, dict[str, Any]] | None:
+    """Run one ad-hoc module on every deploy host and return per-host results."""
+    return parse_adhoc_results(capture_command(build_adhoc_command(module, args)))
+
+
+def query_host_addresses(capture_command: CaptureCommandPort) -> dict[str, str] | None:
+    """Resolve each inventory host to the address Ansible connects to."""
+    results = run_adhoc(capture_command, "ansible.builtin.debug", "var=ansible_host")
+    if results is None:
+        return None
+    return {
+        host: str(result.get("ansible_host") or host)
+        for host, result in results.items()
+        if not result.get("unreachable") and not result.get("failed")
+    }
+
+
+def parse_compose_ps(stdout: str) -> list[dict[str, Any]]:
+    """Parse `docker compose ps --format json` output.
+
+    Compose v2.21+ prints one object per line; older releases print an array.
+    """
+    stdout = stdout.strip()
+    if not stdout:
+        return []
+    if stdout.startswith("["):
+        try:
+            containers = json.loads(stdout)
+        except ValueError:
+            return []
+        return [item for item in containers if isinstance(item, dict)]
+
+    containers = []
+    for line in stdout.splitlines():
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(item, dict):
+            containers.append(item)
+    return containers
+
+
+def query_compose_containers(
+    capture_command: CaptureCommandPort,
+) -> dict[str, list[dict[str, Any]] | None] | None:
+    """Return the compose project's containers on each deploy host.
+
+    Hosts that could not be queried map to None.
+    """
+    deploy_dir = os.getenv("DEPLOYMENT_DIRECTORY", "")
+    results = run_adhoc(
+        capture_command,
+        "ansible.builtin.shell",
+        f"docker compose ps --all --format json chdir={deploy_dir}",
+    )
+    if results is None:
+        return None
+    return {
+        host: None
+        if result.get("unreachable") or result.get("failed")
+        else parse_compose_ps(result.get("stdout", ""))
+        for host, result in results.items()
+    }
@@ -0,0 +1,260 @@
+"""Collect, cache, and replay remote host state snapshots.
+
+One `ansible -m script` call runs `config/collect-remote-state.py` on every
+host and returns image digests, container image IDs, compose config hashes,
+and disk usage as compact JSON. The snapshot is reused for every decision in
+the run and dropped once the playbook changes the hosts.
+"""
+
+import json
+import os
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.core.config import CACHE_DIR, CONFIG_DIR
+from src.core.contracts.ports import CaptureCommandPort
+from src.core.domain.remote_state import (
+    ContainerState,
+    DiskUsage,
+    HostState,
+    ImageState,
+    RemoteSnapshot,
+)
+from src.core.runtime.shell import console, fail
+from src.deploy.remote import run_adhoc
+
+COLLECTOR_SCRIPT = CONFIG_DIR / "collect-remote-state.py"
+REMOTE_STATE_DIR = CACHE_DIR / "remote-state"
+LAST_SNAPSHOT_FILE = REMOTE_STATE_DIR / "last.json"
+SNAPSHOT_ENV = "REMOTE_STATE_SNAPSHOT"
+# Development aid: replaying a recorded snapshot must be asked for explicitly
+REPLAY_ENV = "REMOTE_STATE_REPLAY"
+SNAPSHOT_MAX_AGE_ENV = "REMOTE_STATE_SNAPSHOT_MAX_AGE_S"
+DEFAULT_SNAPSHOT_MAX_AGE_S = 600
+MAX_DIGEST_WORKERS = 8
+DEFAULT_PRUNE_MIN_RECLAIMABLE_MB = 500
+DEFAULT_PRUNE_MIN_FREE_MB = 5000
+MEGABYTE = 1_000_000
+
+_cached: dict[tuple[str, ...], RemoteSnapshot] = {}
+
+
+def get_prune_thresholds() -> tuple[int, int] | None:
+    """Return (min reclaimable bytes, min free bytes) that trigger a prune.
+
+    Pruning every host stays the default: this returns None unless
+    `PRUNE_MIN_RECLAIMABLE_MB` or `PRUNE_MIN_FREE_MB` is set. Once either is
+    set, the other one falls back to its default.
+    """
+    if not os.getenv("PRUNE_MIN_RECLAIMABLE_MB") and not os.getenv("PRUNE_MIN_FREE_MB"):
+        return None
+
+    def megabytes(key: str, default: int) -> int:
+        raw_value = os.getenv(key, "")
+        if raw_value and not raw_value.isdigit():
+            fail(f"Invalid {key}: '{raw_value}'")
+        return (int(raw_value) if raw_value else default) * MEGABYTE
+
+    return (
+        megabytes("PRUNE_MIN_RECLAIMABLE_MB", DEFAULT_PRUNE_MIN_RECLAIMABLE_MB),
+        megabytes("PRUNE_MIN_FREE_MB", DEFAULT_PRUNE_MIN_FREE_MB),
+    )
+
+
+def parse_host_state(document: dict[str, Any]) -> HostState:
+    """Build a `HostState` from one collector document."""
+    disk = document.get("disk") or {}
+    return HostState(
+        images={
+            ref: ImageState(id=image.get("id", ""), digests=tuple(image.get("digests") or ()))
+            for ref, image in (document.get("images") or {}).items()
+        },
+        containers=tuple(
+            ContainerState(
+                service=item.get("service", ""),
+                name=item.get("name", ""),
+                image_id=item.get("image_id", ""),
+                config_hash=item.get("config_hash", ""),
+                state=item.get("state", ""),
+                health=item.get("health", ""),
+            )
+            for item in document.get("containers") or ()
+        ),
+        desired_hashes=dict(document.get("desired_hashes") or {}),
+        disk=DiskUsage(
+            images_bytes=int(disk.get("images_bytes", 0)),
+            reclaimable_bytes=int(disk.get("reclaimable_bytes", 0)),
+            free_bytes=int(disk.get("free_bytes", 0)),
+        ),
+    )
+
+
+def parse_snapshot(document: dict[str, Any]) -> RemoteSnapshot:
+    """Build a `RemoteSnapshot` from a recorded or freshly collected document.
+
+    A host whose document is missing (`null`) or malformed is listed as
+    unavailable, so only that host falls back to the playbook defaults.
+    """
+    hosts: dict[str, HostState] = {}
+    unavailable: list[str] = []
+    for host, state in document["hosts"].items():
+        try:
+            hosts[host] = parse_host_state(state)
+        except (AttributeError, TypeError, ValueError):
+            unavailable.append(host)
+    return RemoteSnapshot(
+        hosts=hosts,
+        registry_digests=dict(document.get("registry_digests") or {}),
+        collected_at=float(document.get("collected_at", 0.0)),
+        unavailable_hosts=tuple(sorted(unavailable)),
+    )
+
+
+def collect_host_states(
+    capture_command: CaptureCommandPort,
+    images: tuple[str, ...],
+) -> dict[str, Any] | None:
+    """Run the collector on every host in a single ad-hoc call.
+
+    Returns:
+        Mapping of host to collector document (None for a host whose output
+        is not JSON), or None when the ad-hoc call itself failed
+    """
+    deploy_dir = os.getenv("DEPLOYMENT_DIRECTORY", "")
+    args = " ".join(shlex.quote(arg) for arg in (str(COLLECTOR_SCRIPT), deploy_dir, *images))
+    results = run_adhoc(capture_command, "ansible.builtin.script", f"{args} executable=python3")
+    if results is None:
+        return None
+
+    hosts: dict[str, Any] = {}
+    for host, result in results.items():
+        try:
+            hosts[host] = json.loads(result.get("stdout", ""))
+        except ValueError:
+            hosts[host] = None
+    return hosts
+
+
+def fetch_registry_digest(capture_command: CaptureCommandPort, image: str) -> str | None:
+    """Return the digest the registry currently serves for a tag."""
+    output = capture_command(
+        ["docker", "buildx", "imagetools", "inspect", image, "--format", "{{json .Manifest}}"]
+    )
+    try:
+        return json.loads(output or "")["digest"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def fetch_registry_digests(
+    capture_command: CaptureCommandPort,
+    images: tuple[str, ...],
+) -> dict[str, str]:
+    """Look up registry digests for all deploy images concurrently."""
+    if not images:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_DIGEST_WORKERS, len(images))) as pool:
+        digests = pool.map(lambda image: fetch_registry_digest(capture_command, image), images)
+        return {image: digest for image, digest in zip(images, digests) if digest}
+
+
+def get_snapshot_max_age_s() -> int:
+    """Return how old a replayed snapshot may be before it is rejected."""
+    raw_value = os.getenv(SNAPSHOT_MAX_AGE_ENV, "")
+    return int(raw_value) if raw_value.isdigit() else DEFAULT_SNAPSHOT_MAX_AGE_S
+
+
+def load_recorded_snapshot(path: Path) -> RemoteSnapshot:
+    """Replay a snapshot recorded from an earlier run.
+
+    A replayed snapshot drives real pulls, rollouts, and prunes, so one older
+    than `REMOTE_STATE_SNAPSHOT_MAX_AGE_S` (or without `collected_at`) is
+    rejected, and every replay is announced.
+    """
+    try:
+        snapshot = parse_snapshot(json.loads(path.read_text()))
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        fail(f"Cannot replay remote state snapshot {path}: {error}")
+
+    max_age_s = get_snapshot_max_age_s()
+    age_s = time.time() - snapshot.collected_at
+    if not snapshot.collected_at or age_s > max_age_s:
+        collected = (
+            f"was collected {age_s:.0f}s ago" if snapshot.collected_at else "has no collected_at"
+        )
+        fail(
+            f"Refusing to replay stale remote state snapshot {path}",
+            f"It {collected}; the limit is {max_age_s}s ({SNAPSHOT_MAX_AGE_ENV})."
+            f" Unset {SNAPSHOT_ENV} to collect fresh state.",
+        )
+    console.print(
+        f"[bold yellow]⚠️  Replaying remote state from {path} ({age_s:.0f}s old) instead of"
+        " contacting the hosts; pulls, rollouts, and prunes follow this recorded state"
+        "[/bold yellow]"
+    )
+    return snapshot
+
+
+def save_snapshot(document: dict[str, Any]) -> None:
+    """Keep the latest collected snapshot so it can be replayed later."""
+    try:
+        REMOTE_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        LAST_SNAPSHOT_FILE.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    except OSError:
+        pass
+
+
+def get_remote_state(
+    capture_command: CaptureCommandPort,
+    images: tuple[str, ...],
+) -> RemoteSnapshot | None:
+    """Return this run's remote snapshot, collecting it on first use.
+
+    With `REMOTE_STATE_REPLAY=1`, `REMOTE_STATE_SNAPSHOT` replays a recent
+    recorded snapshot file instead of contacting the hosts.
+    """
+    if images in _cached:
+        return _cached[images]
+
+    recorded = os.getenv(SNAPSHOT_ENV, "")
+    if recorded:
+        if os.getenv(REPLAY_ENV, "") != "1":
+            fail(
+                f"{SNAPSHOT_ENV} is set but snapshot replay is a development aid",
+                f"Set {REPLAY_ENV}=1 to replay {recorded} against the real hosts,"
+                f" or unset {SNAPSHOT_ENV} to collect fresh state.",
+            )
+        _cached[images] = load_recorded_snapshot(Path(recorded))
+        return _cached[images]
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # The registry lookups run locally while the hosts are being collected.
+        digests_future = pool.submit(fetch_registry_digests, capture_command, images)
+        hosts = collect_host_states(capture_command, images)
+        registry_digests = digests_future.result()
+    if hosts is None:
+        return None
+
+    document = {"collected_at": time.time(), "hosts": hosts, "registry_digests": registry_digests}
+    save_snapshot(document)
+    snapshot = parse_snapshot(document)
+    _cached[images] = snapshot
+    console.print(
+        f"[dim]Remote state from {len(snapshot.hosts)} host(s) in"
+        f" {time.monotonic() - started:.1f}s[/dim]"
+    )
+    if snapshot.unavailable_hosts:
+        console.print(
+            f"[yellow]⚠️  No usable state from {', '.join(snapshot.unavailable_hosts)};"
+            " those hosts pull every image, check rollouts themselves, and are pruned[/yellow]"
+        )
+    return snapshot
+
+
+def invalidate_remote_state() -> None:
+    """Forget cached snapshots after the hosts have been changed."""
+    _cached.clear()
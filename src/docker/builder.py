@@ -1,26 +1,91 @@
 """Docker image building operations."""
 
-import os
 import subprocess
 import sys
-from pathlib import Path
-from src.core.config import get_services_config, PROJECT_ROOT
+import time
+from src.core.config import (
+    get_registry_mirror,
+    get_service_definition,
+    load_runtime_env,
+    resolve_context_path,
+)
 from src.core.domain.orchestration import BuildRequest
-from src.core.contracts.ports import RunCommandPort
-from src.core.runtime.shell import load_env, console, exit_with_message, fail
-from src.core.domain.policies import build_image_tag, get_platform_for_arch
+from src.core.contracts.ports import CaptureCommandPort, RunCommandPort, StreamCommandPort
+from src.core.runtime.events import track_step
+from src.core.runtime.pipeline import record_push_rate
+from src.core.runtime.shell import console, exit_with_message, fail
+from src.core.domain.policies import (
+    build_image_tag,
+    get_platform_for_arch,
+    mirror_image_tag,
+    should_push,
+)
+from src.docker.buildkit import (
+    BuildProgressParser,
+    analyze_cache,
+    format_step_line,
+    print_cache_report,
+    print_step_failures,
+    record_build,
+)
+from src.docker.cache_mounts import (
+    cache_build_args,
+    collect_cache_usage,
+    enforce_cache_limits,
+    format_cache_usage,
+    warn_unmounted_caches,
+)
+from src.docker.context_report import (
+    analyze_context,
+    enforce_context_budget,
+    format_context_summary,
+)
+from src.docker.image_size import (
+    ImageSizeReport,
+    compare_layers,
+    enforce_budget,
+    enforce_push_delta,
+    estimate_push_delta,
+    fetch_layer_manifest,
+    inspect_image_bytes,
+    print_image_report,
+)
 
 
-def get_env_or_default(key: str, default: str) -> str:
-    """Fetch from .env or environment with fallback."""
-    return os.getenv(key, default)
+def show_build_line(parser: BuildProgressParser, line: str) -> bool:
+    """Print completed BuildKit steps, or the raw line when it is not progress JSON.
+
+    Returns:
+        True when the line was a progress record
+    """
+    completed = parser.feed(line)
+    if completed is None:
+        console.print(line, markup=False, highlight=False)
+        return False
+    for step in completed:
+        if step.is_dockerfile_step:
+            console.print(format_step_line(step), highlight=False)
+    return True
 
 
 def build_service(
     request: BuildRequest,
     run_command: RunCommandPort,
+    stream_command: StreamCommandPort,
+    capture_command: CaptureCommandPort,
 ) -> None:
-    """Build and (optionally) push a single service image."""
+    """Build a single service image.
+
+    The context is measured first, with `.dockerignore` applied, so an
+    oversized upload is reported (or refused) before BuildKit starts sending
+    it. The build streams BuildKit `rawjson` progress so each Dockerfile step
+    can be reported with its cache status once the build finishes. The image
+    size is checked against the service budget here, before the image is
+    queued for `push_service`.
+
+    Configured cache mounts get their id and sharing mode as build args and
+    are measured after the build; one that outgrew `max_mb` is cleared.
+    """
     service_name = request.service_name
     platform_arch = request.arch
     platform = get_platform_for_arch(platform_arch)
@@ -30,50 +95,159 @@ def build_service(
             "[yellow]Please use 'amd' or 'arm'[/yellow]",
         )
 
-    # Load services configuration
-    config = get_services_config()
+    context_path = resolve_context_path(service_name)
+    context_path_str = str(context_path)
+    service = get_service_definition(service_name)
+    budget = service.budget
 
-    services_data = config.get("services", {})
-    if service_name not in services_data:
-        fail(f"Error: Unknown service '{service_name}'")
+    image_name = build_image_tag(service_name, platform_arch)
 
-    # Get context path from env using the key from config
-    env_var = services_data[service_name]
-    context_path_str = get_env_or_default(env_var, "")
+    parser = BuildProgressParser()
+    with track_step("build", service_name, arch=platform_arch) as details:
+        context = analyze_context(context_path)
+        details.update(context_bytes=context.total_bytes, context_files=context.file_count)
+        console.print(f"📁 {service_name} context: {format_context_summary(context)}")
+        enforce_context_budget(service_name, context, budget)
+        warn_unmounted_caches(service_name, context_path, service.caches)
+        try:
+            stream_command(
+                [
+                    "docker",
+                    "buildx",
+                    "build",
+                    f"--platform={platform}",
+                    "--progress=rawjson",
+                    *cache_build_args(service.caches),
+                    "-t",
+                    image_name,
+                    context_path_str,
+                ],
+                f"Building Docker image {image_name}",
+                lambda line: show_build_line(parser, line),
+            )
+        except SystemExit:
+            print_step_failures(parser)
+            raise
+        finally:
+            report = analyze_cache(parser.steps())
+            details.update(
+                cached_steps=report.cache_hits,
+                total_steps=len(report.steps),
+                first_miss=report.first_miss,
+            )
+            if report.steps:
+                record_build(service_name, platform_arch, report)
+        cache_usage = collect_cache_usage(capture_command, service.caches)
+        if cache_usage:
+            details.update(
+                cache_mounts={item.cache.name: item.size_bytes for item in cache_usage}
+            )
 
-    if not context_path_str:
-        fail(
-            f"Error: Build context path not set for {service_name}",
-            f"[yellow]Please check if {env_var} is defined in .env[/yellow]",
+    print_cache_report(service_name, report)
+    if cache_usage:
+        console.print(f"🗄️  {service_name} cache mounts: {format_cache_usage(cache_usage)}")
+        enforce_cache_limits(run_command, cache_usage)
+
+    image_bytes = inspect_image_bytes(capture_command, image_name)
+    size_report = ImageSizeReport(image_bytes=image_bytes)
+    enforce_budget(service_name, size_report, budget)
+    if not should_push(platform_arch):
+        print_image_report(service_name, size_report)
+
+
+def push_to_mirror(run_command: RunCommandPort, image_name: str, mirror: str) -> str | None:
+    """Also push a built image to the registry mirror.
+
+    The mirror only speeds up deploys, so a failure warns and hosts fall back
+    to Docker Hub.
+
+    Returns:
+        The mirror tag when it was created locally and needs cleaning up
+    """
+    mirror_tag = mirror_image_tag(image_name, mirror)
+    try:
+        run_command(["docker", "tag", image_name, mirror_tag], f"Tagging {mirror_tag}")
+    except SystemExit:
+        console.print(
+            f"[yellow]⚠️  Could not tag {mirror_tag}; not pushed to the mirror[/yellow]"
         )
+        return None
+    try:
+        run_command(
+            ["docker", "push", mirror_tag],
+            f"Pushing {mirror_tag} to the registry mirror",
+        )
+    except SystemExit:
+        console.print(
+            f"[yellow]⚠️  Mirror push of {mirror_tag} failed; deploys will warm it"
+            " from Docker Hub or pull from there[/yellow]"
+        )
+    return mirror_tag
 
-    if not Path(context_path_str).exists():
-        fail(f"Error: Build context path does not exist: {context_path_str}")
 
-    image_name = build_image_tag(service_name, platform_arch)
+def push_service(
+    request: BuildRequest,
+    run_command: RunCommandPort,
+    capture_command: CaptureCommandPort,
+) -> None:
+    """Push a built image, report the pushed-layer delta, and remove it locally.
 
-    run_command(
-        [
-            "docker",
-            "buildx",
-            "build",
-            f"--platform={platform}",
-            "-t",
-            image_name,
-            context_path_str,
-        ],
-        f"Building Docker image {image_name}",
-    )
+    The delta budget is checked before pushing, against the layers of the tag
+    that is in the registry, so `on_exceed: fail` keeps an oversized image
+    from being published; the refused image is removed locally. With `REGISTRY_MIRROR` set, the image is pushed
+    there as well.
+    """
+    service_name = request.service_name
+    platform_arch = request.arch
+    platform = get_platform_for_arch(platform_arch)
+    if platform is None:
+        fail(
+            f"Error: Unsupported architecture '{platform_arch}'",
+            "[yellow]Please use 'amd' or 'arm'[/yellow]",
+        )
+    image_name = build_image_tag(service_name, platform_arch)
+    image_bytes = inspect_image_bytes(capture_command, image_name)
+    budget = get_service_definition(service_name).budget
 
-    if platform_arch == "amd":
+    if budget is not None and budget.max_push_delta_mb is not None:
+        delta = estimate_push_delta(capture_command, image_name, platform)
+        try:
+            enforce_push_delta(service_name, delta, budget)
+        except SystemExit:
+            # A refused image is never pushed, so nothing else removes it
+            discard_image(request, run_command)
+            raise
+    previous = fetch_layer_manifest(capture_command, image_name, platform)
+    with track_step("push", service_name, arch=platform_arch) as details:
+        started = time.monotonic()
         run_command(
             ["docker", "push", image_name],
             f"Pushing {image_name} to Docker Hub",
         )
-        run_command(
-            ["docker", "image", "rm", image_name],
-            f"Cleaning up local {image_name}",
-        )
+        push_s = time.monotonic() - started
+        current = fetch_layer_manifest(capture_command, image_name, platform)
+        size_report = compare_layers(image_bytes, previous, current)
+        if size_report.new_bytes is not None:
+            details.update(
+                bytes=size_report.new_bytes,
+                compressed_bytes=size_report.compressed_bytes,
+                image_bytes=image_bytes,
+            )
+            record_push_rate(service_name, platform_arch, size_report.new_bytes, push_s)
+        mirror = get_registry_mirror()
+        mirror_tag = push_to_mirror(run_command, image_name, mirror) if mirror else None
+    run_command(
+        ["docker", "image", "rm", image_name, *([mirror_tag] if mirror_tag else [])],
+        f"Cleaning up local {image_name}",
+    )
+
+    print_image_report(service_name, size_report)
+
+
+def discard_image(request: BuildRequest, run_command: RunCommandPort) -> None:
+    """Remove a built image that the pipeline will not push."""
+    image_name = build_image_tag(request.service_name, request.arch)
+    run_command(["docker", "image", "rm", image_name], f"Removing unpushed {image_name}")
 
 
 def main() -> None:
@@ -84,19 +258,28 @@ def main() -> None:
             "Example: python -m src.docker.builder amd vendor consumer frankenphp",
         )
 
-    load_env(PROJECT_ROOT / ".env")
+    load_runtime_env()
 
     platform_arch = sys.argv[1]
     services = sys.argv[2:]
 
     for service in services:
         try:
-            from src.core.runtime.shell import run_command
+            from src.core.runtime.shell import (
+                capture_command,
+                run_command,
+                stream_command,
+            )
 
+            request = BuildRequest(service_name=service, arch=platform_arch)
             build_service(
-                BuildRequest(service_name=service, arch=platform_arch),
+                request,
                 run_command=run_command,
+                stream_command=stream_command,
+                capture_command=capture_command,
             )
+            if should_push(platform_arch):
+                push_service(request, run_command=run_command, capture_command=capture_command)
         except Exception as e:
             fail(f"Failed to build {service}: {e}")
 
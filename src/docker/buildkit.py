@@ -0,0 +1,302 @@
+"""BuildKit `--progress=rawjson` parsing and per-step cache reporting."""
+
+import base64
+import binascii
+import json
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.core.config import CACHE_DIR
+from src.core.runtime.shell import console
+
+BUILD_RECORDS_DIR = CACHE_DIR / "build-records"
+MAX_RECORDS_PER_SERVICE = 500
+STEP_LOG_TAIL_LINES = 40
+
+# Dockerfile instructions look like "[2/7] COPY . ." or "[builder 3/5] RUN ..."
+DOCKERFILE_STEP_PATTERN = re.compile(r"^\[(?:([\w.-]+) )?(\d+)/\d+\] (\w+)")
+# Base image resolution is rarely marked cached and never invalidates a stage
+NON_CACHEABLE_INSTRUCTIONS = frozenset({"FROM"})
+PROGRESS_KEYS = frozenset({"vertexes", "statuses", "logs", "warnings"})
+TIMESTAMP_PATTERN = re.compile(r"^(.*?T[\d:]+)(?:\.(\d+))?(Z|[+-]\d\d:\d\d)$")
+
+
+def parse_timestamp(value: str | None) -> float | None:
+    """Parse a BuildKit RFC 3339 timestamp (nanosecond precision) to epoch seconds."""
+    if not value:
+        return None
+    match = TIMESTAMP_PATTERN.match(value)
+    if match is None:
+        return None
+    base, fraction, zone = match.groups()
+    fraction = (fraction or "0")[:6].ljust(6, "0")
+    zone = "+00:00" if zone == "Z" else zone
+    try:
+        return datetime.fromisoformat(f"{base}.{fraction}{zone}").timestamp()
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class BuildStep:
+    """One BuildKit vertex after the build finished."""
+
+    name: str
+    cached: bool
+    started: float | None
+    completed: float | None
+    error: str | None = None
+
+    @property
+    def duration_s(self) -> float:
+        if self.started is None or self.completed is None:
+            return 0.0
+        return max(self.completed - self.started, 0.0)
+
+    @property
+    def is_dockerfile_step(self) -> bool:
+        """Return whether this vertex is a cacheable Dockerfile instruction."""
+        match = DOCKERFILE_STEP_PATTERN.match(self.name)
+        return match is not None and match.group(3).upper() not in NON_CACHEABLE_INSTRUCTIONS
+
+    @property
+    def stage(self) -> str:
+        """Return the build stage name, or "" for the unnamed final stage."""
+        match = DOCKERFILE_STEP_PATTERN.match(self.name)
+        return (match.group(1) or "") if match else ""
+
+    @property
+    def position(self) -> int:
+        """Return the step number within its stage."""
+        match = DOCKERFILE_STEP_PATTERN.match(self.name)
+        return int(match.group(2)) if match else 0
+
+
+class BuildProgressParser:
+    """Accumulate vertex updates from a rawjson progress stream."""
+
+    def __init__(self) -> None:
+        self._vertexes: dict[str, dict[str, Any]] = {}
+        self._reported: set[str] = set()
+        self._logs: dict[str, deque[str]] = {}
+
+    def feed(self, line: str) -> list[BuildStep] | None:
+        """Consume one output line.
+
+        Returns:
+            Steps that completed with this line, or None when the line is not
+            a progress record and should be shown as plain output
+        """
+        if not line.startswith("{"):
+            return None
+        try:
+            status = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(status, dict) or not PROGRESS_KEYS & status.keys():
+            return None
+
+        completed: list[BuildStep] = []
+        for vertex in status.get("vertexes") or []:
+            digest = vertex.get("digest")
+            if not digest:
+                continue
+            merged = self._vertexes.setdefault(digest, {})
+            merged.update({key: value for key, value in vertex.items() if value is not None})
+            if merged.get("completed") and digest not in self._reported:
+                self._reported.add(digest)
+                completed.append(self._to_step(merged))
+        for entry in status.get("logs") or []:
+            self._add_log(entry)
+        return completed
+
+    def _add_log(self, entry: dict[str, Any]) -> None:
+        digest = entry.get("vertex")
+        try:
+            text = base64.b64decode(entry.get("data") or "").decode("utf-8", "replace")
+        except (binascii.Error, ValueError):
+            return
+        if digest:
+            tail = self._logs.setdefault(digest, deque(maxlen=STEP_LOG_TAIL_LINES))
+            tail.extend(line for line in text.splitlines() if line.strip())
+
+    def failed_steps(self) -> list[tuple[BuildStep, list[str]]]:
+        """Return failed steps with the last lines of their output."""
+        return [
+            (self._to_step(vertex), list(self._logs.get(digest, ())))
+            for digest, vertex in self._vertexes.items()
+            if vertex.get("error")
+        ]
+
+    @staticmethod
+    def _to_step(vertex: dict[str, Any]) -> BuildStep:
+        return BuildStep(
+            name=vertex.get("name", "?"),
+            cached=bool(vertex.get("cached")),
+            started=parse_timestamp(vertex.get("started")),
+            completed=parse_timestamp(vertex.get("completed")),
+            error=vertex.get("error") or None,
+        )
+
+    def steps(self) -> list[BuildStep]:
+        """Return all vertexes ordered by start time."""
+        steps = [self._to_step(vertex) for vertex in self._vertexes.values()]
+        return sorted(steps, key=lambda step: step.started or float("inf"))
+
+
+@dataclass(frozen=True)
+class StageMiss:
+    """The first cache miss in one build stage and the steps rebuilt after it."""
+
+    stage: str
+    first_miss: str
+    rebuilt_after: int
+
+
+@dataclass(frozen=True)
+class CacheReport:
+    """Cache behavior of the Dockerfile steps in one build."""
+
+    steps: tuple[BuildStep, ...]
+    stage_misses: tuple[StageMiss, ...] = ()
+
+    @property
+    def first_miss(self) -> str | None:
+        return self.stage_misses[0].first_miss if self.stage_misses else None
+
+    @property
+    def rebuilt_after_miss(self) -> int:
+        return sum(miss.rebuilt_after for miss in self.stage_misses)
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(step.cached for step in self.steps)
+
+    @property
+    def total_s(self) -> float:
+        return sum(step.duration_s for step in self.steps)
+
+
+def analyze_cache(steps: list[BuildStep]) -> CacheReport:
+    """Find the first Dockerfile step that missed the cache in each stage.
+
+    Steps are numbered per stage, so a miss only invalidates the later steps
+    of its own stage; stages are reported in the order their first miss ran.
+    """
+    dockerfile_steps = tuple(step for step in steps if step.is_dockerfile_step)
+    by_stage: dict[str, list[BuildStep]] = {}
+    for step in dockerfile_steps:
+        by_stage.setdefault(step.stage, []).append(step)
+
+    misses: list[tuple[float, StageMiss]] = []
+    for stage, stage_steps in by_stage.items():
+        stage_steps.sort(key=lambda step: step.position)
+        first_index = next(
+            (index for index, step in enumerate(stage_steps) if not step.cached), None
+        )
+        if first_index is None:
+            continue
+        first = stage_steps[first_index]
+        rebuilt = sum(not step.cached for step in stage_steps[first_index + 1 :])
+        misses.append(
+            (
+                first.started if first.started is not None else float("inf"),
+                StageMiss(stage=stage, first_miss=first.name, rebuilt_after=rebuilt),
+            )
+        )
+    misses.sort(key=lambda item: item[0])
+    return CacheReport(
+        steps=dockerfile_steps,
+        stage_misses=tuple(miss for _, miss in misses),
+    )
+
+
+def format_step_line(step: BuildStep) -> str:
+    """Render a completed step for live output."""
+    from rich.markup import escape
+
+    name = escape(step.name)
+    if step.error:
+        return f"  [red]✗ {name}[/red] — {escape(step.error)}"
+    if step.cached:
+        return f"  [dim]● {name} (cached)[/dim]"
+    return f"  [green]✓[/green] {name} [dim]{step.duration_s:.1f}s[/dim]"
+
+
+def print_step_failures(parser: BuildProgressParser) -> None:
+    """Print the output tail of each failed BuildKit step."""
+    from rich.markup import escape
+
+    for step, lines in parser.failed_steps():
+        console.print(f"[red]✗ {escape(step.name)}[/red] — {escape(step.error or '')}")
+        for line in lines:
+            console.print(f"  {escape(line)}", highlight=False)
+
+
+def print_cache_report(service_name: str, report: CacheReport) -> None:
+    """Print a per-service table of Dockerfile steps and cache hits."""
+    if not report.steps:
+        return
+
+    from rich.markup import escape
+    from rich.table import Table
+
+    table = Table(title=f"Build cache: {service_name}", title_justify="left")
+    table.add_column("Step")
+    table.add_column("Cache")
+    table.add_column("Duration", justify="right")
+
+    first_misses = {miss.first_miss for miss in report.stage_misses}
+    for step in report.steps:
+        if step.cached:
+            cache_label = "[green]hit[/green]"
+        elif step.name in first_misses:
+            cache_label = "[red]miss[/red] [yellow](first)[/yellow]"
+        else:
+            cache_label = "[red]miss[/red]"
+        table.add_row(escape(step.name), cache_label, f"{step.duration_s:.1f}s")
+    console.print(table)
+
+    total = len(report.steps)
+    summary = f"{report.cache_hits}/{total} steps cached, {report.total_s:.1f}s in Dockerfile steps"
+    for miss in report.stage_misses:
+        summary += (
+            f"; {f'stage {miss.stage} ' if miss.stage else ''}first miss"
+            f" [yellow]{escape(miss.first_miss)}[/yellow] invalidated {miss.rebuilt_after} later step(s)"
+        )
+    console.print(summary)
+
+
+def record_build(
+    service_name: str,
+    arch: str,
+    report: CacheReport,
+    records_dir: Path = BUILD_RECORDS_DIR,
+) -> None:
+    """Append a build record for cache trend analysis."""
+    record = {
+        "ts": time.time(),
+        "service": service_name,
+        "arch": arch,
+        "first_miss": report.first_miss,
+        "stage_misses": [asdict(miss) for miss in report.stage_misses],
+        "cache_hits": report.cache_hits,
+        "steps_total": len(report.steps),
+        "steps": [
+            {**asdict(step), "duration_s": round(step.duration_s, 3)}
+            for step in report.steps
+        ],
+    }
+    try:
+        records_dir.mkdir(parents=True, exist_ok=True)
+        path = records_dir / f"{service_name}-{arch}.jsonl"
+        lines = path.read_text().splitlines() if path.exists() else []
+        lines.append(json.dumps(record, separators=(",", ":")))
+        path.write_text("\n".join(lines[-MAX_RECORDS_PER_SERVICE:]) + "\n")
+    except OSError:
+        pass
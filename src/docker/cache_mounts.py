@@ -0,0 +1,293 @@
+"""Managed BuildKit cache mounts: build args, Dockerfile checks, sizes, and pruning.
+
+Cache mounts live in the buildx builder's state, not in image layers, so they
+survive a lockfile change that invalidates the install step. Their sizes are
+read from `docker buildx du --verbose`, whose records describe a cache mount
+as `cached mount <target> from exec <cmd> with id "<id>"`.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.contracts.ports import CaptureCommandPort, RunCommandPort
+from src.core.domain.catalog import CacheMountSpec
+from src.core.runtime.shell import console
+from src.docker.image_size import MEGABYTE, format_megabytes
+
+CACHE_MOUNT_TYPE = "exec.cachemount"
+DOCKERFILE_NAME = "Dockerfile"
+MOUNT_ID_PATTERN = re.compile(r'with id "([^"]+)"')
+SIZE_PATTERN = re.compile(r"^([\d.]+)\s*([kKMGTP]?i?B)$")
+SIZE_UNITS: dict[str, int] = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "TB": 1000**4,
+    "PB": 1000**5,
+    "KIB": 1024,
+    "MIB": 1024**2,
+    "GIB": 1024**3,
+    "TIB": 1024**4,
+    "PIB": 1024**5,
+}
+
+
+@dataclass(frozen=True)
+class CacheRecord:
+    """One BuildKit cache record from `docker buildx du --verbose`."""
+
+    record_id: str
+    size_bytes: int
+    description: str
+    record_type: str
+    last_used: str = ""
+
+    @property
+    def mount_id(self) -> str | None:
+        """Return the cache mount id named in the description, if any."""
+        match = MOUNT_ID_PATTERN.search(self.description)
+        return match.group(1) if match else None
+
+
+@dataclass(frozen=True)
+class CacheUsage:
+    """Disk usage of one configured cache mount in the current builder."""
+
+    cache: CacheMountSpec
+    size_bytes: int
+    record_ids: tuple[str, ...]
+    last_used: str = ""
+
+    @property
+    def over_limit(self) -> bool:
+        return self.cache.max_mb is not None and self.size_bytes > self.cache.max_mb * MEGABYTE
+
+
+def cache_build_args(caches: tuple[CacheMountSpec, ...]) -> list[str]:
+    """Return the `--build-arg` flags that pass each cache's id and sharing mode."""
+    args: list[str] = []
+    for cache in caches:
+        args += [
+            "--build-arg",
+            f"{cache.build_arg_prefix}_ID={cache.id}",
+            "--build-arg",
+            f"{cache.build_arg_prefix}_SHARING={cache.sharing}",
+        ]
+    return args
+
+
+def dockerfile_snippet(cache: CacheMountSpec) -> str:
+    """Return the Dockerfile lines that mount a configured cache."""
+    prefix = cache.build_arg_prefix
+    return (
+        f"ARG {prefix}_ID={cache.id}\n"
+        f"ARG {prefix}_SHARING={cache.sharing}\n"
+        f"RUN --mount=type=cache,id=${{{prefix}_ID}},target={cache.target},"
+        f"sharing=${{{prefix}_SHARING}} <install command>"
+    )
+
+
+def unmounted_caches(
+    context_path: Path,
+    caches: tuple[CacheMountSpec, ...],
+) -> list[CacheMountSpec]:
+    """Return configured caches that the context's Dockerfile never mounts.
+
+    A cache counts as mounted when the Dockerfile references its id build
+    arg or its literal id; an unreadable Dockerfile is left to BuildKit.
+    """
+    if not caches:
+        return []
+    try:
+        dockerfile = (context_path / DOCKERFILE_NAME).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+    if "type=cache" not in dockerfile:
+        return list(caches)
+    return [
+        cache
+        for cache in caches
+        if f"{cache.build_arg_prefix}_ID" not in dockerfile and f"id={cache.id}" not in dockerfile
+    ]
+
+
+def warn_unmounted_caches(
+    service_name: str,
+    context_path: Path,
+    caches: tuple[CacheMountSpec, ...],
+) -> None:
+    """Warn, with a snippet to paste, about caches the Dockerfile does not use."""
+    from rich.markup import escape
+
+    for cache in unmounted_caches(context_path, caches):
+        console.print(
+            f"[yellow]⚠️  {service_name}: cache '{cache.name}' is configured but"
+            f" {context_path / DOCKERFILE_NAME} never mounts it:[/yellow]\n"
+            f"[dim]{escape(dockerfile_snippet(cache))}[/dim]",
+            soft_wrap=True,
+        )
+
+
+def parse_size(text: str) -> int | None:
+    """Parse a human-readable size such as `27.11MB` or `512B`."""
+    match = SIZE_PATTERN.match(text.strip())
+    if match is None:
+        return None
+    unit = SIZE_UNITS.get(match.group(2).upper())
+    return int(float(match.group(1)) * unit) if unit else None
+
+
+def parse_du_records(output: str) -> list[CacheRecord]:
+    """Parse `docker buildx du --verbose` into records.
+
+    Records are blocks of `Key: value` lines separated by blank lines; the
+    trailing `Reclaimable:`/`Total:` summary has no `ID` and is skipped.
+    """
+    records: list[CacheRecord] = []
+    for block in re.split(r"\n\s*\n", output):
+        fields: dict[str, str] = {}
+        for line in block.splitlines():
+            key, separator, value = line.partition(":")
+            if separator:
+                fields[key.strip()] = value.strip()
+        if "ID" not in fields:
+            continue
+        records.append(
+            CacheRecord(
+                record_id=fields["ID"],
+                size_bytes=parse_size(fields.get("Size", "")) or 0,
+                description=fields.get("Description", ""),
+                record_type=fields.get("Type", ""),
+                last_used=fields.get("Last used", ""),
+            )
+        )
+    return records
+
+
+def read_cache_mounts(
+    capture_command: CaptureCommandPort,
+) -> dict[str, list[CacheRecord]] | None:
+    """Group the builder's cache mount records by mount id; None when buildx cannot say."""
+    output = capture_command(["docker", "buildx", "du", "--verbose"])
+    if output is None:
+        return None
+
+    by_id: dict[str, list[CacheRecord]] = {}
+    for record in parse_du_records(output):
+        mount_id = record.mount_id
+        if record.record_type == CACHE_MOUNT_TYPE and mount_id is not None:
+            by_id.setdefault(mount_id, []).append(record)
+    return by_id
+
+
+def measure_caches(
+    records_by_id: dict[str, list[CacheRecord]],
+    caches: tuple[CacheMountSpec, ...],
+) -> list[CacheUsage]:
+    """Match configured caches to their records."""
+    usage: list[CacheUsage] = []
+    for cache in caches:
+        records = records_by_id.get(cache.id, [])
+        usage.append(
+            CacheUsage(
+                cache=cache,
+                size_bytes=sum(record.size_bytes for record in records),
+                record_ids=tuple(record.record_id for record in records),
+                last_used=records[0].last_used if records else "",
+            )
+        )
+    return usage
+
+
+def collect_cache_usage(
+    capture_command: CaptureCommandPort,
+    caches: tuple[CacheMountSpec, ...],
+) -> list[CacheUsage] | None:
+    """Measure one service's caches; None when it has none or buildx cannot say."""
+    if not caches:
+        return None
+    records_by_id = read_cache_mounts(capture_command)
+    return measure_caches(records_by_id, caches) if records_by_id is not None else None
+
+
+def clear_cache(run_command: RunCommandPort, usage: CacheUsage) -> None:
+    """Delete one cache mount's records from the builder.
+
+    Records still mounted by a running build are kept by BuildKit.
+    """
+    for record_id in usage.record_ids:
+        run_command(
+            ["docker", "buildx", "prune", "--force", "--filter", f"id={record_id}"],
+            f"Clearing BuildKit cache '{usage.cache.name}' ({usage.cache.id})",
+        )
+
+
+def clear_service_caches(
+    run_command: RunCommandPort,
+    service_name: str,
+    usage: list[CacheUsage],
+) -> None:
+    """Clear every cache mount one service declares."""
+    if not usage:
+        console.print(f"[dim]{service_name} declares no cache mounts[/dim]")
+    for item in usage:
+        if item.record_ids:
+            clear_cache(run_command, item)
+        else:
+            console.print(f"[dim]{service_name}: cache '{item.cache.name}' is already empty[/dim]")
+
+
+def enforce_cache_limits(run_command: RunCommandPort, usage: list[CacheUsage]) -> None:
+    """Prune caches that grew past `max_mb`; the next build starts them cold."""
+    for item in usage:
+        if not item.over_limit:
+            continue
+        console.print(
+            f"[yellow]⚠️  Cache '{item.cache.name}' ({item.cache.id}) is"
+            f" {format_megabytes(item.size_bytes)}, over its {item.cache.max_mb:g} MB limit;"
+            " clearing it[/yellow]"
+        )
+        clear_cache(run_command, item)
+
+
+def format_cache_usage(usage: list[CacheUsage]) -> str:
+    """One-line summary of cache sizes, e.g. `composer 312.4 MB, npm 88.0 MB`."""
+    return ", ".join(
+        f"{item.cache.name} {format_megabytes(item.size_bytes)}"
+        + (f"/{item.cache.max_mb:g} MB" if item.cache.max_mb is not None else "")
+        for item in usage
+    )
+
+
+def print_cache_table(usage_by_service: dict[str, list[CacheUsage] | None]) -> None:
+    """Print configured cache mounts with their size, limit, and last use."""
+    from rich.table import Table
+
+    table = Table(title="BuildKit cache mounts", title_justify="left")
+    table.add_column("Service")
+    table.add_column("Cache")
+    table.add_column("ID")
+    table.add_column("Target")
+    table.add_column("Sharing")
+    table.add_column("Size", justify="right")
+    table.add_column("Limit", justify="right")
+    table.add_column("Last used")
+    for service_name, usage in usage_by_service.items():
+        if usage is None:
+            table.add_row(service_name, "-", "-", "-", "-", "unknown", "-", "buildx du failed")
+            continue
+        for item in usage:
+            cache = item.cache
+            table.add_row(
+                service_name,
+                cache.name,
+                cache.id,
+                cache.target,
+                cache.sharing,
+                format_megabytes(item.size_bytes) if item.record_ids else "empty",
+                f"{cache.max_mb:g} MB" if cache.max_mb is not None else "-",
+                item.last_used or "-",
+            )
+    console.print(table)
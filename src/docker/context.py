@@ -0,0 +1,193 @@
+"""Build context traversal honoring `.dockerignore` rules."""
+
+import os
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+DOCKERIGNORE_FILE = ".dockerignore"
+
+
+@dataclass(frozen=True)
+class IgnorePattern:
+    """Single compiled `.dockerignore` rule."""
+
+    source: str
+    regex: re.Pattern[str]
+    negated: bool
+
+
+@dataclass(frozen=True)
+class ContextEntry:
+    """File kept in the build context after ignore rules are applied."""
+
+    rel_path: str
+    size: int
+    mtime_ns: int
+
+
+def _translate_pattern(pattern: str) -> str:
+    """Translate a Docker ignore glob into an anchored regular expression."""
+    parts: list[str] = []
+    segments = pattern.split("/")
+    for index, segment in enumerate(segments):
+        is_last = index == len(segments) - 1
+        if segment == "**":
+            parts.append("(?:.*)" if is_last else "(?:.*/)?")
+            continue
+
+        i = 0
+        while i < len(segment):
+            char = segment[i]
+            if char == "*":
+                parts.append("[^/]*")
+            elif char == "?":
+                parts.append("[^/]")
+            elif char == "[":
+                end = segment.find("]", i + 1)
+                if end == -1:
+                    parts.append(re.escape(char))
+                else:
+                    body = segment[i + 1 : end]
+                    if body.startswith(("!", "^")):
+                        body = "^" + body[1:]
+                    parts.append(f"[{body}]")
+                    i = end
+            elif char == "\\" and i + 1 < len(segment):
+                i += 1
+                parts.append(re.escape(segment[i]))
+            else:
+                parts.append(re.escape(char))
+            i += 1
+
+        if not is_last:
+            parts.append("/")
+
+    return "^" + "".join(parts) + "$"
+
+
+def parse_dockerignore(lines: list[str]) -> tuple[IgnorePattern, ...]:
+    """Compile `.dockerignore` lines into ordered ignore patterns."""
+    patterns: list[IgnorePattern] = []
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:].strip()
+
+        cleaned = os.path.normpath(line).replace(os.sep, "/").strip("/")
+        if cleaned in ("", "."):
+            continue
+
+        patterns.append(
+            IgnorePattern(
+                source=raw_line.strip(),
+                regex=re.compile(_translate_pattern(cleaned)),
+                negated=negated,
+            )
+        )
+    return tuple(patterns)
+
+
+def load_dockerignore(context_path: Path) -> tuple[IgnorePattern, ...]:
+    """Load ignore patterns for a build context, if any are defined."""
+    ignore_file = context_path / DOCKERIGNORE_FILE
+    if not ignore_file.is_file():
+        return ()
+    return parse_dockerignore(ignore_file.read_text().splitlines())
+
+
+class IgnoreMatcher:
+    """Evaluate Docker's "last matching rule wins" semantics.
+
+    A rule matches a path when it matches the path itself or any of its parent
+    directories, so match state is inherited from parents while walking.
+    """
+
+    def __init__(self, patterns: tuple[IgnorePattern, ...]) -> None:
+        self.patterns = patterns
+        self.has_negations = any(pattern.negated for pattern in patterns)
+
+    def match_state(self, rel_path: str, parent_state: tuple[bool, ...]) -> tuple[bool, ...]:
+        """Return per-pattern match flags for a path given its parent flags."""
+        return tuple(
+            inherited or pattern.regex.match(rel_path) is not None
+            for pattern, inherited in zip(self.patterns, parent_state)
+        )
+
+    def root_state(self) -> tuple[bool, ...]:
+        """Return the match flags for the context root."""
+        return (False,) * len(self.patterns)
+
+    @staticmethod
+    def is_ignored_state(patterns: tuple[IgnorePattern, ...], state: tuple[bool, ...]) -> bool:
+        """Resolve match flags to an ignore decision."""
+        for pattern, matched in zip(reversed(patterns), reversed(state)):
+            if matched:
+                return not pattern.negated
+        return False
+
+    def is_ignored(self, rel_path: str) -> bool:
+        """Check a single context-relative path against the rules."""
+        state = self.root_state()
+        parts = rel_path.strip("/").split("/")
+        for depth in range(1, len(parts) + 1):
+            state = self.match_state("/".join(parts[:depth]), state)
+        return self.is_ignored_state(self.patterns, state)
+
+
+def iter_context_files(
+    context_path: Path,
+    matcher: IgnoreMatcher | None = None,
+    on_directory: Callable[[str], None] | None = None,
+) -> Iterator[ContextEntry]:
+    """Yield files that would be sent to BuildKit for a context directory.
+
+    Ignored directories are pruned without descending into them unless a
+    negated rule could re-include something underneath. `on_directory`
+    receives the absolute path of every directory that is descended into.
+    """
+    if matcher is None:
+        matcher = IgnoreMatcher(load_dockerignore(context_path))
+
+    patterns = matcher.patterns
+    stack: list[tuple[str, str, tuple[bool, ...]]] = [
+        (str(context_path), "", matcher.root_state())
+    ]
+
+    while stack:
+        directory, rel_dir, dir_state = stack.pop()
+        if on_directory is not None:
+            on_directory(directory)
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                state = matcher.match_state(rel_path, dir_state)
+                ignored = matcher.is_ignored_state(patterns, state)
+
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if ignored and not matcher.has_negations:
+                            continue
+                        stack.append((entry.path, rel_path, state))
+                        continue
+                    if ignored:
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                yield ContextEntry(
+                    rel_path=rel_path,
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                )
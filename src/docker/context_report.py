@@ -0,0 +1,333 @@
+"""Build context size analysis, context budgets, and `.dockerignore` suggestions.
+
+One pass over `iter_context_files` collects per-directory byte counts; they are
+rolled up to every ancestor afterwards, one depth level at a time, so the cost
+stays one dictionary update per file even on very large contexts.
+"""
+
+import heapq
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.domain.catalog import ImageBudget
+from src.core.runtime.shell import console, fail
+from src.docker.context import IgnoreMatcher, iter_context_files, load_dockerignore
+from src.docker.image_size import MEGABYTE, format_megabytes
+
+DEFAULT_CONTEXT_WARN_MB = 500.0
+DEFAULT_TOP_PATHS = 8
+# A directory is reported as its child instead when that child holds this share
+DOMINANT_CHILD_SHARE = 0.8
+MIN_SUFFIX_SUGGESTION_BYTES = MEGABYTE
+
+# Directories that are almost never needed inside an image build, keyed by
+# name (matched at any depth) or by context-relative path.
+JUNK_DIRECTORY_RULES: dict[str, str] = {
+    ".git": ".git",
+    ".hg": ".hg",
+    ".svn": ".svn",
+    ".idea": "**/.idea",
+    ".vscode": "**/.vscode",
+    "node_modules": "**/node_modules",
+    "__pycache__": "**/__pycache__",
+    ".pytest_cache": "**/.pytest_cache",
+    ".mypy_cache": "**/.mypy_cache",
+    ".cache": "**/.cache",
+    "coverage": "**/coverage",
+    ".next": "**/.next",
+    ".nuxt": "**/.nuxt",
+}
+JUNK_PATH_RULES: dict[str, str] = {
+    "storage/logs": "storage/logs",
+    "storage/framework/cache": "storage/framework/cache",
+    "storage/framework/sessions": "storage/framework/sessions",
+    "storage/framework/views": "storage/framework/views",
+    "storage/debugbar": "storage/debugbar",
+}
+JUNK_SUFFIXES: tuple[str, ...] = (
+    ".sql.gz",
+    ".sql",
+    ".dump",
+    ".log",
+    ".tar.gz",
+    ".tgz",
+    ".tar",
+    ".zip",
+    ".bak",
+    ".swp",
+)
+
+
+@dataclass(frozen=True)
+class PathSize:
+    """Bytes and file count under one context-relative path."""
+
+    path: str
+    bytes: int
+    files: int
+    is_dir: bool = True
+
+
+@dataclass(frozen=True)
+class IgnoreSuggestion:
+    """A `.dockerignore` rule and what it would remove from the context."""
+
+    rule: str
+    bytes: int
+    files: int
+
+
+@dataclass(frozen=True)
+class ContextAnalysis:
+    """Effective size of one build context after `.dockerignore` is applied."""
+
+    context_path: Path
+    total_bytes: int
+    file_count: int
+    largest: tuple[PathSize, ...]
+    suggestions: tuple[IgnoreSuggestion, ...]
+    has_dockerignore: bool
+    elapsed_s: float
+
+
+def get_context_warn_mb() -> float:
+    """Read the context size above which services without a limit get a warning."""
+    raw_value = os.getenv("CONTEXT_WARN_MB", "")
+    try:
+        value = float(raw_value) if raw_value else DEFAULT_CONTEXT_WARN_MB
+    except ValueError:
+        return DEFAULT_CONTEXT_WARN_MB
+    return value if value >= 0 else DEFAULT_CONTEXT_WARN_MB
+
+
+def _parent(rel_path: str) -> str:
+    return rel_path.rpartition("/")[0]
+
+
+def _roll_up(direct: dict[str, list[int]]) -> dict[str, list[int]]:
+    """Add every directory's totals to its ancestors, deepest level first."""
+    totals = {path: list(counts) for path, counts in direct.items()}
+    by_depth: dict[int, set[str]] = defaultdict(set)
+    for path in totals:
+        if path:
+            by_depth[path.count("/") + 1].add(path)
+
+    for depth in range(max(by_depth, default=0), 0, -1):
+        for path in by_depth[depth]:
+            parent = _parent(path)
+            if parent not in totals:
+                totals[parent] = [0, 0]
+                if parent:
+                    by_depth[depth - 1].add(parent)
+            totals[parent][0] += totals[path][0]
+            totals[parent][1] += totals[path][1]
+    return totals
+
+
+def _largest_paths(
+    totals: dict[str, list[int]],
+    top_files: list[tuple[int, str]],
+    limit: int,
+) -> tuple[PathSize, ...]:
+    """Pick the biggest non-overlapping paths, preferring a dominant child over its parent."""
+    dominant: set[str] = set()
+    for path, (size, _) in totals.items():
+        if path and size >= DOMINANT_CHILD_SHARE * totals[_parent(path)][0]:
+            dominant.add(_parent(path))
+    for size, path in top_files:
+        if size >= DOMINANT_CHILD_SHARE * totals[_parent(path)][0]:
+            dominant.add(_parent(path))
+
+    candidates = [
+        PathSize(path=path, bytes=size, files=files)
+        for path, (size, files) in totals.items()
+        if path and path not in dominant
+    ]
+    candidates.extend(
+        PathSize(path=path, bytes=size, files=1, is_dir=False) for size, path in top_files
+    )
+    candidates.sort(key=lambda item: item.bytes, reverse=True)
+
+    picked: list[PathSize] = []
+    for candidate in candidates:
+        if len(picked) == limit or candidate.bytes == 0:
+            break
+        if any(
+            candidate.path.startswith(f"{other.path}/")
+            or other.path.startswith(f"{candidate.path}/")
+            for other in picked
+        ):
+            continue
+        picked.append(candidate)
+    return tuple(picked)
+
+
+def _suggest_rules(
+    totals: dict[str, list[int]],
+    suffix_totals: dict[str, list[int]],
+    matcher: IgnoreMatcher,
+) -> tuple[IgnoreSuggestion, ...]:
+    """Suggest rules for junk that is still in the context, biggest saving first."""
+    by_rule: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    matched_dirs: list[str] = []
+    # Shallow paths first, so nested junk is counted once under its outermost match
+    for path in sorted(totals, key=lambda item: item.count("/")):
+        if not path:
+            continue
+        rule = JUNK_PATH_RULES.get(path) or JUNK_DIRECTORY_RULES.get(path.rpartition("/")[2])
+        if rule is None or any(path.startswith(f"{other}/") for other in matched_dirs):
+            continue
+        matched_dirs.append(path)
+        by_rule[rule][0] += totals[path][0]
+        by_rule[rule][1] += totals[path][1]
+
+    for suffix, (size, files) in suffix_totals.items():
+        if size >= MIN_SUFFIX_SUGGESTION_BYTES:
+            by_rule[f"**/*{suffix}"] = [size, files]
+
+    existing = {pattern.source for pattern in matcher.patterns}
+    suggestions = [
+        IgnoreSuggestion(rule=rule, bytes=size, files=files)
+        for rule, (size, files) in by_rule.items()
+        if rule not in existing
+    ]
+    return tuple(sorted(suggestions, key=lambda item: item.bytes, reverse=True))
+
+
+def analyze_context(context_path: Path, top: int = DEFAULT_TOP_PATHS) -> ContextAnalysis:
+    """Measure what BuildKit would upload for a context directory."""
+    started = time.monotonic()
+    patterns = load_dockerignore(context_path)
+    matcher = IgnoreMatcher(patterns)
+
+    direct: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    suffix_totals: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    top_files: list[tuple[int, str]] = []
+    total_bytes = 0
+    file_count = 0
+
+    for entry in iter_context_files(context_path, matcher):
+        size = entry.size
+        total_bytes += size
+        file_count += 1
+        counts = direct[_parent(entry.rel_path)]
+        counts[0] += size
+        counts[1] += 1
+
+        if len(top_files) < top:
+            heapq.heappush(top_files, (size, entry.rel_path))
+        elif size > top_files[0][0]:
+            heapq.heapreplace(top_files, (size, entry.rel_path))
+
+        if entry.rel_path.endswith(JUNK_SUFFIXES):
+            suffix = next(suffix for suffix in JUNK_SUFFIXES if entry.rel_path.endswith(suffix))
+            suffix_counts = suffix_totals[suffix]
+            suffix_counts[0] += size
+            suffix_counts[1] += 1
+
+    totals = _roll_up(direct)
+    return ContextAnalysis(
+        context_path=context_path,
+        total_bytes=total_bytes,
+        file_count=file_count,
+        largest=_largest_paths(totals, top_files, top),
+        suggestions=_suggest_rules(totals, suffix_totals, matcher),
+        has_dockerignore=bool(patterns),
+        elapsed_s=time.monotonic() - started,
+    )
+
+
+def format_context_summary(analysis: ContextAnalysis) -> str:
+    """One-line size summary of a context."""
+    return (
+        f"{format_megabytes(analysis.total_bytes)} in {analysis.file_count:,} file(s)"
+        f" (scanned in {analysis.elapsed_s:.1f}s)"
+    )
+
+
+def format_largest_paths(analysis: ContextAnalysis) -> str:
+    """Indented list of the biggest paths in a context, escaped for rich."""
+    from rich.markup import escape
+
+    return "\n".join(
+        f"  - {escape(item.path)}{'/' if item.is_dir else ''}: {format_megabytes(item.bytes)}"
+        + (f" in {item.files:,} file(s)" if item.is_dir else "")
+        for item in analysis.largest
+    )
+
+
+def enforce_context_budget(
+    service_name: str,
+    analysis: ContextAnalysis,
+    budget: ImageBudget | None,
+) -> None:
+    """Warn about or fail on an oversized build context.
+
+    Services with `budget.max_context_mb` use their own limit and `on_exceed`;
+    every other service is warned above `CONTEXT_WARN_MB` (`0` disables that).
+    """
+    if budget is not None and budget.max_context_mb is not None:
+        limit_mb, action = budget.max_context_mb, budget.on_exceed
+    else:
+        limit_mb, action = get_context_warn_mb(), "warn"
+    if not limit_mb or analysis.total_bytes <= limit_mb * MEGABYTE:
+        return
+
+    detail = (
+        f"  build context {format_megabytes(analysis.total_bytes)} exceeds {limit_mb:g} MB\n"
+        f"{format_largest_paths(analysis)}"
+    )
+    if analysis.suggestions:
+        detail += f"\n  Run `main.py analyze {service_name}` for .dockerignore suggestions."
+    if action == "fail":
+        fail(f"Build context budget exceeded for {service_name}", detail)
+    console.print(
+        f"[bold yellow]⚠️  Build context budget exceeded for {service_name}[/bold yellow]\n{detail}"
+    )
+
+
+def print_context_analysis(service_name: str, analysis: ContextAnalysis) -> None:
+    """Print the full `analyze` report for one service."""
+    from rich.markup import escape
+    from rich.table import Table
+
+    console.print(
+        f"\n[bold]📁 {service_name}[/bold] ({analysis.context_path}): "
+        f"{format_context_summary(analysis)}"
+    )
+    if not analysis.has_dockerignore:
+        console.print("[yellow]No .dockerignore rules; the whole directory is uploaded.[/yellow]")
+
+    if analysis.largest:
+        table = Table(title="Largest paths", title_justify="left")
+        table.add_column("Path")
+        table.add_column("Size", justify="right")
+        table.add_column("Files", justify="right")
+        table.add_column("Share", justify="right")
+        for item in analysis.largest:
+            table.add_row(
+                escape(f"{item.path}/" if item.is_dir else item.path),
+                format_megabytes(item.bytes),
+                f"{item.files:,}",
+                f"{item.bytes / analysis.total_bytes:.0%}" if analysis.total_bytes else "-",
+            )
+        console.print(table)
+
+    if not analysis.suggestions:
+        console.print("[green]No ignore suggestions.[/green]")
+        return
+
+    saved = sum(suggestion.bytes for suggestion in analysis.suggestions)
+    console.print(
+        f"Suggested {analysis.context_path / '.dockerignore'} additions "
+        f"(up to {format_megabytes(min(saved, analysis.total_bytes))} less to upload):"
+    )
+    for suggestion in analysis.suggestions:
+        console.print(
+            f"  {suggestion.rule:<32} [dim]# {format_megabytes(suggestion.bytes)},"
+            f" {suggestion.files:,} file(s)[/dim]",
+            highlight=False,
+        )
@@ -0,0 +1,303 @@
+"""Image size and pushed-layer delta analysis with per-service budgets."""
+
+import json
+from dataclasses import dataclass
+
+from src.core.contracts.ports import CaptureCommandPort
+from src.core.domain.catalog import ImageBudget
+from src.core.runtime.shell import console, fail
+
+MEGABYTE = 1_000_000
+INDEX_MEDIA_TYPES = frozenset(
+    {
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+    }
+)
+
+
+@dataclass(frozen=True)
+class LayerManifest:
+    """Compressed layer digests and sizes of one platform manifest."""
+
+    digests: tuple[str, ...]
+    sizes: tuple[int, ...]
+
+    @property
+    def compressed_bytes(self) -> int:
+        return sum(self.sizes)
+
+
+@dataclass(frozen=True)
+class PushDelta:
+    """Local layers that the registry's current tag does not have yet."""
+
+    new_bytes: int
+    new_layers: int
+    total_layers: int
+
+
+@dataclass(frozen=True)
+class ImageSizeReport:
+    """Size figures for one built image; push figures are None when not pushed."""
+
+    image_bytes: int | None
+    compressed_bytes: int | None = None
+    new_bytes: int | None = None
+    new_layers: int | None = None
+    total_layers: int | None = None
+
+
+def format_megabytes(size_bytes: int | None) -> str:
+    """Render a byte count as decimal megabytes."""
+    if size_bytes is None:
+        return "unknown"
+    return f"{size_bytes / MEGABYTE:.1f} MB"
+
+
+def inspect_image_bytes(capture_command: CaptureCommandPort, image_name: str) -> int | None:
+    """Return the uncompressed size of a local image."""
+    output = capture_command(["docker", "image", "inspect", "--format", "{{.Size}}", image_name])
+    if output is None or not output.strip().isdigit():
+        return None
+    return int(output.strip())
+
+
+def _platform_matches(candidate: dict, platform: str) -> bool:
+    wanted_os, wanted_arch, *wanted_variant = platform.split("/")
+    if candidate.get("os") != wanted_os or candidate.get("architecture") != wanted_arch:
+        return False
+    variant = candidate.get("variant")
+    return not (wanted_variant and variant) or variant == wanted_variant[0]
+
+
+def _fetch_raw_manifest(capture_command: CaptureCommandPort, reference: str) -> dict | None:
+    output = capture_command(["docker", "buildx", "imagetools", "inspect", "--raw", reference])
+    if output is None:
+        return None
+    try:
+        manifest = json.loads(output)
+    except ValueError:
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def fetch_layer_manifest(
+    capture_command: CaptureCommandPort,
+    image_name: str,
+    platform: str,
+) -> LayerManifest | None:
+    """Read the pushed manifest of `image_name` for one platform from the registry.
+
+    Returns:
+        The platform's layers, or None when the tag does not exist yet or the
+        registry cannot be queried
+    """
+    manifest = _fetch_raw_manifest(capture_command, image_name)
+    if manifest is None:
+        return None
+
+    if manifest.get("mediaType") in INDEX_MEDIA_TYPES or "manifests" in manifest:
+        repository = image_name.rsplit(":", 1)[0]
+        digest = next(
+            (
+                entry.get("digest")
+                for entry in manifest.get("manifests", [])
+                if _platform_matches(entry.get("platform") or {}, platform)
+            ),
+            None,
+        )
+        if digest is None:
+            return None
+        manifest = _fetch_raw_manifest(capture_command, f"{repository}@{digest}")
+        if manifest is None:
+            return None
+
+    layers = [layer for layer in manifest.get("layers", []) if isinstance(layer, dict)]
+    return LayerManifest(
+        digests=tuple(layer.get("digest", "") for layer in layers),
+        sizes=tuple(int(layer.get("size", 0)) for layer in layers),
+    )
+
+
+def _platform_config(images: dict, platform: str) -> dict | None:
+    """Pick one platform's image config from `imagetools inspect` `.Image` output."""
+    if "rootfs" in images:
+        return images
+    for key, config in images.items():
+        os_name, _, rest = key.partition("/")
+        arch, _, variant = rest.partition("/")
+        candidate = {"os": os_name, "architecture": arch, "variant": variant or None}
+        if isinstance(config, dict) and _platform_matches(candidate, platform):
+            return config
+    return None
+
+
+def fetch_registry_diff_ids(
+    capture_command: CaptureCommandPort,
+    image_name: str,
+    platform: str,
+) -> tuple[str, ...] | None:
+    """Read the uncompressed layer digests of the tag currently in the registry.
+
+    Returns:
+        The platform's `rootfs.diff_ids`, or None when the tag does not exist
+        yet or the registry cannot be queried
+    """
+    output = capture_command(
+        ["docker", "buildx", "imagetools", "inspect", "--format", "{{json .Image}}", image_name]
+    )
+    if output is None:
+        return None
+    try:
+        images = json.loads(output)
+    except ValueError:
+        return None
+    config = _platform_config(images, platform) if isinstance(images, dict) else None
+    diff_ids = (config or {}).get("rootfs", {}).get("diff_ids")
+    return tuple(diff_ids) if isinstance(diff_ids, list) else None
+
+
+def _local_layers(
+    capture_command: CaptureCommandPort,
+    image_name: str,
+) -> tuple[list[str], list[int]] | None:
+    """Return a local image's diff IDs and the sizes of its non-zero history entries.
+
+    Both lists run oldest first. `docker history` does not say which entries
+    are empty, so only entries with a size can be matched to layers.
+    """
+    layers_output = capture_command(
+        ["docker", "image", "inspect", "--format", "{{json .RootFS.Layers}}", image_name]
+    )
+    history_output = capture_command(
+        ["docker", "history", "--no-trunc", "--human=false", "--format", "{{.Size}}", image_name]
+    )
+    if layers_output is None or history_output is None:
+        return None
+    try:
+        diff_ids = json.loads(layers_output)
+    except ValueError:
+        return None
+    sizes = [int(line) for line in reversed(history_output.split()) if line.isdigit()]
+    if not isinstance(diff_ids, list):
+        return None
+    return diff_ids, [size for size in sizes if size > 0]
+
+
+def estimate_push_delta(
+    capture_command: CaptureCommandPort,
+    image_name: str,
+    platform: str,
+) -> PushDelta | None:
+    """Measure the local layers a push would add to the registry's current tag.
+
+    Sizes are uncompressed, so they bound the upload from above. When some
+    layers are empty and sizes cannot be matched one to one, every sized
+    history entry from the lowest new layer up is counted.
+
+    Returns:
+        The delta, or None when there is no previous tag to compare with
+    """
+    previous = fetch_registry_diff_ids(capture_command, image_name, platform)
+    if previous is None:
+        return None
+    local = _local_layers(capture_command, image_name)
+    if local is None:
+        return None
+    diff_ids, sizes = local
+
+    known = set(previous)
+    new_indexes = [index for index, diff_id in enumerate(diff_ids) if diff_id not in known]
+    if not new_indexes:
+        new_bytes = 0
+    elif len(sizes) == len(diff_ids):
+        new_bytes = sum(sizes[index] for index in new_indexes)
+    else:
+        unsized_layers = len(diff_ids) - len(sizes)
+        new_bytes = sum(sizes[max(new_indexes[0] - unsized_layers, 0) :])
+    return PushDelta(
+        new_bytes=new_bytes, new_layers=len(new_indexes), total_layers=len(diff_ids)
+    )
+
+
+def enforce_push_delta(
+    service_name: str,
+    delta: PushDelta | None,
+    budget: ImageBudget | None,
+) -> None:
+    """Check `max_push_delta_mb` before pushing; skipped without a previous tag."""
+    if budget is None or budget.max_push_delta_mb is None:
+        return
+    if delta is None:
+        console.print(
+            f"[dim]{service_name}: no previous tag to compare with; push delta budget skipped[/dim]"
+        )
+        return
+    enforce_budget(
+        service_name, ImageSizeReport(image_bytes=None, new_bytes=delta.new_bytes), budget
+    )
+
+
+def compare_layers(
+    image_bytes: int | None,
+    previous: LayerManifest | None,
+    current: LayerManifest | None,
+) -> ImageSizeReport:
+    """Summarize which pushed layers are new compared with the previous tag."""
+    if current is None:
+        return ImageSizeReport(image_bytes=image_bytes)
+
+    known = set(previous.digests) if previous else set()
+    new_sizes = [
+        size for digest, size in zip(current.digests, current.sizes) if digest not in known
+    ]
+    return ImageSizeReport(
+        image_bytes=image_bytes,
+        compressed_bytes=current.compressed_bytes,
+        new_bytes=sum(new_sizes),
+        new_layers=len(new_sizes),
+        total_layers=len(current.digests),
+    )
+
+
+def budget_violations(report: ImageSizeReport, budget: ImageBudget | None) -> list[str]:
+    """Return human-readable descriptions of exceeded budget limits."""
+    if budget is None:
+        return []
+
+    violations: list[str] = []
+    limits = (
+        ("image size", report.image_bytes, budget.max_image_mb),
+        ("new layers to push", report.new_bytes, budget.max_push_delta_mb),
+    )
+    for label, actual, limit_mb in limits:
+        if actual is not None and limit_mb is not None and actual > limit_mb * MEGABYTE:
+            violations.append(
+                f"{label} {format_megabytes(actual)} exceeds budget of {limit_mb:g} MB"
+            )
+    return violations
+
+
+def enforce_budget(service_name: str, report: ImageSizeReport, budget: ImageBudget | None) -> None:
+    """Warn about or fail on exceeded budgets, as configured per service."""
+    violations = budget_violations(report, budget)
+    if not violations:
+        return
+
+    detail = "\n".join(f"  - {violation}" for violation in violations)
+    if budget is not None and budget.on_exceed == "fail":
+        fail(f"Image budget exceeded for {service_name}", detail)
+    console.print(f"[bold yellow]⚠️  Image budget exceeded for {service_name}[/bold yellow]\n{detail}")
+
+
+def print_image_report(service_name: str, report: ImageSizeReport) -> None:
+    """Print the size summary for one service image."""
+    summary = f"📦 {service_name}: {format_megabytes(report.image_bytes)} uncompressed"
+    if report.compressed_bytes is not None:
+        summary += (
+            f", {format_megabytes(report.compressed_bytes)} compressed"
+            f", {format_megabytes(report.new_bytes)} new in"
+            f" {report.new_layers}/{report.total_layers} layers"
+        )
+    console.print(summary)
@@ -1,10 +1,10 @@
 """Thin PySide6 wrapper around the existing non-interactive CLI flow."""
 
 import sys
+import time
 from pathlib import Path
 
-from PySide6.QtCore import QProcess, Qt
-from PySide6.QtGui import QTextCursor
+from PySide6.QtCore import QProcess, QProcessEnvironment, Qt
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QApplication,
@@ -19,14 +19,19 @@ from PySide6.QtWidgets import (
     QMainWindow,
     QMessageBox,
     QPushButton,
-    QPlainTextEdit,
     QSizePolicy,
     QVBoxLayout,
     QWidget,
 )
 
-from src.core.config import PROJECT_ROOT, get_services_config
+from src.core.config import CACHE_DIR, PROJECT_ROOT, get_service_names
 from src.core.domain.choices import OPERATION_CHOICES, PLATFORM_CHOICES
+from src.core.runtime.events import EVENTS_PATH_ENV
+from src.core.runtime.shell import OUTPUT_TAGS_ENV
+from src.gui.log_view import LogView, prune_spill_files
+from src.gui.progress import ProgressTable
+
+EVENTS_DIR = CACHE_DIR / "gui-events"
 
 
 def get_venv_python() -> Path:
@@ -51,6 +56,7 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(root)
         layout.addWidget(self._build_form_group())
         layout.addWidget(self._build_actions_row())
+        layout.addWidget(self._build_progress_group())
         layout.addWidget(self._build_output_group(), stretch=1)
 
         self._refresh_services()
@@ -116,23 +122,30 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.command_preview, stretch=1)
         return row
 
+    def _build_progress_group(self) -> QGroupBox:
+        group = QGroupBox("Progress")
+        layout = QVBoxLayout(group)
+
+        self.progress_table = ProgressTable()
+        self.progress_table.setMaximumHeight(220)
+
+        layout.addWidget(self.progress_table)
+        return group
+
     def _build_output_group(self) -> QGroupBox:
         group = QGroupBox("Output")
         layout = QVBoxLayout(group)
 
-        self.output = QPlainTextEdit()
-        self.output.setReadOnly(True)
-        self.output.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.log_view = LogView()
 
-        layout.addWidget(self.output)
+        layout.addWidget(self.log_view)
         return group
 
     def _refresh_services(self) -> None:
         self.service_list.clear()
         self.service_items.clear()
 
-        services = list(get_services_config().get("services", {}).keys())
-        for service in services:
+        for service in get_service_names():
             item = QListWidgetItem(service)
             item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
             item.setCheckState(Qt.CheckState.Unchecked)
@@ -172,11 +185,7 @@ class MainWindow(QMainWindow):
         )
 
     def _append_output(self, text: str) -> None:
-        if not text:
-            return
-        self.output.moveCursor(QTextCursor.MoveOperation.End)
-        self.output.insertPlainText(text)
-        self.output.moveCursor(QTextCursor.MoveOperation.End)
+        self.log_view.append(text)
 
     def _run_command(self) -> None:
         python_path = get_venv_python()
@@ -194,10 +203,26 @@ class MainWindow(QMainWindow):
             return
 
         self._update_command_preview()
-        self.output.clear()
+        self.log_view.start(services)
         self._append_output("Starting process...\n\n")
 
+        EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+        prune_spill_files(EVENTS_DIR, pattern="*.jsonl")
+        events_path = EVENTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+        events_path.touch()
+        self.progress_table.start(
+            events_path,
+            self.mode_combo.currentData(),
+            self.arch_combo.currentData(),
+            services,
+        )
+
+        environment = QProcessEnvironment.systemEnvironment()
+        environment.insert(EVENTS_PATH_ENV, str(events_path))
+        environment.insert(OUTPUT_TAGS_ENV, "1")
+
         self.process = QProcess(self)
+        self.process.setProcessEnvironment(environment)
         self.process.setProgram(str(python_path))
         self.process.setArguments(self._command_args())
         self.process.setWorkingDirectory(str(PROJECT_ROOT))
@@ -233,6 +258,8 @@ class MainWindow(QMainWindow):
 
     def _process_finished(self, exit_code: int, _exit_status: QProcess.ExitStatus) -> None:
         self._append_output(f"\n\nProcess finished with exit code {exit_code}.\n")
+        self.log_view.finish()
+        self.progress_table.finish()
         self.run_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.process = None
@@ -0,0 +1,198 @@
+"""Bounded, batched log output for the GUI."""
+
+import html
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import TextIO
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from src.core.config import CACHE_DIR
+from src.core.runtime.shell import split_service_tag
+
+LOG_SPILL_DIR = CACHE_DIR / "gui-logs"
+DEFAULT_MAX_LINES = 5000
+DEFAULT_FLUSH_MS = 100
+KEPT_SPILL_FILES = 20
+ALL_SERVICES = ""
+
+
+def get_int_setting(key: str, default: int) -> int:
+    """Read a positive integer GUI setting from the environment."""
+    raw_value = os.getenv(key, "")
+    if raw_value.isdigit() and int(raw_value) > 0:
+        return int(raw_value)
+    return default
+
+
+# `(service, text)`; service is "" for lines no step produced
+LogLine = tuple[str, str]
+
+
+class LogBuffer:
+    """Collect output chunks into complete, service-attributed lines with bounded history.
+
+    Every line is written to a spill file so the full log survives even
+    though only the newest `max_lines` lines are kept in memory.
+    """
+
+    def __init__(self, max_lines: int, spill_path: Path | None = None) -> None:
+        self.history: deque[LogLine] = deque(maxlen=max_lines)
+        self.pending: list[LogLine] = []
+        self.partial = ""
+        self.spill_path = spill_path
+        self._spill: TextIO | None = None
+        if spill_path is not None:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = spill_path.open("w", encoding="utf-8")
+
+    def append(self, text: str) -> None:
+        """Queue a raw output chunk; incomplete trailing lines are held back."""
+        if not text:
+            return
+
+        lines = (self.partial + text.replace("\r\n", "\n")).split("\n")
+        self.partial = lines.pop()
+        for line in lines:
+            self._queue(line)
+
+    def _queue(self, line: str) -> None:
+        service, text = split_service_tag(line)
+        self.pending.append((service, text))
+        if self._spill is not None:
+            self._spill.write(f"{text}\n")
+
+    def take_pending(self, include_partial: bool = False) -> list[LogLine]:
+        """Move queued lines into history and return them for rendering."""
+        if include_partial and self.partial:
+            self._queue(self.partial)
+            self.partial = ""
+
+        lines = self.pending
+        self.pending = []
+        self.history.extend(lines)
+        return lines
+
+    def close(self) -> None:
+        """Flush and close the spill file."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+def prune_spill_files(directory: Path, keep: int = KEPT_SPILL_FILES, pattern: str = "*.log") -> None:
+    """Delete all but the newest spill files."""
+    if not directory.exists():
+        return
+    spill_files = sorted(directory.glob(pattern), key=lambda path: path.stat().st_mtime)
+    for path in spill_files[:-keep]:
+        path.unlink(missing_ok=True)
+
+
+class LogView(QWidget):
+    """Output pane that renders log lines in timed batches.
+
+    Incoming chunks are buffered and flushed every `GUI_LOG_FLUSH_MS`
+    milliseconds. The widget keeps at most `GUI_LOG_MAX_LINES` lines.
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.max_lines = get_int_setting("GUI_LOG_MAX_LINES", DEFAULT_MAX_LINES)
+        self.buffer = LogBuffer(self.max_lines)
+
+        self.filter_combo = QComboBox()
+        self.filter_combo.addItem("All services", ALL_SERVICES)
+        self.filter_combo.currentIndexChanged.connect(self._rerender)
+
+        self.spill_label = QLabel()
+        self.spill_label.setTextFormat(Qt.TextFormat.RichText)
+        self.spill_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextBrowserInteraction)
+        self.spill_label.setOpenExternalLinks(True)
+
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.output.setMaximumBlockCount(self.max_lines)
+
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(QLabel("Filter"))
+        filter_row.addWidget(self.filter_combo)
+        filter_row.addWidget(self.spill_label, stretch=1)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(filter_row)
+        layout.addWidget(self.output)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(get_int_setting("GUI_LOG_FLUSH_MS", DEFAULT_FLUSH_MS))
+        self.flush_timer.timeout.connect(self.flush)
+
+    def start(self, services: list[str]) -> None:
+        """Reset the view for a new run and open a fresh spill file."""
+        self.buffer.close()
+        prune_spill_files(LOG_SPILL_DIR)
+        spill_path = LOG_SPILL_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.log"
+        self.buffer = LogBuffer(self.max_lines, spill_path)
+        self.spill_label.setText(
+            f'Full log: <a href="{spill_path.resolve().as_uri()}">{html.escape(str(spill_path))}</a>'
+        )
+
+        self.filter_combo.blockSignals(True)
+        self.filter_combo.clear()
+        self.filter_combo.addItem("All services", ALL_SERVICES)
+        for service in services:
+            self.filter_combo.addItem(service, service)
+        self.filter_combo.blockSignals(False)
+
+        self.output.clear()
+        self.flush_timer.start()
+
+    def append(self, text: str) -> None:
+        """Queue output for the next flush."""
+        self.buffer.append(text)
+
+    def finish(self) -> None:
+        """Render everything still queued and close the spill file."""
+        self.flush_timer.stop()
+        self._render(self.buffer.take_pending(include_partial=True))
+        self.buffer.close()
+
+    def flush(self) -> None:
+        """Render lines queued since the last flush."""
+        self._render(self.buffer.take_pending())
+
+    def _selected_service(self) -> str:
+        return self.filter_combo.currentData() or ALL_SERVICES
+
+    def _visible(self, lines: list[LogLine] | deque[LogLine]) -> list[str]:
+        selected = self._selected_service()
+        if selected == ALL_SERVICES:
+            return [text for _, text in lines]
+        return [text for service, text in lines if service == selected]
+
+    def _render(self, lines: list[LogLine]) -> None:
+        visible = self._visible(lines)
+        if not visible:
+            return
+
+        scrollbar = self.output.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - 2
+        self.output.appendPlainText("\n".join(visible[-self.max_lines :]))
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _rerender(self) -> None:
+        self.output.clear()
+        self._render(list(self.buffer.history))
@@ -0,0 +1,206 @@
+"""Per-service progress table driven by the CLI event stream."""
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QHeaderView, QTableWidget, QTableWidgetItem, QWidget
+
+from src.core.config import get_service_catalog
+from src.core.domain.catalog import ServiceCatalog
+from src.core.domain.policies import should_push
+from src.core.runtime.events import load_step_history, step_key
+
+REFRESH_MS = 500
+COLUMNS = ("Service", "Stage", "Status", "Elapsed", "ETA")
+
+
+def planned_stages(mode: str, arch: str, readiness: bool = False) -> tuple[str, ...]:
+    """Return the step stages a service goes through for an operation."""
+    build_stages = ("build", "push") if should_push(arch) else ("build",)
+    deploy_stages = ("deploy", "ready") if readiness else ("deploy",)
+    stages_by_mode = {
+        "build": build_stages,
+        "deploy": deploy_stages,
+        "both": (*build_stages, *deploy_stages),
+        "watch": (*build_stages, *deploy_stages),
+    }
+    return stages_by_mode.get(mode, ())
+
+
+def has_readiness(catalog: ServiceCatalog, service: str) -> bool:
+    """Return whether a service waits for post-deploy readiness checks."""
+    definition = catalog.get(service)
+    return definition is not None and definition.readiness is not None
+
+
+def format_seconds(seconds: float | None) -> str:
+    """Render a duration as m:ss, or a dash when unknown."""
+    if seconds is None:
+        return "—"
+    minutes, secs = divmod(round(seconds), 60)
+    return f"{minutes}:{secs:02d}"
+
+
+class EventTail:
+    """Incrementally read complete JSON lines appended to an events file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offset = 0
+        self.partial = b""
+
+    def read(self) -> list[dict[str, Any]]:
+        """Return events appended since the previous read."""
+        try:
+            with self.path.open("rb") as handle:
+                handle.seek(self.offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return []
+
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+
+        events: list[dict[str, Any]] = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+
+@dataclass
+class ServiceProgress:
+    """Live step state for one service row."""
+
+    service: str
+    stages: tuple[str, ...]
+    stage: str = ""
+    status: str = "queued"
+    started_at: float | None = None
+    completed: list[str] = field(default_factory=list)
+    last_duration_s: float | None = None
+
+    def elapsed(self, now: float) -> float | None:
+        """Seconds spent in the current step, or the last step once finished."""
+        if self.status == "running" and self.started_at is not None:
+            return now - self.started_at
+        return self.last_duration_s
+
+    def eta(self, now: float, history: dict[str, float], arch: str) -> float | None:
+        """Estimate remaining seconds from smoothed durations of previous runs."""
+        if self.status in ("done", "failed", "cancelled"):
+            return None
+
+        remaining = 0.0
+        for stage in self.stages:
+            if stage in self.completed:
+                continue
+            average = history.get(step_key(self.service, stage, arch))
+            if average is None:
+                return None
+            if stage == self.stage and self.status == "running":
+                remaining += max(average - (self.elapsed(now) or 0.0), 0.0)
+            else:
+                remaining += average
+        return remaining
+
+
+class ProgressTable(QTableWidget):
+    """Table with one row per selected service showing stage, elapsed time, and ETA."""
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(0, len(COLUMNS), parent)
+        self.setHorizontalHeaderLabels(COLUMNS)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.verticalHeader().setVisible(False)
+        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        self.tail: EventTail | None = None
+        self.arch = ""
+        self.history: dict[str, float] = {}
+        self.rows: dict[str, ServiceProgress] = {}
+        # Cells per service row, kept so renders never look items up by index
+        self.cells: dict[str, list[QTableWidgetItem]] = {}
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def start(self, events_path: Path, mode: str, arch: str, services: list[str]) -> None:
+        """Begin following a new run's event file."""
+        self.tail = EventTail(events_path)
+        self.arch = arch
+        self.history = load_step_history()
+        catalog = get_service_catalog()
+        self.rows = {
+            service: ServiceProgress(
+                service=service,
+                stages=planned_stages(mode, arch, readiness=has_readiness(catalog, service)),
+            )
+            for service in services
+        }
+
+        self.setRowCount(len(services))
+        self.cells = {}
+        for row, service in enumerate(services):
+            cells = [QTableWidgetItem() for _ in COLUMNS]
+            cells[0].setText(service)
+            for column, cell in enumerate(cells):
+                self.setItem(row, column, cell)
+            self.cells[service] = cells
+
+        self._render()
+        self.refresh_timer.start()
+
+    def finish(self) -> None:
+        """Apply the last events and stop refreshing."""
+        self.refresh()
+        self.refresh_timer.stop()
+        for progress in self.rows.values():
+            if progress.status in ("queued", "running"):
+                progress.status = "stopped"
+        self._render()
+
+    def refresh(self) -> None:
+        """Read new events and update elapsed times."""
+        if self.tail is not None:
+            for event in self.tail.read():
+                self._apply_event(event)
+        self._render()
+
+    def _apply_event(self, event: dict[str, Any]) -> None:
+        progress = self.rows.get(event.get("service", ""))
+        if progress is None:
+            return
+
+        if event.get("event") == "step_start":
+            progress.stage = event.get("stage", "")
+            progress.status = "running"
+            progress.started_at = event.get("ts")
+        elif event.get("event") == "step_finish":
+            progress.stage = event.get("stage", "")
+            progress.last_duration_s = event.get("duration_s")
+            progress.started_at = None
+            status = event.get("status", "failed")
+            if status != "ok":
+                progress.status = status
+                return
+            progress.completed.append(progress.stage)
+            done = all(stage in progress.completed for stage in progress.stages)
+            progress.status = "done" if done else "waiting"
+
+    def _render(self) -> None:
+        now = time.time()
+        for service, progress in self.rows.items():
+            _, stage, status, elapsed, eta = self.cells[service]
+            stage.setText(progress.stage or "—")
+            status.setText(progress.status)
+            elapsed.setText(format_seconds(progress.elapsed(now)))
+            eta.setText(format_seconds(progress.eta(now, self.history, self.arch)))
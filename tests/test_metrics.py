@@ -0,0 +1,95 @@
+"""Metrics export to a local Pushgateway-style endpoint."""
+
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pytest
+
+from src.cli import watch
+from src.core.runtime import events, metrics
+
+GROUPING_PATH = "/metrics/job/bazarrify"
+
+
+class PushRecorder(BaseHTTPRequestHandler):
+    """Record every PUT and answer 200."""
+
+    pushes: ClassVar[list[tuple[str, str, str]]] = []
+
+    def do_PUT(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8")
+        self.pushes.append((self.path, self.headers.get("Content-Type", ""), body))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def pushes(monkeypatch: pytest.MonkeyPatch) -> Generator[list[tuple[str, str, str]]]:
+    recorded: list[tuple[str, str, str]] = []
+    monkeypatch.setattr(PushRecorder, "pushes", recorded)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PushRecorder)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("METRICS_PUSH_URL", f"http://127.0.0.1:{server.server_address[1]}{GROUPING_PATH}")
+    monkeypatch.delenv("METRICS_TEXTFILE", raising=False)
+    yield recorded
+    server.shutdown()
+    server.server_close()
+
+
+def test_run_finish_puts_openmetrics_on_the_grouping_path(
+    pushes: list[tuple[str, str, str]],
+) -> None:
+    collector = metrics.MetricsCollector()
+    collector.handle({"event": "run_start", "ts": 100.0})
+    collector.handle(
+        {
+            "event": "step_finish",
+            "ts": 105.0,
+            "stage": "build",
+            "service": "nginx",
+            "arch": "amd",
+            "status": "ok",
+            "duration_s": 4.5,
+        }
+    )
+    collector.handle(
+        {"event": "run_finish", "ts": 112.5, "mode": "build", "arch": "amd", "status": "ok"}
+    )
+
+    [(path, content_type, body)] = pushes
+    assert path == GROUPING_PATH
+    assert content_type.startswith("application/openmetrics-text; version=1.0.0")
+    assert "# UNIT bazarrify_deploy_run_duration_seconds seconds\n" in body
+    assert 'bazarrify_deploy_run_duration_seconds{mode="build",arch="amd"} 12.5\n' in body
+    assert (
+        'bazarrify_deploy_step_duration_seconds{stage="build",service="nginx",arch="amd",'
+        'status="ok"} 4.5\n'
+    ) in body
+    assert body.endswith("# EOF\n")
+
+
+def test_every_watch_cycle_exports_its_own_run(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, pushes: list[tuple[str, str, str]]
+) -> None:
+    collector = metrics.MetricsCollector()
+    monkeypatch.setattr(events, "_sinks", [collector.handle])
+    monkeypatch.delenv(events.EVENTS_PATH_ENV, raising=False)
+    monkeypatch.setenv("RUN_LOG_DIR", str(tmp_path))
+
+    def failing_deploy(_arch: str, _services: list[str]) -> None:
+        raise SystemExit(1)
+
+    watch._run_cycle("amd", watch.WatchCycle(services=("nginx",)), lambda *_: None, lambda *_: None)
+    watch._run_cycle("amd", watch.WatchCycle(services=("nginx",)), lambda *_: None, failing_deploy)
+
+    assert [path for path, _, _ in pushes] == [GROUPING_PATH, GROUPING_PATH]
+    assert 'bazarrify_deploy_run_success{mode="watch",arch="amd"} 1\n' in pushes[0][2]
+    assert 'bazarrify_deploy_run_success{mode="watch",arch="amd"} 0\n' in pushes[1][2]
@@ -0,0 +1,105 @@
+"""Mirror warming decisions and the per-host pull reports the playbook writes."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.deploy import mirror
+
+FIXTURES = Path(__file__).parent / "fixtures" / "mirror-pulls"
+MIRROR = "mirror.local:5000"
+NGINX = "techbizz/nginx:latest-amd"
+FRANKENPHP = "techbizz/frankenphp:latest-amd"
+REDIS = "techbizz/redis:latest-amd"
+WORKER = "techbizz/worker:latest-amd"
+
+
+@pytest.fixture(autouse=True)
+def quiet_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mirror, "emit_event", lambda *_args, **_kwargs: None)
+
+
+def test_read_pull_reports_skips_unreadable_hosts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mirror, "PULL_REPORT_DIR", FIXTURES)
+
+    report = mirror.read_pull_reports()
+
+    # web-3 is truncated JSON and web-4 is not an image map
+    assert report.by_host == {
+        "web-1": {NGINX: "mirror", FRANKENPHP: "mirror"},
+        "web-2": {NGINX: "mirror", FRANKENPHP: "upstream", REDIS: "unknown"},
+    }
+    assert report.count("mirror", "web-2") == 1
+    assert report.count("upstream") == 1
+
+
+def test_hit_rate_counts_every_host_pull() -> None:
+    report = mirror.MirrorPullReport(
+        by_host={
+            "web-1": {NGINX: "mirror", FRANKENPHP: "mirror"},
+            "web-2": {NGINX: "mirror", FRANKENPHP: "upstream", REDIS: "unknown"},
+        }
+    )
+
+    assert report.pulls == 5
+    assert report.hit_rate == pytest.approx(0.6)
+    assert mirror.MirrorPullReport().hit_rate is None
+
+
+def test_warm_mirror_copies_only_stale_tags() -> None:
+    upstream = {NGINX: "sha256:nginx", FRANKENPHP: "sha256:php", REDIS: "sha256:redis"}
+    mirrored = {
+        mirror.mirror_image_tag(NGINX, MIRROR): "sha256:nginx",
+        mirror.mirror_image_tag(FRANKENPHP, MIRROR): "sha256:php-old",
+    }
+    digests = {**upstream, **mirrored}
+    inspected: list[str] = []
+    copies: list[list[str]] = []
+
+    def capture(cmd: list[str]) -> str | None:
+        image = cmd[4]
+        inspected.append(image)
+        return json.dumps({"digest": digests[image]}) if image in digests else None
+
+    def run(cmd: list[str], _desc: str) -> None:
+        copies.append(cmd)
+        if cmd[-1].startswith("techbizz/redis@"):
+            raise SystemExit(1)
+
+    report = mirror.warm_mirror([NGINX, FRANKENPHP, REDIS, WORKER], MIRROR, run, capture)
+
+    assert report == mirror.MirrorWarmReport(
+        copied=(FRANKENPHP,), current=(NGINX,), failed=(REDIS,), unknown=(WORKER,)
+    )
+    # Copies are pinned to the upstream digest the decision was made against
+    assert copies == [
+        [
+            "docker", "buildx", "imagetools", "create",
+            "--tag", f"{MIRROR}/{FRANKENPHP}", "techbizz/frankenphp@sha256:php",
+        ],
+        [
+            "docker", "buildx", "imagetools", "create",
+            "--tag", f"{MIRROR}/{REDIS}", "techbizz/redis@sha256:redis",
+        ],
+    ]
+    assert sorted(inspected) == sorted(
+        [NGINX, FRANKENPHP, REDIS, WORKER]
+        + [mirror.mirror_image_tag(image, MIRROR) for image in (NGINX, FRANKENPHP, REDIS, WORKER)]
+    )
+
+
+def test_warm_mirror_reuses_known_upstream_digests() -> None:
+    def capture(cmd: list[str]) -> str | None:
+        assert cmd[4].startswith(MIRROR), "upstream digests were already looked up"
+        return None
+
+    report = mirror.warm_mirror(
+        [NGINX],
+        MIRROR,
+        lambda _cmd, _desc: None,
+        capture,
+        upstream_digests={NGINX: "sha256:nginx"},
+    )
+
+    assert report.copied == (NGINX,)
@@ -0,0 +1,132 @@
+"""Readiness waiters against a local HTTP server and TCP listener."""
+
+import contextlib
+import socket
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.core.domain.catalog import ReadinessSpec
+from src.core.domain.orchestration import DeployRequest
+from src.deploy import readiness
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    """Answer 200 on /health and 503 everywhere else."""
+
+    def do_GET(self) -> None:
+        self.send_response(200 if self.path == "/health" else 503)
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def http_port() -> Generator[int]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def tcp_port() -> Generator[int]:
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        yield listener.getsockname()[1]
+
+
+@pytest.fixture
+def closed_port() -> int:
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        return listener.getsockname()[1]
+
+
+@contextlib.contextmanager
+def untracked_step(*_args: Any, **_kwargs: Any) -> Generator[dict[str, Any]]:
+    yield {}
+
+
+@pytest.fixture(autouse=True)
+def local_hosts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("READINESS_HOSTS", "127.0.0.1")
+    monkeypatch.setenv("READINESS_POLL_SECONDS", "0.1")
+    monkeypatch.delenv("READINESS_CHECK", raising=False)
+    # Keeps test durations out of .cache/step-history.json
+    monkeypatch.setattr(readiness, "track_step", untracked_step)
+
+
+def use_specs(monkeypatch: pytest.MonkeyPatch, specs: dict[str, ReadinessSpec]) -> DeployRequest:
+    catalog = SimpleNamespace(
+        get=lambda name: SimpleNamespace(readiness=specs[name]) if name in specs else None
+    )
+    monkeypatch.setattr(readiness, "get_service_catalog", lambda: catalog)
+    return DeployRequest(images=(), arch="amd", services=tuple(specs))
+
+
+def no_capture(_cmd: list[str]) -> str | None:
+    raise AssertionError("READINESS_HOSTS should bypass inventory discovery")
+
+
+def test_http_and_tcp_probes_pass(
+    monkeypatch: pytest.MonkeyPatch, http_port: int, tcp_port: int
+) -> None:
+    request = use_specs(
+        monkeypatch,
+        {
+            "web": ReadinessSpec("web", container=False, http=f"http://{{host}}:{http_port}/health"),
+            "db": ReadinessSpec("db", container=False, tcp=f"{{host}}:{tcp_port}"),
+        },
+    )
+
+    readiness.await_readiness(request, time.monotonic(), capture_command=no_capture)
+
+
+def test_probe_reports_the_failure_reason(http_port: int, closed_port: int) -> None:
+    assert readiness.http_probe(f"http://127.0.0.1:{http_port}/health") is None
+    assert "returned 503" in (readiness.http_probe(f"http://127.0.0.1:{http_port}/down") or "")
+    assert "refused" in (readiness.tcp_probe(f"127.0.0.1:{closed_port}", timeout_s=1) or "")
+
+
+def test_waiters_time_out_concurrently(
+    monkeypatch: pytest.MonkeyPatch, http_port: int, closed_port: int
+) -> None:
+    timeout_s = 1.0
+    request = use_specs(
+        monkeypatch,
+        {
+            "ready": ReadinessSpec("ready", container=False, http=f"http://{{host}}:{http_port}/health"),
+            "unhealthy": ReadinessSpec(
+                "unhealthy",
+                container=False,
+                http=f"http://{{host}}:{http_port}/down",
+                timeout_s=timeout_s,
+            ),
+            "closed": ReadinessSpec(
+                "closed", container=False, tcp=f"{{host}}:{closed_port}", timeout_s=timeout_s
+            ),
+        },
+    )
+    results: list[readiness.ReadinessResult] = []
+    monkeypatch.setattr(readiness, "print_readiness_report", results.extend)
+
+    started = time.monotonic()
+    with pytest.raises(SystemExit):
+        readiness.await_readiness(request, started, capture_command=no_capture)
+    elapsed = time.monotonic() - started
+
+    by_service = {result.service: result for result in results}
+    assert by_service["ready"].ready
+    assert not by_service["unhealthy"].ready
+    assert "returned 503" in by_service["unhealthy"].detail
+    assert not by_service["closed"].ready
+    assert "refused" in by_service["closed"].detail
+    # Both waiters ran side by side: one timeout, not two, plus polling slack
+    assert timeout_s <= elapsed < 2 * timeout_s
@@ -0,0 +1,149 @@
+"""Remote snapshot parsing and the pull, rollout, and prune plan derived from it."""
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.core.domain.orchestration import DeployRequest
+from src.core.domain.remote_state import plan_remote_actions
+from src.deploy import ansible, remote_state
+
+FIXTURE = Path(__file__).parent / "fixtures" / "remote-state" / "snapshot.json"
+NGINX = "techbizz/nginx:latest-amd"
+FRANKENPHP = "techbizz/frankenphp:latest-amd"
+IMAGES = (NGINX, FRANKENPHP)
+MEGABYTE = remote_state.MEGABYTE
+
+
+@pytest.fixture
+def document() -> dict[str, Any]:
+    return json.loads(FIXTURE.read_text())
+
+
+def test_parse_snapshot_keeps_good_hosts_and_lists_unparsable_ones(
+    document: dict[str, Any],
+) -> None:
+    snapshot = remote_state.parse_snapshot(document)
+
+    assert sorted(snapshot.hosts) == ["web-1", "web-2", "web-3"]
+    assert snapshot.unavailable_hosts == ("web-4", "web-5")
+    assert snapshot.collected_at == 1760000000.0
+    web_2 = snapshot.hosts["web-2"]
+    assert web_2.images[NGINX].digests == ("techbizz/nginx@sha256:nginx-old",)
+    assert web_2.containers[0].image_id == "sha256:php-image-old"
+    assert web_2.disk.reclaimable_bytes == 600 * MEGABYTE
+
+
+def test_plan_pulls_only_stale_images(document: dict[str, Any]) -> None:
+    plan = plan_remote_actions(remote_state.parse_snapshot(document), IMAGES, {})
+
+    # A mirror-pulled digest counts as current on web-1
+    assert plan.pull_by_host == {
+        "web-1": [],
+        "web-2": [NGINX],
+        "web-3": [NGINX, FRANKENPHP],
+    }
+    # Unparsable hosts are left out, so the playbook pulls everything there
+    assert "web-4" not in plan.pull_by_host
+    assert plan.unavailable_hosts == ("web-4", "web-5")
+
+
+def test_plan_marks_services_outdated_on_any_host(document: dict[str, Any]) -> None:
+    snapshot = remote_state.parse_snapshot(document)
+
+    plan = plan_remote_actions(snapshot, IMAGES, {"frankenphp": FRANKENPHP})
+    assert plan.outdated_services == {"frankenphp"}
+
+    current = {"hosts": {"web-1": document["hosts"]["web-1"]}}
+    current_plan = plan_remote_actions(
+        remote_state.parse_snapshot({**document, **current}), IMAGES, {"frankenphp": FRANKENPHP}
+    )
+    assert current_plan.outdated_services == frozenset()
+
+
+def test_plan_prunes_every_host_without_thresholds(document: dict[str, Any]) -> None:
+    plan = plan_remote_actions(remote_state.parse_snapshot(document), IMAGES, {})
+
+    assert plan.prune_hosts is None
+
+
+def test_plan_prune_thresholds(document: dict[str, Any]) -> None:
+    plan = plan_remote_actions(
+        remote_state.parse_snapshot(document),
+        IMAGES,
+        {},
+        prune_thresholds=(500 * MEGABYTE, 5000 * MEGABYTE),
+    )
+
+    # web-2 has 600 MB reclaimable, web-3 only 1 GB free, web-1 neither;
+    # hosts without state are always pruned
+    assert plan.prune_hosts == ("web-2", "web-3", "web-4", "web-5")
+
+
+def test_prune_thresholds_are_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PRUNE_MIN_RECLAIMABLE_MB", raising=False)
+    monkeypatch.delenv("PRUNE_MIN_FREE_MB", raising=False)
+    assert remote_state.get_prune_thresholds() is None
+
+    monkeypatch.setenv("PRUNE_MIN_FREE_MB", "2000")
+    assert remote_state.get_prune_thresholds() == (
+        remote_state.DEFAULT_PRUNE_MIN_RECLAIMABLE_MB * MEGABYTE,
+        2000 * MEGABYTE,
+    )
+
+
+def test_replay_requires_the_dev_flag(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, document: dict[str, Any]
+) -> None:
+    recorded = tmp_path / "snapshot.json"
+    recorded.write_text(json.dumps({**document, "collected_at": time.time()}))
+    monkeypatch.setenv(remote_state.SNAPSHOT_ENV, str(recorded))
+    monkeypatch.delenv(remote_state.REPLAY_ENV, raising=False)
+    monkeypatch.setattr(remote_state, "_cached", {})
+
+    def no_capture(_cmd: list[str]) -> str | None:
+        raise AssertionError("a replay must not contact the hosts")
+
+    with pytest.raises(SystemExit):
+        remote_state.get_remote_state(no_capture, IMAGES)
+
+    monkeypatch.setenv(remote_state.REPLAY_ENV, "1")
+    snapshot = remote_state.get_remote_state(no_capture, IMAGES)
+    assert snapshot is not None
+    assert snapshot.unavailable_hosts == ("web-4", "web-5")
+
+
+def test_replay_refuses_stale_snapshots(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, document: dict[str, Any]
+) -> None:
+    recorded = tmp_path / "snapshot.json"
+    recorded.write_text(json.dumps(document))
+    monkeypatch.delenv(remote_state.SNAPSHOT_MAX_AGE_ENV, raising=False)
+
+    with pytest.raises(SystemExit):
+        remote_state.load_recorded_snapshot(recorded)
+
+
+def test_apply_remote_state_falls_back_per_host(
+    monkeypatch: pytest.MonkeyPatch, document: dict[str, Any]
+) -> None:
+    snapshot = remote_state.parse_snapshot(document)
+    monkeypatch.setattr(ansible, "get_remote_state", lambda *_args: snapshot)
+    monkeypatch.setattr(ansible, "emit_event", lambda *_args, **_kwargs: None)
+    monkeypatch.delenv("PRUNE_MIN_RECLAIMABLE_MB", raising=False)
+    monkeypatch.delenv("PRUNE_MIN_FREE_MB", raising=False)
+    rollouts = [{"name": "frankenphp", "image": FRANKENPHP}]
+    extra_vars: dict[str, Any] = {"start_first_services": rollouts}
+
+    ansible.apply_remote_state(
+        extra_vars, DeployRequest(images=IMAGES), capture_command=lambda _cmd: None
+    )
+
+    assert sorted(extra_vars["pull_by_host"]) == ["web-1", "web-2", "web-3"]
+    # web-4 and web-5 check their own rollouts, so nothing is pre-decided
+    assert extra_vars["start_first_services"] == rollouts
+    # Always-prune stays the default: the playbook prunes every host
+    assert "prune_hosts" not in extra_vars